@@ -4,44 +4,114 @@ CLI Commands for DiceRealms.
 """
 
 import asyncio
+import json
+from datetime import datetime
+from typing import Annotated
 
 import typer
 from loguru import logger
 from rich.console import Console
 from rich.panel import Panel
+from rich.table import Table
 
 from dicerealms.client import GameClient
-from dicerealms.server.server import GameServer
+from dicerealms.core import ROLL_SUMMARY_THRESHOLD
+from dicerealms.procgen import BENCH_SIZES, GENERATORS, benchmark_world, build_world
+from dicerealms.server.audit_log import RollLogReader
+from dicerealms.server.cluster import Dispatcher
+from dicerealms.server.outbox import QUEUE_LIMIT
+from dicerealms.server.server import MAX_GAMES, SEND_TIMEOUT, GameServer
+from dicerealms.simulate import SimulationProgress
+from dicerealms.simulate import simulate as run_simulation
+from dicerealms.world_check import SAMPLE_LIMIT, validate_world
+from dicerealms.world_io import WorldIOProgress, load_world, save_world
 
 app = typer.Typer(
     help="DiceRealms CLI -- a multiplayer, turn-based, dice-driven fantasy RPG ✨",
     add_completion = False,
 )
 
+world_app = typer.Typer(help="Build and check world files.")
+app.add_typer(world_app, name="world")
+
 console = Console()
 
 @app.command()
 def server(
     host: str = typer.Option("localhost", "--host", "-h",  help="Host to bind the server to."),
-    port: int = typer.Option(8765, "--port", "-p", help="Port to bind the server to.")
+    port: int = typer.Option(8765, "--port", "-p", help="Port to bind the server to."),
+    seed: int | None = typer.Option(None, "--seed", help="Master dice seed, for replaying a game."),
+    summary_threshold: int = typer.Option(
+        ROLL_SUMMARY_THRESHOLD, "--summary-threshold", help="Summarize rolls with more dice than this."
+    ),
+    audit_log: str | None = typer.Option(
+        None, "--audit-log", help="Append every roll to this binary audit log."
+    ),
+    world: str | None = typer.Option(
+        None,
+        "--world",
+        help="World file to load (.drw, .jsonl, .msgpack or .json), or a directory of zone files.",
+    ),
+    start_room: str | None = typer.Option(
+        None, "--start-room", help="Room new players start in (default: the world's own)."
+    ),
+    max_zones: int | None = typer.Option(
+        None, "--max-zones", help="Zones of a zone directory kept loaded at once (default: no limit)."
+    ),
+    send_timeout: float = typer.Option(
+        SEND_TIMEOUT, "--send-timeout", help="Drop clients whose sends take longer than this (seconds)."
+    ),
+    queue_limit: int = typer.Option(
+        QUEUE_LIMIT, "--queue-limit", help="Messages queued per client before its overflow policy applies."
+    ),
+    max_games: int = typer.Option(
+        MAX_GAMES, "--max-games", help="Game instances (tables) to host at most, per worker."
+    ),
+    workers: int = typer.Option(
+        1, "--workers", "-w", min=1, help="Worker processes; each game runs in exactly one."
+    ),
 ) -> None:
     """
     Start the DiceRealms multiplayer server.
 
+    With --workers N above 1, a dispatcher listens on the port and relays
+    each game's players to one of N worker processes (see
+    dicerealms.server.cluster). Worker i uses seed + i and audit log
+    AUDIT_LOG.i.
+
+    A --world directory (see dicerealms.zoned_world.ZoneDirectory) is served
+    zone by zone, loading zones as players reach them; zone cache stats
+    are logged every minute.
+
     Example:
-        dicerealms server --host 0.0.0.0 --port 8765
+        dicerealms server --host 0.0.0.0 --port 8765 --workers 8
     """
 
     console.print(
         Panel.fit(
             f"[bold cyan]🎲 DiceRealms Server[/bold cyan]\n"
-            f"Starting on [bold]{host}:{port}[/bold]\n",
+            f"Starting on [bold]{host}:{port}[/bold]"
+            f"{f' with {workers} workers' if workers > 1 else ''}\n",
             border_style="bright_cyan",
         )
     )
 
     # Create and run the server
-    game_server = GameServer(host=host, port=port)
+    server_kwargs = dict(
+        seed=seed,
+        roll_summary_threshold=summary_threshold,
+        audit_log_path=audit_log,
+        world_path=world,
+        start_room=start_room,
+        max_zones=max_zones,
+        send_timeout=send_timeout,
+        queue_limit=queue_limit,
+        max_games=max_games,
+    )
+    if workers > 1:
+        game_server = Dispatcher(host, port, workers, server_kwargs)
+    else:
+        game_server = GameServer(host=host, port=port, **server_kwargs)
 
     try:
         # Run the async server
@@ -59,24 +129,26 @@ def connect(
     host: str = typer.Option("localhost", "--host", "-h",  help="Host to connect to."),
     port: int = typer.Option(8765, "--port", "-p", help="Port to connect to."),
     name: str = typer.Option("Player", "--name", "-n", help="Player name."),
+    game: str | None = typer.Option(None, "--game", "-g", help="Game to join (the default game if omitted)."),
 ) -> None:
     """
     Connect to a DiceRealms server as a client.
 
     Example:
-        dicerealms connect --host localhost --port 8765 --name Alice
+        dicerealms connect --host localhost --port 8765 --name Alice --game tavern
     """
 
     console.print(
         Panel.fit(
             f"[bold green]🎲 DiceRealms Client[/bold green]\n"
             f"Connecting to [bold]{host}:{port}[/bold]\n"
-            f"Player name: [bold]{name}[/bold]\n",
+            f"Player name: [bold]{name}[/bold]\n"
+            f"Game: [bold]{game or 'default'}[/bold]\n",
             border_style="green",
         )
     )
 
-    client = GameClient(f"ws://{host}:{port}", name)
+    client = GameClient(f"ws://{host}:{port}", name, game)
     try:
         asyncio.run(client.run())
     except KeyboardInterrupt:
@@ -86,6 +158,257 @@ def connect(
         logger.error(f"Client error: {e}")
         raise typer.Exit(code=1) from None
 
+
+_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+@app.command(name="simulate")
+def simulate(
+    expressions: Annotated[
+        list[str], typer.Argument(help="Dice expressions (e.g. 4d6kh3 d20adv+5).")
+    ],
+    trials: int = typer.Option(1_000_000, "--trials", "-n", help="Trials per expression."),
+    workers: int | None = typer.Option(None, "--workers", "-w", help="Worker processes (default: one per CPU)."),
+    seed: int | None = typer.Option(None, "--seed", help="Master seed, for reproducible runs."),
+    as_json: bool = typer.Option(False, "--json", help="Print final results and histograms as JSON."),
+) -> None:
+    """
+    Monte Carlo simulate dice expressions across worker processes.
+
+    Example:
+        dicerealms simulate 4d6kh3 "d20adv+5" --trials 100000000
+    """
+    final: dict[str, SimulationProgress] = {}
+    try:
+        for progress in run_simulation(expressions, trials, workers=workers, seed=seed):
+            final[progress.expression] = progress
+            if not as_json:
+                h = progress.histogram
+                console.print(
+                    f"[dim]{progress.shards_done}/{progress.shards_total}[/dim] "
+                    f"[cyan]{progress.expression}[/cyan] "
+                    f"n={h.trials:,} mean={h.mean:.3f} p50={h.percentile(50)}"
+                )
+    except ValueError as e:
+        console.print(f"[bold red]❌ {e}[/bold red]")
+        raise typer.Exit(code=1) from None
+
+    if as_json:
+        results = [
+            {
+                "expression": expr,
+                "trials": p.histogram.trials,
+                "mean": p.histogram.mean,
+                "std": p.histogram.std,
+                "percentiles": {str(q): p.histogram.percentile(q) for q in _PERCENTILES},
+                "histogram": p.histogram.to_dict(),
+            }
+            for expr, p in final.items()
+        ]
+        typer.echo(json.dumps(results))
+        return
+
+    table = Table(title=f"🎲 {trials:,} trials each")
+    for col in ("Expression", "Mean", "SD", "Min", *(f"p{q}" for q in _PERCENTILES), "Max"):
+        table.add_column(col, justify="left" if col == "Expression" else "right")
+    for expr in expressions:
+        h = final[expr].histogram
+        table.add_row(
+            expr,
+            f"{h.mean:.3f}",
+            f"{h.std:.3f}",
+            str(h.min_total),
+            *(str(h.percentile(q)) for q in _PERCENTILES),
+            str(h.max_total),
+        )
+    console.print(table)
+
+
+@app.command(name="audit")
+def audit(
+    log_path: Annotated[str, typer.Argument(help="Roll audit log written by 'server --audit-log'.")],
+    player: str | None = typer.Option(None, "--player", help="Only rolls by this player ID."),
+    game: str | None = typer.Option(None, "--game", help="Only rolls in this game."),
+    expression: str | None = typer.Option(None, "--expr", help="Only rolls of this expression."),
+    last: int = typer.Option(10, "--last", help="Show this many of the most recent matches."),
+) -> None:
+    """
+    Summarize rolls from a binary audit log.
+
+    Example:
+        dicerealms audit rolls.drl --player player_1 --expr 1d20
+    """
+    try:
+        reader = RollLogReader(log_path)
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]❌ {e}[/bold red]")
+        raise typer.Exit(code=1) from None
+
+    matches = reader.filter(game=game, player=player, expression=expression)
+    console.print(f"[cyan]{len(matches):,}[/cyan] of {len(reader):,} rolls match")
+    if not len(matches):
+        return
+    totals = matches["total"]
+    console.print(
+        f"total: mean={totals.mean():.3f} min={int(totals.min())} max={int(totals.max())}"
+    )
+
+    table = Table(title=f"Last {min(last, len(matches))} rolls")
+    for col in ("Time", "Total", "Dice", "Parts"):
+        table.add_column(col)
+    for rec in matches[-last:] if last > 0 else []:
+        when = datetime.fromtimestamp(int(rec["ts_ns"]) / 1e9).isoformat(sep=" ", timespec="seconds")
+        table.add_row(
+            when, str(int(rec["total"])), str(int(rec["n_parts"])), str(RollLogReader.parts(rec))
+        )
+    console.print(table)
+
+
+@world_app.command(name="compile")
+def world_compile(
+    source: Annotated[str, typer.Argument(help="World file (.json, .jsonl or .msgpack).")],
+    output: Annotated[str, typer.Argument(help="Compiled world to write (.drw).")],
+) -> None:
+    """
+    Compile a world into the memory-mapped .drw format for 'server --world'.
+
+    Example:
+        dicerealms world compile realm.json realm.drw
+    """
+
+    def report(p: WorldIOProgress) -> None:
+        pct = f" ({p.fraction:.0%})" if p.fraction is not None else ""
+        console.print(f"[dim]read {p.rooms:,} rooms{pct}[/dim]")
+
+    try:
+        world = load_world(source, progress=report)
+        rooms = save_world(world, output, fmt="drw")
+    except (OSError, ValueError, ImportError) as e:
+        console.print(f"[bold red]❌ {e}[/bold red]")
+        raise typer.Exit(code=1) from None
+    console.print(f"[green]Compiled {rooms:,} rooms to {output}[/green]")
+
+
+@world_app.command(name="validate")
+def world_validate(
+    source: Annotated[str, typer.Argument(help="World file (.json, .jsonl, .msgpack or .drw).")],
+    start: str | None = typer.Option(None, "--start", help="Room to measure reachability from (default: the world's start room)."),
+    workers: int | None = typer.Option(None, "--workers", "-w", help="Worker processes (default: one per CPU)."),
+    limit: int = typer.Option(SAMPLE_LIMIT, "--limit", help="Examples kept per kind of problem."),
+    as_json: bool = typer.Option(False, "--json", help="Print the report as JSON."),
+) -> None:
+    """
+    Check a world for dangling exits, one-sided links and unreachable or locked-off rooms.
+
+    Exits with status 1 if any exit leads to a missing room.
+
+    Example:
+        dicerealms world validate realm.drw --json > report.json
+    """
+    try:
+        report = validate_world(load_world(source), start=start, workers=workers, limit=limit)
+    except (OSError, ValueError, ImportError) as e:
+        console.print(f"[bold red]❌ {e}[/bold red]")
+        raise typer.Exit(code=1) from None
+
+    if as_json:
+        typer.echo(json.dumps(report.to_dict()))
+    else:
+        table = Table(title=f"🔎 {report.rooms:,} rooms, {report.exits:,} exits from {report.start}")
+        for col in ("Check", "Count", "Examples"):
+            table.add_column(col, justify="right" if col == "Count" else "left")
+        for name, findings in (
+            ("Dangling exits", report.dangling),
+            ("Asymmetric links", report.asymmetric),
+            ("Unreachable rooms", report.unreachable),
+            ("Locked-only rooms", report.locked_only),
+            ("Gates", report.gates),
+        ):
+            examples = [
+                s if isinstance(s, str) else f"{s['room']} {s['direction']} -> {s['to']}"
+                for s in findings.samples[:3]
+            ]
+            table.add_row(name, f"{findings.count:,}", ", ".join(examples))
+        console.print(table)
+        console.print(f"[dim]checked in {report.seconds:.2f}s[/dim]")
+    if not report.ok:
+        raise typer.Exit(code=1)
+
+
+@world_app.command(name="generate")
+def world_generate(
+    kind: Annotated[str, typer.Argument(help=f"World kind: {', '.join(GENERATORS)}.")],
+    output: Annotated[str, typer.Argument(help="World file to write (.jsonl, .msgpack, .json or .drw).")],
+    rooms: int = typer.Option(10_000, "--rooms", "-n", help="Approximate number of rooms."),
+    seed: int = typer.Option(0, "--seed", help="Generator seed."),
+) -> None:
+    """
+    Generate a procedural world and save it.
+
+    Example:
+        dicerealms world generate dungeon dungeon.drw --rooms 1000000 --seed 7
+    """
+    if kind not in GENERATORS:
+        console.print(f"[bold red]❌ Unknown world kind '{kind}' (expected one of {', '.join(GENERATORS)})[/bold red]")
+        raise typer.Exit(code=1)
+    try:
+        world = build_world(GENERATORS[kind].for_rooms(rooms, seed))
+        count = save_world(world, output)
+    except (OSError, ValueError, ImportError) as e:
+        console.print(f"[bold red]❌ {e}[/bold red]")
+        raise typer.Exit(code=1) from None
+    console.print(f"[green]Wrote {count:,} {kind} rooms to {output}[/green]")
+
+
+@world_app.command(name="bench")
+def world_bench(
+    kinds: Annotated[
+        list[str] | None, typer.Argument(help=f"World kinds (default: {', '.join(GENERATORS)}).")
+    ] = None,
+    sizes: str = typer.Option(
+        ",".join(str(n) for n in BENCH_SIZES), "--sizes", help="Comma-separated room counts."
+    ),
+    seed: int = typer.Option(0, "--seed", help="Generator seed."),
+    paths: int = typer.Option(10, "--paths", help="Random find_path queries per world."),
+) -> None:
+    """
+    Time building, find_path, move and JSONL save/load on generated worlds.
+
+    Example:
+        dicerealms world bench grid dungeon --sizes 10000,100000
+    """
+    kinds = kinds or list(GENERATORS)
+    try:
+        counts = [int(n) for n in sizes.split(",")]
+    except ValueError:
+        console.print(f"[bold red]❌ Invalid --sizes: {sizes}[/bold red]")
+        raise typer.Exit(code=1) from None
+    unknown = [k for k in kinds if k not in GENERATORS]
+    if unknown:
+        console.print(f"[bold red]❌ Unknown world kind(s): {', '.join(unknown)}[/bold red]")
+        raise typer.Exit(code=1)
+
+    table = Table(title="🗺️  World benchmarks")
+    for col in ("Kind", "Rooms", "Build", "find_path", "Path len", "move", "Save", "Load", "File"):
+        table.add_column(col, justify="left" if col == "Kind" else "right")
+    for kind in kinds:
+        for n in counts:
+            console.print(f"[dim]{kind} x {n:,}...[/dim]")
+            b = benchmark_world(kind, n, seed=seed, paths=paths)
+            table.add_row(
+                kind,
+                f"{b.rooms:,}",
+                f"{b.build_seconds:.2f}s",
+                f"{b.path_seconds * 1e3:.1f}ms",
+                f"{b.path_length:.0f}",
+                f"{b.move_seconds * 1e6:.1f}µs",
+                f"{b.save_seconds:.2f}s",
+                f"{b.load_seconds:.2f}s",
+                f"{b.file_bytes / 1e6:.1f}MB",
+            )
+    console.print(table)
+
+
 if __name__ == "__main__":
     app()
 
@@ -8,15 +8,18 @@ from loguru import logger
 
 from dicerealms.client.input_handler import InputHandler
 from dicerealms.client.ui import ClientUI
+from dicerealms.protocol.messages import turn_status_for
 
 
 class GameClient:
-    def __init__(self, uri: str, player_name: str) -> None:
+    def __init__(self, uri: str, player_name: str, game_id: str | None = None) -> None:
         self.uri = uri
         self.player_name = player_name
+        self.game_id = game_id
         self.ui = ClientUI()
         self._ws: websockets.WebSocketClientProtocol | None = None
         self.connected = False
+        self.player_id: str | None = None
 
 
     async def connect(self) -> None:
@@ -24,7 +27,10 @@ class GameClient:
         self._ws = await websockets.connect(self.uri)
         self.connected = True
         logger.info(f"Connected to server at {self.uri}")
-        await self.send_message({"type": "connect", "player_name": self.player_name})
+        connect = {"type": "connect", "player_name": self.player_name}
+        if self.game_id:
+            connect["game_id"] = self.game_id
+        await self.send_message(connect)
 
 
     async def disconnect(self) -> None:
@@ -48,12 +54,21 @@ class GameClient:
             return
         try:
             async for raw in self._ws:
-                self.ui.display(json.loads(raw))
+                self.ui.display(self._localize(json.loads(raw)))
         except websockets.exceptions.ConnectionClosed:
             self.ui.console.print("[yellow]⚠️ Connection closed by server[/yellow]")
             self.connected = False
 
 
+    def _localize(self, message: dict) -> dict:
+        """Turn shared server state into this player's view of it."""
+        if message.get("type") == "welcome":
+            self.player_id = message.get("player_id")
+        elif message.get("type") == "turn_changed":
+            return turn_status_for(message, self.player_id)
+        return message
+
+
     async def run(self) -> None: 
         """Connect, then run receive + input concurrently"""
         await self.connect()
@@ -20,8 +20,8 @@ class InputHandler:
 
     async def run(self) -> None: # the prompt loop
         self.console.print(
-            "[bold]Commands:[/bold] chat <msg>, roll <dice>, move <dir>, "
-            "look, who, inspect <name>, stats, help, quit\n"
+            "[bold]Commands:[/bold] chat <msg>, roll [--odds] <dice>, move <dir>, "
+            "look, who, inspect <name>, names <prefix>, rename <name>, stats, help, quit\n"
             "[dim]Shortcuts: n/s/e/w, l=look, q=quit, h=help[/dim]"
         )
         session = PromptSession()
@@ -62,8 +62,8 @@ class InputHandler:
         elif cmd == "chat":
             await self.send({"type": "chat", "message": " ".join(parts[1:])})
         elif cmd == "roll":
-            dice = parts[1] if len(parts) > 1 else "1d6"
-            await self.send({"type": "action", "action": "roll", "args": [dice]})
+            args = parts[1:] or ["1d6"]
+            await self.send({"type": "action", "action": "roll", "args": args})
         elif cmd == "move":
             raw_dir = parts[1] if len(parts) > 1 else ""
             direction = DIRECTION_ALIASES.get(raw_dir.lower(), raw_dir.lower())
@@ -79,6 +79,15 @@ class InputHandler:
         elif cmd == "inspect":
             target = parts[1] if len(parts) > 1 else ""
             await self.send({"type": "action", "action": "inspect", "args": [target]})
+        elif cmd == "names":
+            prefix = parts[1] if len(parts) > 1 else ""
+            await self.send({"type": "complete_name", "prefix": prefix})
+        elif cmd == "rename":
+            if len(parts) < 2:
+                self.console.print("[yellow]Usage: rename <name>[/yellow]")
+            else:
+                self.player_name = " ".join(parts[1:])
+                await self.send({"type": "rename", "player_name": self.player_name})
         else:
             self.console.print(f"[yellow]Unknown command: {cmd}[/yellow]")
 
@@ -16,6 +16,8 @@ class ClientUI:
             "connected": self.display_connected,
             "player_joined": self.display_player_joined,
             "player_left": self.display_player_left,
+            "player_renamed": self.display_player_renamed,
+            "name_completions": self.display_name_completions,
             "chat": self.display_chat,
             "action_announcement": self.display_action_announcement,
             "action_result": self.display_action_result,
@@ -63,6 +65,21 @@ class ClientUI:
         )
 
 
+    def display_player_renamed(self, message: dict) -> None:
+        self.console.print(
+            f"[dim]~[/dim] [yellow]{message.get('old_name', 'Someone')}[/yellow] is now "
+            f"[cyan]{message.get('player', 'Someone')}[/cyan]"
+        )
+
+
+    def display_name_completions(self, message: dict) -> None:
+        names = message.get("names") or []
+        if names:
+            self.console.print(f"[bold]Players:[/bold] {', '.join(names)}")
+        else:
+            self.console.print(f"[dim]No players named {message.get('prefix', '')}...[/dim]")
+
+
     def display_chat(self, message: dict) -> None:
         self.console.print(
             f"[bold cyan]{message.get('player', 'Unknown')}[/bold cyan]: "
@@ -28,13 +28,15 @@ class CommandDef:
 
 
 COMMANDS: list[CommandDef] = [
-    CommandDef("roll",    "Roll dice (e.g. 2d6+1)"),
+    CommandDef("roll",    "Roll dice (e.g. 2d6+1, 4d6kh3); --odds for stats"),
     CommandDef("move",    "Move in a direction (n/s/e/w or full name)"),
     CommandDef("look",    "Get a description of the current room",       free=True),
     CommandDef("who",     "List all players in the game",                free=True),
     CommandDef("inspect", "View another player's stats: inspect <name>", free=True),
     CommandDef("stats",   "View your character stats",                   free=True),
     CommandDef("chat",    "Send a message to all players",               free=True,  multiplayer_only=True),
+    CommandDef("names",   "List player names starting with: names <prefix>", free=True, multiplayer_only=True),
+    CommandDef("rename",  "Change your name: rename <name>",             free=True,  multiplayer_only=True),
     CommandDef("help",    "View this help menu",                         free=True),
     CommandDef("quit",    "Quit the game"),
 ]
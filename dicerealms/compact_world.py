@@ -0,0 +1,412 @@
+# SPDX-License-Identifier: MIT
+# dicerealms/compact_world.py
+"""
+Array-backed World for very large realms.
+
+CompactWorld keeps the World API but stores the graph as flat arrays:
+- room IDs are interned to ints (row index), names/descriptions in lists
+- exits are CSR adjacency: `_offsets[i]:_offsets[i+1]` slices `_targets`
+  and `_dirs` (direction codes), sorted by (room, direction)
+- locked flags are a bitset over edge indices; exit descriptions are sparse
+
+Room objects are built on demand as detached views (snapshots); change the
+graph through World methods (`add_exit`, `connect`, `set_locked`,
+`describe`), not by mutating a returned Room. New exits are staged and merged into the CSR
+arrays on the next query, so bulk construction costs one sort.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+
+import numpy as np
+
+from dicerealms.world import (
+    OPPOSITE,
+    PATH_CACHE_SIZE,
+    Direction,
+    Exit,
+    FlatExits,
+    Room,
+    RoomRender,
+    World,
+    _bidirectional_bfs,
+)
+
+# Canonical directions get fixed codes; others are interned after them.
+DIRECTIONS: tuple[Direction, ...] = ("north", "east", "south", "west", "up", "down")
+MAX_DIRECTIONS = 256
+
+_NP_TYPES = {"q": np.int64, "i": np.int32, "B": np.uint8}
+
+
+def _to_array(typecode: str, values: np.ndarray) -> array:
+    out = array(typecode)
+    out.frombytes(values.astype(_NP_TYPES[typecode]).tobytes())
+    return out
+
+
+class CompactWorld(World):
+    """World stored as interned IDs and CSR adjacency arrays."""
+
+    def __init__(self, *, title: str = "DiceRealms", path_cache_size: int = PATH_CACHE_SIZE) -> None:
+        super().__init__(title=title, path_cache_size=path_cache_size)
+        self._ids: list[str] = []
+        self._index: dict[str, int] = {}
+        # None marks an ID only referenced by an exit (not yet added)
+        self._names: list[str | None] = []
+        self._descs: list[str] = []
+        self._dir_names: list[Direction] = list(DIRECTIONS)
+        self._dir_codes: dict[Direction, int] = {d: i for i, d in enumerate(DIRECTIONS)}
+        self._exit_descs: dict[tuple[int, int], str] = {}
+        # CSR adjacency
+        self._offsets = array("q", [0])
+        self._targets = array("i")
+        self._dirs = array("B")
+        self._locked = bytearray()
+        # Reverse CSR: incoming edges by target, as (source, forward edge index)
+        self._rev_offsets = array("q", [0])
+        self._rev_sources = array("i")
+        self._rev_edges = array("i")
+        # (room, direction code, target, locked) added since the last build
+        self._pending: list[tuple[int, int, int, bool]] = []
+        # Latest staged (target, locked) per (room, direction code), kept only
+        # while an index needs the exit each staged one replaces
+        self._staged: dict[tuple[int, int], tuple[int, bool]] = {}
+        # Views are detached, so look output is cached per index instead.
+        self._renders: dict[int, RoomRender] = {}
+
+    @classmethod
+    def from_world(cls, world: World) -> CompactWorld:
+        """Copy any World into the compact representation."""
+        cw = cls(title=world.title)
+        cw.start_room = world.start_room
+        for room in world.rooms():
+            cw.add_room(room)
+        return cw
+
+    # --- Interning ---
+    def _intern(self, room_id: str) -> int:
+        i = self._index.get(room_id)
+        if i is None:
+            i = len(self._ids)
+            self._index[room_id] = i
+            self._ids.append(room_id)
+            self._names.append(None)
+            self._descs.append("")
+            self._offsets.append(self._offsets[-1])
+            self._rev_offsets.append(self._rev_offsets[-1])
+        return i
+
+    def _dir_code(self, direction: Direction) -> int:
+        code = self._dir_codes.get(direction)
+        if code is None:
+            if len(self._dir_names) >= MAX_DIRECTIONS:
+                raise ValueError(f"Too many distinct directions (max {MAX_DIRECTIONS})")
+            code = len(self._dir_names)
+            self._dir_codes[direction] = code
+            self._dir_names.append(direction)
+        return code
+
+    def _require_index(self, room_id: str) -> int:
+        i = self._index.get(room_id)
+        if i is None or self._names[i] is None:
+            raise KeyError(f"Room not found: {room_id}")
+        return i
+
+    # --- CSR maintenance ---
+    def _build(self) -> None:
+        """Merge staged exits into the CSR arrays (later exits replace earlier ones)."""
+        n = len(self._ids)
+        old = len(self._targets)
+        pending = np.array(self._pending, dtype=np.int64).reshape(-1, 4)
+        counts = np.diff(np.frombuffer(self._offsets, dtype=np.int64))
+        src = np.concatenate((np.repeat(np.arange(len(counts)), counts), pending[:, 0]))
+        dirs = np.concatenate((np.frombuffer(self._dirs, dtype=np.uint8), pending[:, 1]))
+        dst = np.concatenate((np.frombuffer(self._targets, dtype=np.int32), pending[:, 2]))
+        bits = np.unpackbits(
+            np.frombuffer(self._locked, dtype=np.uint8), count=old, bitorder="little"
+        )
+        locked = np.concatenate((bits, pending[:, 3].astype(np.uint8)))
+
+        key = src * MAX_DIRECTIONS + dirs
+        order = np.argsort(key, kind="stable")
+        ordered = key[order]
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = ordered[:-1] != ordered[1:]
+        order = order[last]
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src[order], minlength=n), out=offsets[1:])
+        self._offsets = _to_array("q", offsets)
+        self._targets = _to_array("i", dst[order])
+        self._dirs = _to_array("B", dirs[order])
+        self._locked = bytearray(np.packbits(locked[order], bitorder="little").tobytes())
+        self._pending = []
+        self._staged = {}
+
+        src, dst = src[order], dst[order]
+        by_target = np.argsort(dst, kind="stable")
+        rev_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(dst, minlength=n), out=rev_offsets[1:])
+        self._rev_offsets = _to_array("q", rev_offsets)
+        self._rev_sources = _to_array("i", src[by_target])
+        self._rev_edges = _to_array("i", by_target)
+
+    def _edges(self, i: int) -> range:
+        if self._pending:
+            self._build()
+        return range(self._offsets[i], self._offsets[i + 1])
+
+    def _is_locked(self, e: int) -> bool:
+        return bool(self._locked[e >> 3] >> (e & 7) & 1)
+
+    def _find_edge(self, i: int, code: int) -> int | None:
+        if self._pending:
+            self._build()
+        return self._built_edge(i, code)
+
+    def _built_edge(self, i: int, code: int) -> int | None:
+        """Room i's edge in direction `code` as of the last build."""
+        dirs = self._dirs
+        for e in range(self._offsets[i], self._offsets[i + 1]):
+            if dirs[e] == code:
+                return e
+        return None
+
+    def _view(self, i: int) -> Room:
+        room = Room(id=self._ids[i], name=self._names[i] or "", description=self._descs[i])
+        for e in self._edges(i):
+            code = self._dirs[e]
+            room.exits[self._dir_names[code]] = Exit(
+                to_room=self._ids[self._targets[e]],
+                description=self._exit_descs.get((i, code)),
+                locked=self._is_locked(e),
+            )
+        return room
+
+    # --- Mutation ---
+    def add_room(self, room: Room) -> None:
+        i = self._intern(room.id)
+        if self._names[i] is not None:
+            raise ValueError(f"Room {room.id} already exists")
+
+        self._names[i] = room.name
+        self._descs[i] = room.description
+        if self._components is not None:
+            self._components.room_added(room.id)
+        for d, ex in room.exits.items():
+            self._stage_exit(i, d, ex.to_room, ex.description, ex.locked)
+
+    def _stage_exit(
+        self, i: int, direction: Direction, to_room: str, description: str | None, locked: bool
+    ) -> None:
+        code = self._dir_code(direction.lower())
+        removed = None
+        to = self._intern(to_room)
+        if self._landmarks is not None or self._components is not None:
+            # Look the replaced exit up without a build, so bulk edits stay one sort.
+            old = self._staged.get((i, code))
+            if old is None:
+                e = self._built_edge(i, code)
+                if e is not None:
+                    old = self._targets[e], self._is_locked(e)
+            if old is not None and not old[1]:
+                removed = self._ids[old[0]]
+            self._staged[(i, code)] = (to, locked)
+        self._pending.append((i, code, to, locked))
+        if description is None:
+            self._exit_descs.pop((i, code), None)
+        else:
+            self._exit_descs[(i, code)] = description
+        self._renders.pop(i, None)
+        self._edge_changed(self._ids[i], removed=removed, added=None if locked else to_room)
+
+    def add_exit(
+        self,
+        room_id: str,
+        direction: Direction,
+        to_room: str,
+        *,
+        description: str | None = None,
+        locked: bool = False,
+    ) -> None:
+        self._stage_exit(self._require_index(room_id), direction, to_room, description, locked)
+
+    def connect(
+        self,
+        a_id: str,
+        direction: Direction,
+        b_id: str,
+        *,
+        bidir: bool = True,
+        description: str | None = None,
+        back_description: str | None = None,
+        locked: bool = False,
+        back_locked: bool | None = None,
+    ) -> None:
+        a = self._require_index(a_id)
+        b = self._require_index(b_id)
+        self._stage_exit(a, direction, b_id, description, locked)
+        if bidir:
+            back_dir = OPPOSITE.get(direction.lower())
+            if not back_dir:
+                raise ValueError(f"No opposite direction for '{direction}'")
+
+            self._stage_exit(
+                b,
+                back_dir,
+                a_id,
+                back_description,
+                locked if back_locked is None else back_locked,
+            )
+
+    def set_locked(self, room_id: str, direction: Direction, locked: bool = True) -> None:
+        d = direction.lower()
+        i = self._require_index(room_id)
+        code = self._dir_codes.get(d)
+        e = None if code is None else self._find_edge(i, code)
+        if e is None:
+            raise KeyError(f"No exit {d} from room {room_id}")
+        if self._is_locked(e) == locked:
+            return
+        if locked:
+            self._locked[e >> 3] |= 1 << (e & 7)
+        else:
+            self._locked[e >> 3] &= ~(1 << (e & 7)) & 0xFF
+        self._renders.pop(i, None)
+        to_room = self._ids[self._targets[e]]
+        self._edge_changed(
+            room_id, removed=to_room if locked else None, added=None if locked else to_room
+        )
+
+    def describe(
+        self, room_id: str, *, name: str | None = None, description: str | None = None
+    ) -> None:
+        i = self._require_index(room_id)
+        if name is not None:
+            self._names[i] = name
+        if description is not None:
+            self._descs[i] = description
+        self._renders.pop(i, None)
+
+    # --- Queries ---
+    def has_room(self, room_id: str) -> bool:
+        i = self._index.get(room_id)
+        return i is not None and self._names[i] is not None
+
+    def require_room(self, room_id: str) -> Room:
+        return self._view(self._require_index(room_id))
+
+    def current_room(self, room_id: str) -> Room | None:
+        return self.require_room(room_id) if self.has_room(room_id) else None
+
+    def render(self, room_id: str) -> RoomRender:
+        i = self._require_index(room_id)
+        cached = self._renders.get(i)
+        if cached is None:
+            cached = self._renders[i] = self._view(i).render()
+        return cached
+
+    def neighbors(self, room_id: str) -> dict[Direction, str]:
+        edges = self._edges(self._require_index(room_id))
+        ids, dirs, targets, names = self._ids, self._dirs, self._targets, self._dir_names
+        return {names[dirs[e]]: ids[targets[e]] for e in edges if not self._is_locked(e)}
+
+    def move(self, room_id: str, direction: Direction) -> tuple[str | None, str]:
+        d = direction.lower()
+        i = self._require_index(room_id)
+        code = self._dir_codes.get(d)
+        e = None if code is None else self._find_edge(i, code)
+        if e is None:
+            return None, f"You can't go {d}."
+
+        if self._is_locked(e):
+            return None, f"{d} is locked."
+
+        j = self._targets[e]
+        name = self._names[j]
+        if name is None:
+            raise KeyError(f"Room not found: {self._ids[j]}")
+        return self._ids[j], f"You move {d} to {name}."
+
+    def rooms(self) -> Iterator[Room]:
+        return (self._view(i) for i, name in enumerate(self._names) if name is not None)
+
+    def _open_edges(self) -> tuple[list[str], np.ndarray, np.ndarray]:
+        if self._pending:
+            self._build()
+        counts = np.diff(np.frombuffer(self._offsets, dtype=np.int64))
+        src = np.repeat(np.arange(len(counts)), counts)
+        dst = np.frombuffer(self._targets, dtype=np.int32).astype(np.int64)
+        locked = np.unpackbits(
+            np.frombuffer(self._locked, dtype=np.uint8), count=len(dst), bitorder="little"
+        )
+        # Renumber over added rooms only; IDs only named by exits aren't rooms.
+        defined = np.array([name is not None for name in self._names], dtype=bool)
+        row = np.cumsum(defined) - 1
+        keep = (locked == 0) & defined[dst]
+        ids = [room_id for room_id, name in zip(self._ids, self._names, strict=True) if name is not None]
+        return ids, row[src[keep]], row[dst[keep]]
+
+    def _flat_exits(self) -> FlatExits:
+        # The CSR arrays already are the flat columns; copy them out.
+        if self._pending:
+            self._build()
+        targets = np.frombuffer(self._targets, dtype=np.int32).astype(np.int64)
+        return FlatExits(
+            ids=list(self._ids),
+            exists=np.array([name is not None for name in self._names], dtype=bool),
+            counts=np.diff(np.frombuffer(self._offsets, dtype=np.int64)),
+            dir_names=list(self._dir_names),
+            dirs=np.frombuffer(self._dirs, dtype=np.uint8).astype(np.int64),
+            targets=targets,
+            locked=np.unpackbits(
+                np.frombuffer(self._locked, dtype=np.uint8), count=len(targets), bitorder="little"
+            ).astype(bool),
+        )
+
+    def _dangling_exits(self) -> list[tuple[str, str]]:
+        if self._pending:
+            self._build()
+        ids, names, targets = self._ids, self._names, self._targets
+        return [
+            (ids[i], ids[targets[e]])
+            for i, name in enumerate(names)
+            if name is not None
+            for e in range(self._offsets[i], self._offsets[i + 1])
+            if names[targets[e]] is None and not self._is_locked(e)
+        ]
+
+    def _bfs_path(self, start_id: str, goal_id: str) -> list[str] | None:
+        if self._pending:
+            self._build()
+        offsets, targets, locked = self._offsets, self._targets, self._locked
+        rev_offsets, rev_sources, rev_edges = self._rev_offsets, self._rev_sources, self._rev_edges
+
+        def successors(i: int) -> list[int]:
+            return [
+                targets[e]
+                for e in range(offsets[i], offsets[i + 1])
+                if not locked[e >> 3] >> (e & 7) & 1
+            ]
+
+        def predecessors(i: int) -> list[int]:
+            out = []
+            for r in range(rev_offsets[i], rev_offsets[i + 1]):
+                e = rev_edges[r]
+                if not locked[e >> 3] >> (e & 7) & 1:
+                    out.append(rev_sources[r])
+            return out
+
+        path = _bidirectional_bfs(
+            self._index[start_id], self._index[goal_id], successors, predecessors
+        )
+        return None if path is None else [self._ids[i] for i in path]
+
+
+__all__ = [
+    "CompactWorld",
+    "DIRECTIONS",
+]
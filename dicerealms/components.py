@@ -0,0 +1,280 @@
+# SPDX-License-Identifier: MIT
+# dicerealms/components.py
+"""
+Connected regions of a world over its open (unlocked) exits.
+
+A ComponentIndex labels every room with the region it belongs to, where
+two rooms share a region if open exits link them, in either direction.
+When links are two-way (see `dicerealms world validate`) a region is
+exactly the set of rooms a player can walk to right now; one-way exits
+make it an upper bound, so a different region always means unreachable.
+
+The index keeps an undirected CSR copy of the open exits plus an overlay
+of edits, and follows exit changes through World's topology hook:
+- an edge between two regions relabels the smaller one into the larger
+- removing an edge searches outward from both of its ends at once, one
+  room per side per step; if one side runs out first it has split off,
+  so only that side is relabeled and the work is bounded by its size
+Nothing outside the affected region is touched. The overlay is folded back
+into the CSR arrays once it grows large.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from dicerealms.pathfinding import _csr
+
+if TYPE_CHECKING:
+    from dicerealms.world import Direction, World
+
+
+def _label(n: int, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Component label (smallest member index) per node, by hooking and pointer jumping."""
+    parent = np.arange(n, dtype=np.int64)
+    while True:
+        ps, pd = parent[src], parent[dst]
+        lo, hi = np.minimum(ps, pd), np.maximum(ps, pd)
+        spans = lo != hi
+        if not spans.any():
+            return parent
+        # Hook roots downward; parent[v] <= v always holds, so no cycles form.
+        parent[hi[spans]] = lo[spans]
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+
+
+class ComponentIndex:
+    """
+    Region labels for one World, kept in sync through World's add_room and
+    topology hook (see World.build_components).
+    """
+
+    def __init__(self, world: World) -> None:
+        self.world = world
+        self.builds = 0
+        self.merges = 0
+        self.splits = 0
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Recompute the adjacency copy and every label."""
+        ids, src, dst = self.world._open_edges()
+        s = np.asarray(src, dtype=np.int64)
+        d = np.asarray(dst, dtype=np.int64)
+        n = len(ids)
+        offsets, targets = _csr(n, np.concatenate((s, d)), np.concatenate((d, s)))
+        labels = _label(n, s, d)
+
+        self.ids = list(ids)
+        self.index = {room_id: i for i, room_id in enumerate(self.ids)}
+        self._offsets = array("q", offsets.tobytes())
+        self._targets = array("i", targets.astype(np.int32).tobytes())
+        self._built = n
+        self._labels = array("i", labels.astype(np.int32).tobytes())
+        # Rooms per label; labels of merged-away regions drop to 0.
+        self._sizes = array("i", np.bincount(labels, minlength=n).astype(np.int32).tobytes())
+        self.count = int(np.count_nonzero(self._sizes))
+        # Overlay of undirected link edits since the build.
+        self._added: dict[int, list[int]] = {}
+        self._removed: dict[int, dict[int, int]] = {}
+        # Open exits into rooms that don't exist (yet): target ID -> sources
+        self._dangling: dict[str, list[int]] = {}
+        for room_id, to_room in self.world._dangling_exits():
+            self._dangling.setdefault(to_room, []).append(self.index[room_id])
+        self._edits = 0
+        self._max_edits = max(1024, len(self._targets) // 8)
+        self.builds += 1
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the adjacency and label arrays."""
+        return sum(
+            len(a) * a.itemsize for a in (self._offsets, self._targets, self._labels, self._sizes)
+        )
+
+    # --- Graph ---
+    def _neighbors(self, v: int) -> list[int]:
+        out: list[int] = []
+        if v < self._built:
+            out = self._targets[self._offsets[v] : self._offsets[v + 1]].tolist()
+        if v in self._added:
+            out += self._added[v]
+        gone = self._removed.get(v)
+        if gone:
+            for u, times in gone.items():
+                for _ in range(times):
+                    out.remove(u)
+        return out
+
+    def _node(self, room_id: str) -> int | None:
+        """Row of room_id, adding rooms created since the build as new regions."""
+        v = self.index.get(room_id)
+        if v is None and self.world.has_room(room_id):
+            v = self.index[room_id] = len(self.ids)
+            self.ids.append(room_id)
+            label = len(self._sizes)
+            self._labels.append(label)
+            self._sizes.append(1)
+            self.count += 1
+            for u in self._dangling.pop(room_id, ()):
+                self._link(u, v)
+        return v
+
+    def _link(self, a: int, b: int) -> None:
+        self._edit()
+        gone = self._removed.get(a)
+        if gone and gone.get(b):
+            gone[b] -= 1
+            self._removed[b][a] -= 1
+        else:
+            self._added.setdefault(a, []).append(b)
+            self._added.setdefault(b, []).append(a)
+        la, lb = self._labels[a], self._labels[b]
+        if la == lb:
+            return
+        small, big = (la, lb) if self._sizes[la] < self._sizes[lb] else (lb, la)
+        self._relabel(a if small == la else b, small, big)
+        self._sizes[big] += self._sizes[small]
+        self._sizes[small] = 0
+        self.count -= 1
+        self.merges += 1
+
+    def _unlink(self, a: int, b: int) -> None:
+        self._edit()
+        for x, y in ((a, b), (b, a)):
+            extra = self._added.get(x)
+            if extra and y in extra:
+                extra.remove(y)
+            else:
+                gone = self._removed.setdefault(x, {})
+                gone[y] = gone.get(y, 0) + 1
+        if a == b or b in self._neighbors(a):
+            return  # a loop, or still linked by another exit
+
+        # Grow both sides a room at a time; a side that runs dry has split off.
+        label = self._labels[a]
+        seen = [{a}, {b}]
+        queues = [deque([a]), deque([b])]
+        while queues[0] and queues[1]:
+            for side in (0, 1):
+                v = queues[side].popleft()
+                for u in self._neighbors(v):
+                    if u in seen[1 - side]:
+                        return  # the ends still meet
+                    if u not in seen[side]:
+                        seen[side].add(u)
+                        queues[side].append(u)
+        part = seen[0] if not queues[0] else seen[1]
+        new = len(self._sizes)
+        self._sizes.append(len(part))
+        self._sizes[label] -= len(part)
+        for v in part:
+            self._labels[v] = new
+        self.count += 1
+        self.splits += 1
+
+    def _relabel(self, start: int, old: int, new: int) -> None:
+        labels = self._labels
+        labels[start] = new
+        queue = deque([start])
+        while queue:
+            for u in self._neighbors(queue.popleft()):
+                if labels[u] == old:
+                    labels[u] = new
+                    queue.append(u)
+
+    def _edit(self) -> None:
+        self._edits += 1
+        if self._edits > self._max_edits:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Fold the overlay into the CSR arrays, keeping labels as they are."""
+        n = len(self.ids)
+        src: list[int] = []
+        dst: list[int] = []
+        for v in range(n):
+            for u in self._neighbors(v):
+                src.append(v)
+                dst.append(u)
+        offsets, targets = _csr(n, np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64))
+        self._offsets = array("q", offsets.tobytes())
+        self._targets = array("i", targets.astype(np.int32).tobytes())
+        self._built = n
+        self._added = {}
+        self._removed = {}
+        self._edits = 0
+
+    # --- Patching (called from World's mutation hooks) ---
+    def room_added(self, room_id: str) -> None:
+        self._node(room_id)
+
+    def edge_added(self, a_id: str, b_id: str) -> None:
+        a, b = self._node(a_id), self._node(b_id)
+        if a is None:
+            return
+        if b is None:
+            self._dangling.setdefault(b_id, []).append(a)
+            return
+        self._link(a, b)
+
+    def edge_removed(self, a_id: str, b_id: str) -> None:
+        a, b = self.index.get(a_id), self.index.get(b_id)
+        if a is None:
+            return
+        if b is None:
+            pending = self._dangling.get(b_id)
+            if pending and a in pending:
+                pending.remove(a)
+            return
+        self._unlink(a, b)
+
+    # --- Queries ---
+    def component(self, room_id: str) -> int | None:
+        """Region label of a room (stable until the region merges or splits), or None."""
+        v = self._node(room_id)
+        return None if v is None else self._labels[v]
+
+    def connected(self, a_id: str, b_id: str) -> bool:
+        """Whether open exits link the two rooms (in either direction)."""
+        a, b = self._node(a_id), self._node(b_id)
+        return a is not None and b is not None and self._labels[a] == self._labels[b]
+
+    def size(self, room_id: str) -> int:
+        """Rooms in room_id's region (0 for unknown rooms)."""
+        v = self._node(room_id)
+        return 0 if v is None else self._sizes[self._labels[v]]
+
+    def rooms(self, room_id: str) -> list[str]:
+        """Every room in room_id's region, nearest first."""
+        v = self._node(room_id)
+        if v is None:
+            return []
+        seen = {v}
+        order = [v]
+        for w in order:
+            for u in self._neighbors(w):
+                if u not in seen:
+                    seen.add(u)
+                    order.append(u)
+        return [self.ids[i] for i in order]
+
+    def unlock_merges(self, room_id: str, direction: Direction) -> bool:
+        """Whether unlocking this exit would join two regions."""
+        ex = self.world.require_room(room_id).exits.get(direction.lower())
+        if ex is None:
+            raise KeyError(f"No exit {direction.lower()} from room {room_id}")
+        return self.world.has_room(ex.to_room) and not self.connected(room_id, ex.to_room)
+
+
+__all__ = [
+    "ComponentIndex",
+]
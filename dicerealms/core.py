@@ -1,31 +1,685 @@
 # SPDX-License-Identifier: MIT
 # dicerealms/core.py
+"""
+Dice expressions for DiceRealms.
+
+Grammar (case-insensitive, whitespace ignored):
+    expr     := ['+'|'-'] term (('+'|'-') term)*
+    term     := dice | integer
+    dice     := [count] 'd' (sides | '%') modifier*
+    modifier := 'kh' N | 'kl' N | 'k' N     keep highest/lowest N dice
+              | 'dh' N | 'dl' N             drop highest/lowest N dice
+              | '!'                         exploding (max face rolls again)
+              | 'adv' | 'dis'               roll the term twice, keep better/worse
+
+Examples: '2d6', '1d20+5', '2d6+1d4+3', '4d6kh3', '3d6!', 'd20adv', 'd%'.
+
+Expressions are compiled once into a DiceExpr and cached (see compile_dice),
+so repeated rolls of the same text skip parsing entirely. dice_stats gives
+the exact distribution of an expression without sampling.
+
+Every roll accepts an optional `rng` (a NumPy Generator or a DicePool).
+RngStreams hands out independent, reproducible Philox streams per
+game/player from a single master seed; without one, rolls draw from a
+module-level DicePool of pre-generated faces.
+"""
+
 from __future__ import annotations
 
-import random
+import hashlib
+import math
 import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from dicerealms.dice_pool import DicePool, PoolStats
+
+# Anything with a Generator-compatible integers(); see dicerealms.dice_pool.
+DiceRng = np.random.Generator | DicePool
 
-_DICE_RE = re.compile(r"^\s*(\d+)d(\d+)([+-]\d+)?\s*$", re.I)
+_TERM_RE = re.compile(
+    r"([+-])(?:(\d*)d(\d+|%)((?:k[hl]?\d+|d[hl]\d+|!|adv|dis)*)|(\d+))"
+)
+_MOD_RE = re.compile(r"(k[hl]?|d[hl])(\d+)|(!)|(adv|dis)")
 
+COMPILE_CACHE_SIZE = 512
+STATS_CACHE_SIZE = 128
+# An exploding die stops after this many re-rolls so a run of max faces stays bounded.
+MAX_EXPLOSIONS = 100
+# Rolls with more dice than this are best reported as a RollSummary than a parts list.
+ROLL_SUMMARY_THRESHOLD = 1000
+# Most dice a server roll may throw; a summary streams ~100M faces/s on the event loop.
+ROLL_MAX_DICE = 1_000_000
+# Faces generated per step when streaming a roll (see DiceExpr.roll_summary).
+STREAM_CHUNK = 1 << 20
+# Exact keep-highest/lowest stats cost about span**2 * kept dice, where span is
+# kept dice times die faces (explosion depths included); larger terms are refused.
+STATS_MAX_KEEP_SPAN = 1000
+# Any term's distribution holds one probability per reachable total; terms (and
+# whole expressions) with more totals than this are refused rather than allocated.
+STATS_MAX_SPAN = 1 << 20
 
-def roll_dice(dice: str) -> tuple[int, list[int]]:
+# Applied 'nosec' since this is a simple (non-cryptographic) random number generator.
+_rng: DiceRng = DicePool(np.random.default_rng())  # nosec
+
+
+class RngStreams:
     """
-    Supports forms like '2d6', '1d20+5', '4d8-2'.
-    Returns (total, parts).
+    Independent random streams derived from one master seed.
+
+    stream("game_1", "player_3") always yields the same Philox generator
+    sequence for the same master seed, regardless of which other streams
+    exist or in what order they were created, so games replay bit-exactly
+    and each worker/player can roll without sharing (or locking) a generator.
+
+    With `pool_capacity`, each stream is wrapped in a DicePool of that many
+    pre-generated faces per common die (still deterministic per seed).
     """
 
-    m = _DICE_RE.match(dice)
-    if not m:
-        raise ValueError(f"Invalid dice format: {dice!r}")
+    def __init__(self, seed: int | None = None, *, pool_capacity: int | None = None) -> None:
+        self.seed: int = np.random.SeedSequence(seed).entropy  # type: ignore[assignment]
+        self.pool_capacity = pool_capacity
+        self._streams: dict[tuple[int, ...], DiceRng] = {}
+
+    @staticmethod
+    def _key(part: str | int) -> int:
+        if isinstance(part, int) and part >= 0:
+            return part
+        digest = hashlib.blake2b(str(part).encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    def stream(self, *path: str | int) -> DiceRng:
+        """The generator for `path`, created on first use."""
+        key = tuple(self._key(p) for p in path)
+        rng = self._streams.get(key)
+        if rng is None:
+            seq = np.random.SeedSequence(self.seed, spawn_key=key)
+            rng = np.random.Generator(np.random.Philox(seq))
+            if self.pool_capacity:
+                rng = DicePool(rng, capacity=self.pool_capacity)
+            self._streams[key] = rng
+        return rng
+
+    def pool_stats(self) -> dict[int, PoolStats]:
+        """Pool counters summed over all live pooled streams, per die size."""
+        totals: dict[int, PoolStats] = {}
+        for rng in list(self._streams.values()):
+            if not isinstance(rng, DicePool):
+                continue
+            for sides, st in rng.stats().items():
+                acc = totals.setdefault(sides, PoolStats())
+                acc.hits += st.hits
+                acc.misses += st.misses
+                acc.bypassed += st.bypassed
+                acc.refills += st.refills
+                acc.level += st.level
+        return totals
+
+    def forget(self, *path: str | int) -> None:
+        """Drop a cached stream (e.g. when a player leaves)."""
+        self._streams.pop(tuple(self._key(p) for p in path), None)
+
+
+@dataclass(slots=True, frozen=True)
+class BatchRoll:
+    """Result of rolling one dice expression many times.
+
+    Attributes:
+        expression: The dice expression that was rolled
+        totals: int64 array of shape (n,), one total per roll (modifier applied)
+        parts: array of shape (n, dice), one row of die faces per roll
+    """
+
+    expression: str
+    totals: np.ndarray
+    parts: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+
+@dataclass(slots=True, frozen=True)
+class DiceTerm:
+    """A single 'NdS' term of an expression, with its modifiers.
+
+    Attributes:
+        count: Number of dice rolled
+        sides: Faces per die
+        sign: +1 or -1, how the term contributes to the total
+        keep: Number of dice kept (None keeps all)
+        keep_high: Keep the highest dice if True, the lowest otherwise
+        explode: Re-roll and add whenever a die shows its max face
+        advantage: +1 rolls twice keeping the better subtotal, -1 the worse, 0 neither
+    """
+
+    count: int
+    sides: int
+    sign: int = 1
+    keep: int | None = None
+    keep_high: bool = True
+    explode: bool = False
+    advantage: int = 0
+
+    @property
+    def num_dice(self) -> int:
+        """Number of faces this term reports in `parts`."""
+        return self.count * (2 if self.advantage else 1)
+
+    def _faces(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        return self._flat_faces(n * self.count, rng).reshape(n, self.count)
 
-    count, sides, mod = int(m.group(1)), int(m.group(2)), int(m.group(3) or 0)
-    if count <= 0 or sides <= 1:
+    def _flat_faces(self, m: int, rng: np.random.Generator) -> np.ndarray:
+        dtype = np.int32 if self.explode else np.min_scalar_type(self.sides)
+        faces = rng.integers(1, self.sides, size=m, dtype=dtype, endpoint=True)
+        if self.explode:
+            live = np.flatnonzero(faces == self.sides)
+            for _ in range(MAX_EXPLOSIONS):
+                if not live.size:
+                    break
+                extra = rng.integers(1, self.sides, size=live.size, endpoint=True)
+                faces[live] += extra
+                live = live[extra == self.sides]
+        return faces
+
+    def _face_counts(self, rng: np.random.Generator) -> np.ndarray:
+        """Roll `count` dice in STREAM_CHUNK steps; return counts indexed by face."""
+        counts = np.zeros(self.sides + 1, dtype=np.int64)
+        left = self.count
+        while left:
+            m = min(left, STREAM_CHUNK)
+            chunk = np.bincount(self._flat_faces(m, rng))
+            if len(chunk) > len(counts):
+                chunk[: len(counts)] += counts
+                counts = chunk.astype(np.int64)
+            else:
+                counts[: len(chunk)] += chunk
+            left -= m
+        return counts
+
+    def _counted_subtotal(self, counts: np.ndarray) -> int:
+        """Subtotal of one roll of this term, given its face counts."""
+        faces = np.arange(len(counts))
+        if self.keep is None or self.keep == self.count:
+            return int(faces @ counts)
+        if self.keep_high:
+            faces, counts = faces[::-1], counts[::-1]
+        before = np.cumsum(counts) - counts
+        kept = np.clip(self.keep - before, 0, counts)
+        return int(faces @ kept)
+
+    def _subtotals(self, faces: np.ndarray) -> np.ndarray:
+        if self.keep is None or self.keep == self.count:
+            return faces.sum(axis=1, dtype=np.int64)
+        ordered = np.sort(faces, axis=1)
+        kept = ordered[:, -self.keep :] if self.keep_high else ordered[:, : self.keep]
+        return kept.sum(axis=1, dtype=np.int64)
+
+    def roll_batch(
+        self, n: int, rng: DiceRng | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Roll this term `n` times. Returns (signed subtotals, faces)."""
+        rng = rng or _rng
+        faces = self._faces(n, rng)
+        subtotals = self._subtotals(faces)
+        if self.advantage:
+            second = self._faces(n, rng)
+            other = self._subtotals(second)
+            better = np.maximum if self.advantage > 0 else np.minimum
+            subtotals = better(subtotals, other)
+            faces = np.concatenate((faces, second), axis=1)
+        return self.sign * subtotals, faces
+
+    def _face_list(self, rng: DiceRng) -> list[int]:
+        if not self.explode and isinstance(rng, DicePool):
+            faces = rng.faces(self.sides, self.count)
+            if faces is not None:
+                return faces
+        return self._flat_faces(self.count, rng).tolist()
+
+    def roll_once(self, rng: DiceRng) -> tuple[int, list[int]]:
+        """Roll this term once with plain ints; same draws as roll_batch(1)."""
+        faces = self._face_list(rng)
+        subtotal = self._kept_sum(faces)
+        if self.advantage:
+            second = self._face_list(rng)
+            other = self._kept_sum(second)
+            subtotal = max(subtotal, other) if self.advantage > 0 else min(subtotal, other)
+            faces += second
+        return self.sign * subtotal, faces
+
+    def _kept_sum(self, faces: list[int]) -> int:
+        if self.keep is None or self.keep == self.count:
+            return sum(faces)
+        ordered = sorted(faces, reverse=self.keep_high)
+        return sum(ordered[: self.keep])
+
+    def roll_counts(self, rng: DiceRng | None = None) -> tuple[int, np.ndarray]:
+        """Roll this term once in constant memory. Returns (signed subtotal, face counts)."""
+        rng = rng or _rng
+        counts = self._face_counts(rng)
+        subtotal = self._counted_subtotal(counts)
+        if self.advantage:
+            second = self._face_counts(rng)
+            other = self._counted_subtotal(second)
+            subtotal = max(subtotal, other) if self.advantage > 0 else min(subtotal, other)
+            size = max(len(counts), len(second))
+            counts = np.pad(counts, (0, size - len(counts))) + np.pad(
+                second, (0, size - len(second))
+            )
+        return self.sign * subtotal, counts
+
+
+@dataclass(slots=True, frozen=True)
+class RollSummary:
+    """A single roll reported without its individual dice.
+
+    Attributes:
+        expression: The dice expression that was rolled
+        total: The roll's total (modifier applied)
+        dice: Number of dice rolled
+        min_face: Lowest face rolled
+        max_face: Highest face rolled
+        faces: Face value -> number of dice showing it
+    """
+
+    expression: str
+    total: int
+    dice: int
+    min_face: int
+    max_face: int
+    faces: dict[int, int]
+
+    def to_dict(self) -> dict:
+        return {
+            "dice": self.dice,
+            "min": self.min_face,
+            "max": self.max_face,
+            "faces": {str(face): n for face, n in self.faces.items()},
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class DiceExpr:
+    """A compiled dice expression: a sum of dice terms plus a constant.
+
+    Attributes:
+        text: The source expression
+        terms: Dice terms, in source order
+        modifier: Sum of all constant terms
+    """
+
+    text: str
+    terms: tuple[DiceTerm, ...]
+    modifier: int = 0
+
+    @property
+    def num_dice(self) -> int:
+        return sum(t.num_dice for t in self.terms)
+
+    def roll_batch(self, n: int, rng: DiceRng | None = None) -> BatchRoll:
+        """
+        Roll the expression `n` times in one vectorized draw per term.
+
+        Plain faces are stored in the smallest unsigned dtype that fits the
+        die, so a million 4d6 rolls cost ~4 MB of parts rather than ~100 MB.
+        """
+        if n < 0:
+            raise ValueError(f"Roll count must be >= 0: {n}")
+
+        totals = np.full(n, self.modifier, dtype=np.int64)
+        faces: list[np.ndarray] = []
+        for term in self.terms:
+            subtotals, term_faces = term.roll_batch(n, rng)
+            totals += subtotals
+            faces.append(term_faces)
+
+        parts = faces[0] if len(faces) == 1 else np.concatenate(faces, axis=1)
+        return BatchRoll(expression=self.text, totals=totals, parts=parts)
+
+    def roll(self, rng: DiceRng | None = None) -> tuple[int, list[int]]:
+        """Roll once. Returns (total, parts) as plain Python ints."""
+        rng = rng or _rng
+        total = self.modifier
+        parts: list[int] = []
+        for term in self.terms:
+            subtotal, faces = term.roll_once(rng)
+            total += subtotal
+            parts += faces
+        return total, parts
+
+    def roll_summary(self, rng: DiceRng | None = None) -> RollSummary:
+        """
+        Roll once, streaming the dice in chunks so memory stays constant
+        however many dice there are. Individual faces are reduced to counts.
+        """
+        total = self.modifier
+        faces: dict[int, int] = {}
+        for term in self.terms:
+            subtotal, counts = term.roll_counts(rng)
+            total += subtotal
+            for face in np.flatnonzero(counts).tolist():
+                faces[face] = faces.get(face, 0) + int(counts[face])
+
+        return RollSummary(
+            expression=self.text,
+            total=total,
+            dice=self.num_dice,
+            min_face=min(faces),
+            max_face=max(faces),
+            faces=dict(sorted(faces.items())),
+        )
+
+
+def _compile_term(sign: int, count: str, sides: str, mods: str, dice: str) -> DiceTerm:
+    n = int(count) if count else 1
+    s = 100 if sides == "%" else int(sides)
+    if n <= 0 or s <= 1:
         raise ValueError(f"Dice must be NdS with N>0 and S>1: {dice!r}")
 
-    # Applied 'nosec' to random since this is a simple random number generator.
-    rolls = [random.randint(1, sides) for _ in range(count)]  # nosec
-    total = sum(rolls)
-    if mod:
-        total += mod
+    keep: int | None = None
+    keep_high, explode, advantage = True, False, 0
+    for m in _MOD_RE.finditer(mods):
+        op, num, bang, adv = m.groups()
+        if bang:
+            explode = True
+        elif adv:
+            advantage = 1 if adv == "adv" else -1
+        else:
+            k = int(num)
+            if op.startswith("d"):
+                k, keep_high = n - k, op == "dl"
+            else:
+                keep_high = op != "kl"
+            if not 0 < k <= n:
+                raise ValueError(f"Keep/drop must leave between 1 and {n} dice: {dice!r}")
+            keep = k
+
+    return DiceTerm(
+        count=n,
+        sides=s,
+        sign=sign,
+        keep=keep,
+        keep_high=keep_high,
+        explode=explode,
+        advantage=advantage,
+    )
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def compile_dice(dice: str) -> DiceExpr:
+    """
+    Compile a dice expression into a reusable DiceExpr.
+
+    Results are memoized in a bounded LRU keyed by the expression text;
+    see compile_dice.cache_info() for hit rates.
+    """
+    src = re.sub(r"\s+", "", dice).lower()
+    if src[:1] not in ("+", "-"):
+        src = "+" + src
+
+    terms: list[DiceTerm] = []
+    modifier = 0
+    pos = 0
+    while pos < len(src):
+        m = _TERM_RE.match(src, pos)
+        if not m:
+            raise ValueError(f"Invalid dice format: {dice!r}")
+        sign_s, count, sides, mods, const = m.groups()
+        sign = -1 if sign_s == "-" else 1
+        if const is not None:
+            modifier += sign * int(const)
+        else:
+            terms.append(_compile_term(sign, count, sides, mods, dice))
+        pos = m.end()
+
+    if not terms:
+        raise ValueError(f"Invalid dice format: {dice!r}")
+
+    return DiceExpr(text=dice, terms=tuple(terms), modifier=modifier)
+
+
+def roll_dice_batch(
+    dice: str, n: int, rng: DiceRng | None = None
+) -> BatchRoll:
+    """Roll a dice expression `n` times. See DiceExpr.roll_batch."""
+    return compile_dice(dice).roll_batch(n, rng)
+
+
+def roll_dice_many(
+    dice: Sequence[str], n: int = 1, rng: DiceRng | None = None
+) -> list[BatchRoll]:
+    """
+    Roll several dice expressions `n` times each (e.g. a group roll).
+    Returns one BatchRoll per expression, in input order.
+    """
+    return [roll_dice_batch(expr, n, rng) for expr in dice]
+
+
+def roll_dice_summary(dice: str, rng: DiceRng | None = None) -> RollSummary:
+    """Roll a dice expression once without keeping its parts. See DiceExpr.roll_summary."""
+    return compile_dice(dice).roll_summary(rng)
+
+
+def roll_dice(dice: str, rng: DiceRng | None = None) -> tuple[int, list[int]]:
+    """
+    Supports forms like '2d6', '1d20+5', '4d8-2', '2d6+1d4+3', '4d6kh3'.
+    Returns (total, parts).
+    """
+    return compile_dice(dice).roll(rng)
+
+
+# --- Exact distributions ---
+
+# Exploding dice have unbounded support; explosion depths whose probability
+# falls below this are folded into the last kept depth.
+_EXPLODE_TAIL = 1e-18
+# Convolutions where both operands are at least this long go through the FFT.
+_FFT_MIN_LEN = 64
+
+
+@dataclass(slots=True, frozen=True)
+class DiceStats:
+    """Exact distribution of a dice expression.
+
+    Attributes:
+        expression: The dice expression described
+        min_total: Smallest possible total
+        pmf: Probability of each total from min_total to max_total
+        cdf: Running sum of pmf (P[total <= value])
+        mean: Expected total
+        variance: Variance of the total
+    """
+
+    expression: str
+    min_total: int
+    pmf: np.ndarray
+    cdf: np.ndarray
+    mean: float
+    variance: float
+
+    @property
+    def max_total(self) -> int:
+        return self.min_total + len(self.pmf) - 1
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def probability(self, total: int) -> float:
+        """P[total == value]."""
+        i = total - self.min_total
+        return float(self.pmf[i]) if 0 <= i < len(self.pmf) else 0.0
+
+    def at_least(self, total: int) -> float:
+        """P[total >= value], e.g. the odds of beating a DC."""
+        i = total - self.min_total
+        if i <= 0:
+            return 1.0
+        if i >= len(self.pmf):
+            return 0.0
+        return float(1.0 - self.cdf[i - 1])
+
+    def percentile(self, q: float) -> int:
+        """Smallest total whose cumulative probability reaches q percent."""
+        if not 0 <= q <= 100:
+            raise ValueError(f"Percentile must be within [0, 100]: {q}")
+        i = int(np.searchsorted(self.cdf, q / 100.0 - 1e-12))
+        return self.min_total + min(i, len(self.pmf) - 1)
+
+
+def _convolve(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if min(len(a), len(b)) < _FFT_MIN_LEN:
+        return np.convolve(a, b)
+    size = len(a) + len(b) - 1
+    nfft = 1 << (size - 1).bit_length()
+    out = np.fft.irfft(np.fft.rfft(a, nfft) * np.fft.rfft(b, nfft), nfft)[:size]
+    # FFT round-off can leave tiny negative probabilities.
+    return np.clip(out, 0.0, None)
+
+
+def _self_convolve(pmf: np.ndarray, n: int) -> np.ndarray:
+    """n-fold convolution of pmf with itself, by repeated squaring."""
+    result = np.ones(1)
+    base = pmf
+    while n:
+        if n & 1:
+            result = _convolve(result, base)
+        n >>= 1
+        if n:
+            base = _convolve(base, base)
+    return result
+
+
+def _explode_depth(sides: int) -> int:
+    """Re-rolls tracked for an exploding die before the tail is negligible."""
+    return min(MAX_EXPLOSIONS, math.ceil(math.log(_EXPLODE_TAIL) / math.log(1.0 / sides)))
+
+
+def _die_len(term: DiceTerm) -> int:
+    """len(_die_pmf(term)), without building it."""
+    if not term.explode:
+        return term.sides
+    return (_explode_depth(term.sides) + 1) * term.sides
+
+
+def _die_pmf(term: DiceTerm) -> np.ndarray:
+    """Distribution of a single die of `term`, indexed from a face of 1."""
+    s = term.sides
+    if not term.explode:
+        return np.full(s, 1.0 / s)
+
+    p = 1.0 / s
+    depth = _explode_depth(s)
+    probs = np.zeros((depth + 1) * s)
+    for k in range(depth + 1):
+        # k explosions, then a non-max face
+        probs[k * s : k * s + s - 1] = p ** (k + 1)
+    # The last re-roll sticks even on its max face.
+    probs[-1] = p ** (depth + 1)
+    return probs
+
+
+def _keep_pmf(die: np.ndarray, count: int, keep: int, high: bool) -> np.ndarray:
+    """
+    Distribution of the sum of the `keep` highest (or lowest) of `count` dice,
+    indexed from a total of 0.
+
+    Walks the faces from best to worst, deciding how many of the remaining
+    dice show each face; the first `keep` dice placed are the kept ones.
+    Only unfilled kept sets are tracked, one row per dice placed so far:
+    once a face fills the set, every die left must show a worse face, which
+    only scales that total.
+    """
+    sides = len(die)
+    length = keep * sides + 1
+    # log(n!) for the binomial weights; comb() overflows a float past ~1000 dice.
+    log_fact = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, count + 1)))))
+    faces = np.arange(sides, 0, -1) if high else np.arange(1, sides + 1)
+    probs = die[faces - 1]
+    # Probability of a face worse than each one
+    worse = np.concatenate((np.cumsum(probs[::-1])[::-1][1:], [0.0]))
+
+    states = np.zeros((keep, length))
+    states[0, 0] = 1.0
+    done = np.zeros(length)
+    placed = np.arange(keep)
+    for face, q, rest in zip(faces.tolist(), probs.tolist(), worse.tolist(), strict=True):
+        if not q:
+            continue
+        log_q = math.log(q)
+        nxt = states.copy()
+        # j more dice show this face and the kept set is still short
+        for j in range(1, keep):
+            n = count - placed[: keep - j]
+            w = np.exp(log_fact[n] - log_fact[j] - log_fact[n - j] + j * log_q)
+            shift = face * j
+            nxt[j:, shift:] += states[: keep - j, : length - shift] * w[:, None]
+        # Enough dice show this face to fill the kept set; the rest show worse ones
+        for m in range(keep):
+            n = count - m
+            j = np.arange(keep - m, n + 1) if rest > 0 else np.array([n])
+            log_w = log_fact[n] - log_fact[j] - log_fact[n - j] + j * log_q
+            if rest > 0:
+                log_w += (n - j) * math.log(rest)
+            shift = face * (keep - m)
+            done[shift:] += states[m, : length - shift] * np.exp(log_w).sum()
+        states = nxt
+    return done
+
+
+def _term_pmf(term: DiceTerm) -> tuple[int, np.ndarray]:
+    """Distribution of a term's signed subtotal as (lowest value, probs)."""
+    # Checked before anything is allocated: both sizes follow from the term alone.
+    die_len = _die_len(term)
+    if term.keep is None or term.keep == term.count:
+        if term.count * (die_len - 1) + 1 > STATS_MAX_SPAN:
+            raise ValueError(f"Too many totals for exact stats: {term.count}d{term.sides}")
+        lo, probs = term.count, _self_convolve(_die_pmf(term), term.count)
+    else:
+        if term.keep * die_len > STATS_MAX_KEEP_SPAN:
+            raise ValueError(f"Too many kept dice for exact stats: {term.count}d{term.sides}")
+        die = _die_pmf(term)
+        # Kept totals start at `keep` (every kept die showing a 1).
+        lo, probs = term.keep, _keep_pmf(die, term.count, term.keep, term.keep_high)[term.keep :]
+
+    if term.advantage:
+        cdf = np.minimum(np.cumsum(probs), 1.0)
+        if term.advantage > 0:
+            both = cdf**2
+        else:
+            both = 1.0 - (1.0 - cdf) ** 2
+        probs = np.diff(both, prepend=0.0)
+
+    if term.sign < 0:
+        lo, probs = -(lo + len(probs) - 1), probs[::-1]
+    return lo, probs
+
+
+@lru_cache(maxsize=STATS_CACHE_SIZE)
+def dice_stats(dice: str) -> DiceStats:
+    """
+    Exact distribution of a dice expression, by convolving per-term PMFs.
+
+    Memoized per expression text; the returned arrays are read-only.
+    """
+    expr = compile_dice(dice)
+    lo, probs = expr.modifier, np.ones(1)
+    for term in expr.terms:
+        t_lo, t_probs = _term_pmf(term)
+        if len(probs) + len(t_probs) - 1 > STATS_MAX_SPAN:
+            raise ValueError(f"Too many totals for exact stats: {dice}")
+        lo, probs = lo + t_lo, _convolve(probs, t_probs)
 
-    return total, rolls
+    probs = probs / probs.sum()
+    values = np.arange(lo, lo + len(probs))
+    mean = float(values @ probs)
+    variance = float(((values - mean) ** 2) @ probs)
+    cdf = np.cumsum(probs)
+    probs.flags.writeable = False
+    cdf.flags.writeable = False
+    return DiceStats(
+        expression=dice, min_total=lo, pmf=probs, cdf=cdf, mean=mean, variance=variance
+    )
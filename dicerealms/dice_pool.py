@@ -0,0 +1,289 @@
+# SPDX-License-Identifier: MIT
+# dicerealms/dice_pool.py
+"""
+Pre-generated die faces for high-rate rolling.
+
+A DicePool keeps a ring buffer of faces for each common die (d4 ... d100)
+and serves small draws by slicing it, which is much cheaper than a
+Generator call per roll. When a buffer runs low it is queued for a shared
+background thread that refills it with bulk vectorized draws.
+
+A DicePool stands in for a NumPy Generator anywhere dicerealms.core takes
+an `rng`: it only implements the `integers(1, sides, size, dtype,
+endpoint=True)` call the dice code makes. Each die size draws from its own
+child stream and faces are served in generation order, so a seeded pool
+replays identically no matter when the refiller happens to run.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import weakref
+from dataclasses import dataclass
+
+import numpy as np
+
+COMMON_SIDES: tuple[int, ...] = (4, 6, 8, 10, 12, 20, 100)
+POOL_CAPACITY = 4096
+
+
+@dataclass(slots=True)
+class PoolStats:
+    """Counters for one die size.
+
+    Attributes:
+        hits: Draws served entirely from the buffer
+        misses: Small draws that found the buffer short and refilled inline
+        bypassed: Draws larger than a refill block, generated directly
+        refills: Bulk refills performed
+        level: Faces currently buffered
+    """
+
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    refills: int = 0
+    level: int = 0
+
+
+class _SideBuffer:
+    """
+    Ring buffer of faces for one die size. All access holds `lock`.
+
+    Faces are only ever generated in whole `block`-sized draws. NumPy's
+    bounded draws depend on call sizes, so fixed blocks keep the sequence
+    identical however refills and draws interleave. Draws larger than a
+    block come from a separate `bypass` stream for the same reason.
+    """
+
+    __slots__ = (
+        "sides", "gen", "bypass", "buf", "block", "start", "size", "stats", "lock", "queued",
+        "__weakref__",
+    )
+
+    def __init__(
+        self, sides: int, gen: np.random.Generator, bypass: np.random.Generator, capacity: int
+    ) -> None:
+        self.sides = sides
+        self.gen = gen
+        self.bypass = bypass
+        self.buf = np.empty(capacity, dtype=np.min_scalar_type(sides))
+        self.block = max(1, capacity // 4)
+        self.start = 0
+        self.size = 0
+        self.stats = PoolStats()
+        self.lock = threading.Lock()
+        self.queued = False
+
+    def _push_block(self) -> None:
+        fresh = self.gen.integers(1, self.sides, size=self.block, dtype=self.buf.dtype, endpoint=True)
+        cap = len(self.buf)
+        tail = (self.start + self.size) % cap
+        first = min(self.block, cap - tail)
+        self.buf[tail : tail + first] = fresh[:first]
+        self.buf[: self.block - first] = fresh[first:]
+        self.size += self.block
+
+    def _pop(self, m: int) -> np.ndarray:
+        cap = len(self.buf)
+        end = self.start + m
+        if end <= cap:
+            out = self.buf[self.start : end].copy()
+        else:
+            out = np.concatenate((self.buf[self.start :], self.buf[: end - cap]))
+        self.start = end % cap
+        self.size -= m
+        return out
+
+    def refill(self) -> None:
+        with self.lock:
+            self.queued = False
+            if len(self.buf) - self.size < self.block:
+                return
+            while len(self.buf) - self.size >= self.block:
+                self._push_block()
+            self.stats.refills += 1
+
+    def take_list(self, m: int) -> list[int]:
+        """take() as plain ints; a hit that doesn't wrap skips the array copy."""
+        end = self.start + m
+        if m <= self.block and m <= self.size and end <= len(self.buf):
+            self.stats.hits += 1
+            out = self.buf[self.start : end].tolist()
+            self.start = end % len(self.buf)
+            self.size -= m
+            return out
+        return self.take(m).tolist()
+
+    def take(self, m: int) -> np.ndarray:
+        """Next `m` faces for this die size."""
+        # Decided by size alone: how full the buffer is depends on the refiller's timing.
+        if m > self.block:
+            self.stats.bypassed += 1
+            return self.bypass.integers(1, self.sides, size=m, dtype=self.buf.dtype, endpoint=True)
+
+        if m <= self.size:
+            self.stats.hits += 1
+            return self._pop(m)
+
+        self.stats.misses += 1
+        while self.size < m:
+            self._push_block()
+        return self._pop(m)
+
+
+class _Refiller:
+    """Single daemon thread refilling whichever buffers report running low."""
+
+    def __init__(self) -> None:
+        self._queue: queue.SimpleQueue[_SideBuffer] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def request(self, side: _SideBuffer) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="dicerealms-dice-pool", daemon=True
+                    )
+                    self._thread.start()
+        self._queue.put(side)
+
+    def _run(self) -> None:
+        while True:
+            self._queue.get().refill()
+
+
+_refiller = _Refiller()
+# Every live buffer, so a forked child can reset them
+_buffers: weakref.WeakSet[_SideBuffer] = weakref.WeakSet()
+
+
+def _reset_after_fork() -> None:
+    # The refiller thread does not survive fork(); let the child start its own.
+    # Refills queued in the parent are lost with it, and the thread may have
+    # held a buffer's lock, so every buffer starts unqueued and unlocked.
+    global _refiller
+    _refiller = _Refiller()
+    for side in _buffers:
+        side.lock = threading.Lock()
+        side.queued = False
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class DicePool:
+    """
+    Ring buffers of pre-rolled faces for common dice, backed by a Generator.
+
+    Args:
+        rng: Source generator; each pooled die size draws from a child stream.
+        sides: Die sizes to pool; other sizes go straight to `rng`.
+        capacity: Faces buffered per die size.
+        background: Refill low buffers on the shared refiller thread. If
+            False, buffers only refill when a draw comes up short.
+    """
+
+    def __init__(
+        self,
+        rng: np.random.Generator | None = None,
+        *,
+        sides: tuple[int, ...] = COMMON_SIDES,
+        capacity: int = POOL_CAPACITY,
+        background: bool = True,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError(f"Pool capacity must be > 0: {capacity}")
+        # Applied 'nosec' since this is a simple (non-cryptographic) random number generator.
+        self.rng = rng if rng is not None else np.random.default_rng()  # nosec
+        self.capacity = capacity
+        self.background = background
+        self._low_water = capacity // 4
+        children = self.rng.spawn(2 * len(sides))
+        self._sides = {
+            s: _SideBuffer(s, children[2 * i], children[2 * i + 1], capacity)
+            for i, s in enumerate(sides)
+        }
+        for side in self._sides.values():
+            side.refill()
+            side.stats.refills = 0
+            _buffers.add(side)
+
+    def integers(
+        self,
+        low: int,
+        high: int,
+        size: int | None = None,
+        dtype: type | np.dtype = np.int64,
+        endpoint: bool = False,
+    ) -> np.ndarray:
+        """Generator.integers subset: pooled for (1, sides, endpoint=True) draws."""
+        side = self._sides.get(high) if low == 1 and endpoint and isinstance(size, int) else None
+        if side is None:
+            return self.rng.integers(low, high, size=size, dtype=dtype, endpoint=endpoint)
+
+        with side.lock:
+            out = side.take(size)
+            low_now = side.size <= self._low_water and not side.queued
+            if low_now:
+                side.queued = True
+        if low_now:
+            self._refill(side)
+        return out.astype(dtype, copy=False)
+
+    def faces(self, sides: int, m: int) -> list[int] | None:
+        """
+        Next `m` faces of a pooled die as plain ints, the same ones `integers`
+        would return; None if `sides` isn't pooled. Single rolls go through
+        here: the array round trip would cost more than the draw itself.
+        """
+        side = self._sides.get(sides)
+        if side is None:
+            return None
+        with side.lock:
+            out = side.take_list(m)
+            low_now = side.size <= self._low_water and not side.queued
+            if low_now:
+                side.queued = True
+        if low_now:
+            self._refill(side)
+        return out
+
+    def _refill(self, side: _SideBuffer) -> None:
+        if self.background:
+            _refiller.request(side)
+        else:
+            side.refill()
+
+    def stats(self) -> dict[int, PoolStats]:
+        """Snapshot of per-die-size counters, for sizing the pool."""
+        result = {}
+        for s, side in self._sides.items():
+            with side.lock:
+                result[s] = PoolStats(
+                    hits=side.stats.hits,
+                    misses=side.stats.misses,
+                    bypassed=side.stats.bypassed,
+                    refills=side.stats.refills,
+                    level=side.size,
+                )
+        return result
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of poolable draws served from the buffer."""
+        snap = self.stats().values()
+        hits = sum(s.hits for s in snap)
+        total = hits + sum(s.misses for s in snap)
+        return hits / total if total else 0.0
+
+
+__all__ = [
+    "COMMON_SIDES",
+    "DicePool",
+    "PoolStats",
+]
@@ -5,14 +5,27 @@ from __future__ import annotations
 from collections.abc import Callable
 
 from dicerealms.commands import COMMAND_ALIASES, COMMANDS, DIRECTION_ALIASES
-from dicerealms.core import roll_dice
+from dicerealms.core import ROLL_SUMMARY_THRESHOLD, DiceRng, compile_dice, dice_stats
 from dicerealms.player import Player
-from dicerealms.world import World
+from dicerealms.world import RoomRender, World
+
+
+def _room_result(render: RoomRender) -> dict:
+    """Look/move result fields from a cached room render."""
+    return {
+        "room": render.name,
+        "description": render.description,
+        "exits": list(render.exits),
+        "text": render.text,
+        "markup": render.markup,
+    }
 
 
 def _render_plain(result: dict) -> str:
     t = result.get("type", "")
     if t == "look":
+        if "text" in result:
+            return result["text"]
         exits = ", ".join(result.get("exits", []))
         return (
             f"{result['room']}\n\n"
@@ -20,6 +33,8 @@ def _render_plain(result: dict) -> str:
             f"Exits: {exits}"
         )
     elif t == "move":
+        if "text" in result:
+            return f"{result['message']}\n\n{result['text']}"
         exits = ", ".join(result.get("exits", []))
         return (
             f"{result['message']}\n\n"
@@ -28,11 +43,24 @@ def _render_plain(result: dict) -> str:
             f"Exits: {exits}"
         )
     elif t == "roll":
+        if "summary" in result:
+            s = result["summary"]
+            return (
+                f"{result['expression']} --> "
+                f"{result['total']} "
+                f"({s['dice']} dice, min {s['min']}, max {s['max']})"
+            )
         return (
             f"{result['expression']} --> "
             f"{result['total']} "
             f"(Parts: {result['parts']})"
         )
+    elif t == "odds":
+        return (
+            f"{result['expression']}: mean {result['mean']:.2f} "
+            f"(sd {result['std']:.2f}), range {result['min']}-{result['max']}\n"
+            f"10% / 50% / 90%: {result['p10']} / {result['median']} / {result['p90']}"
+        )
     elif t == "stats":
         return (
             f"Name:  {result['name']}\n"
@@ -72,12 +100,14 @@ class GameEngine:
         output_fn: Callable[[str], None] | None = None,
         world: World | None = None,
         player: Player | None = None,
+        rng: DiceRng | None = None,
     ):
         self._running = False
         self._input = input_fn or (lambda: input("> "))
         self._output = output_fn or print
         self._world = world
         self._player = player
+        self._rng = rng
         self._handlers: dict[str, Callable[[list[str]], dict]] = {
             "roll":    self._cmd_roll,
             "move":    self._cmd_move,
@@ -135,21 +165,36 @@ class GameEngine:
         }
 
     def _cmd_roll(self, args: list[str]) -> dict:
-        if not args:
-            return {"type": "error", "message": "Usage: roll <dice-expr> (e.g. 2d6+1)"}
-        total, parts = roll_dice(args[0])
+        if not args or args == ["--odds"]:
+            return {"type": "error", "message": "Usage: roll [--odds] <dice-expr> (e.g. 2d6+1)"}
+        if args[0] == "--odds":
+            stats = dice_stats(args[1])
+            return {
+                "type": "odds",
+                "expression": args[1],
+                "mean": stats.mean,
+                "std": stats.std,
+                "min": stats.min_total,
+                "max": stats.max_total,
+                "p10": stats.percentile(10),
+                "median": stats.percentile(50),
+                "p90": stats.percentile(90),
+            }
+        expr = compile_dice(args[0])
+        if expr.num_dice > ROLL_SUMMARY_THRESHOLD:
+            summary = expr.roll_summary(self._rng)
+            return {
+                "type": "roll",
+                "expression": args[0],
+                "total": summary.total,
+                "summary": summary.to_dict(),
+            }
+        total, parts = expr.roll(self._rng)
         return {"type": "roll", "expression": args[0], "total": total, "parts": parts}
 
     def _cmd_look(self, _: list[str]) -> dict:
-        if self._world and self._player:
-            room = self._world.current_room(self._player.room)
-            if room:
-                return {
-                    "type": "look",
-                    "room": room.name,
-                    "description": room.description,
-                    "exits": sorted(room.neighbor().keys()),
-                }
+        if self._world and self._player and self._world.has_room(self._player.room):
+            return {"type": "look", **_room_result(self._world.render(self._player.room))}
         return {
             "type": "look",
             "room": "Dark Room",
@@ -170,13 +215,10 @@ class GameEngine:
         new_room_id, message = self._world.move(self._player.room, direction)
         if new_room_id:
             self._player.room = new_room_id
-            room = self._world.current_room(new_room_id)
             return {
                 "type": "move",
                 "message": message,
-                "room": room.name if room else new_room_id,
-                "description": room.description if room else "",
-                "exits": sorted(room.neighbor().keys()) if room else [],
+                **_room_result(self._world.render(new_room_id)),
             }
         return {"type": "error", "message": message}
 
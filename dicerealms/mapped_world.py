@@ -0,0 +1,372 @@
+# SPDX-License-Identifier: MIT
+# dicerealms/mapped_world.py
+"""
+Compiled, memory-mapped world files (.drw).
+
+A .drw file lays out a whole world as flat little-endian arrays:
+- a string table (offsets + UTF-8 blob) holding room IDs, names,
+  descriptions, direction names and exit descriptions
+- per-room string indices, plus a permutation of rooms sorted by ID bytes
+  so IDs resolve by binary search without building a dict
+- CSR exits (`edge_offsets[i]:edge_offsets[i+1]`) with target, direction,
+  description and locked flag per edge, and a reverse CSR for pathfinding
+
+MappedWorld opens the file with mmap, so opening is O(1) and every process
+on a host shares the same page-cache copy. Room objects are materialized
+only when first looked up; from then on that Room is authoritative, so
+World methods (`add_exit`, `set_locked`, `add_room`) work as usual and
+their edits live in memory on top of the read-only file.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Iterator
+
+import numpy as np
+
+from dicerealms.world import PATH_CACHE_SIZE, Exit, Room, World, _bidirectional_bfs
+
+MAGIC = b"DRWD"
+VERSION = 2
+
+# (name, array typecode), in file order
+SECTIONS: tuple[tuple[str, str], ...] = (
+    ("str_offsets", "q"),
+    ("str_data", "B"),
+    ("room_id", "i"),
+    ("room_name", "i"),
+    ("room_desc", "i"),
+    ("by_id", "i"),
+    ("edge_offsets", "q"),
+    # Room index; dangling exits store -(1 + string index of the target ID)
+    ("edge_target", "i"),
+    ("edge_dir", "i"),
+    # String index, or -1 for no description
+    ("edge_desc", "i"),
+    ("edge_locked", "B"),
+    ("rev_offsets", "q"),
+    ("rev_source", "i"),
+    ("rev_edge", "i"),
+)
+# magic, version, title and start room strings, room count, then (offset, count) per section
+_HEADER = struct.Struct(f"<4sIqqq{2 * len(SECTIONS)}Q")
+_ALIGN = 8
+
+
+class _Strings:
+    def __init__(self) -> None:
+        self.index: dict[str, int] = {}
+        self.data: list[bytes] = []
+
+    def add(self, s: str) -> int:
+        i = self.index.get(s)
+        if i is None:
+            i = self.index[s] = len(self.data)
+            self.data.append(s.encode())
+        return i
+
+
+def compile_world(world: World, path: str) -> int:
+    """
+    Write `world` as a .drw file; returns the number of rooms.
+
+    The file is written next to `path` and renamed into place.
+    """
+    strings = _Strings()
+    title = strings.add(world.title)
+    start = strings.add(world.start_room)
+    ids: list[str] = []
+    cols: dict[str, array] = {name: array(code) for name, code in SECTIONS}
+    for room in world.rooms():
+        ids.append(room.id)
+        cols["room_id"].append(strings.add(room.id))
+        cols["room_name"].append(strings.add(room.name))
+        cols["room_desc"].append(strings.add(room.description))
+    index = {room_id: i for i, room_id in enumerate(ids)}
+
+    offsets = cols["edge_offsets"]
+    offsets.append(0)
+    for room in world.rooms():
+        for d, ex in room.exits.items():
+            j = index.get(ex.to_room)
+            cols["edge_target"].append(-1 - strings.add(ex.to_room) if j is None else j)
+            cols["edge_dir"].append(strings.add(d))
+            cols["edge_desc"].append(-1 if ex.description is None else strings.add(ex.description))
+            cols["edge_locked"].append(ex.locked)
+        offsets.append(len(cols["edge_target"]))
+
+    n = len(ids)
+    src = np.repeat(np.arange(n, dtype=np.int64), np.diff(np.asarray(offsets, dtype=np.int64)))
+    dst = np.asarray(cols["edge_target"], dtype=np.int64)
+    edges = np.flatnonzero(dst >= 0)
+    by_target = edges[np.argsort(dst[edges], kind="stable")]
+    rev_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(dst[edges], minlength=n), out=rev_offsets[1:])
+    cols["rev_offsets"] = array("q", rev_offsets.tobytes())
+    cols["rev_source"] = array("i", src[by_target].astype(np.int32).tobytes())
+    cols["rev_edge"] = array("i", by_target.astype(np.int32).tobytes())
+    cols["by_id"] = array("i", sorted(range(n), key=lambda i: ids[i].encode()))
+
+    blob = b"".join(strings.data)
+    cols["str_data"] = array("B", blob)
+    str_offsets = cols["str_offsets"]
+    str_offsets.append(0)
+    for s in strings.data:
+        str_offsets.append(str_offsets[-1] + len(s))
+
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(bytes(_HEADER.size))
+            table: list[int] = []
+            for name, _ in SECTIONS:
+                f.write(bytes(-f.tell() % _ALIGN))
+                table += [f.tell(), len(cols[name])]
+                cols[name].tofile(f)
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, VERSION, title, start, n, *table))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return n
+
+
+class MappedWorld(World):
+    """World backed by a read-only, memory-mapped .drw file."""
+
+    def __init__(self, path: str, *, path_cache_size: int = PATH_CACHE_SIZE) -> None:
+        super().__init__(path_cache_size=path_cache_size)
+        self.path = path
+        if os.path.getsize(path) < _HEADER.size:
+            raise ValueError(f"Not a compiled DiceRealms world (or wrong version): {path}")
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, title, start, n, *table = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a compiled DiceRealms world (or wrong version): {path}")
+
+        view = memoryview(self._mm)
+        for (name, code), offset, count in zip(SECTIONS, table[::2], table[1::2], strict=True):
+            size = array(code).itemsize
+            setattr(self, f"_{name}", view[offset : offset + count * size].cast(code))
+        # Strings are sliced from the mmap directly, which yields comparable bytes.
+        self._str_base: int = table[2]
+        self._n: int = n
+        self.title = self._str(title)
+        self.start_room = self._str(start)
+        # Rooms added after opening get indices n, n+1, ...
+        self._extra: dict[str, int] = {}
+        self._extra_ids: list[str] = []
+        self._materialized = bytearray(n)
+        # Open-exit predecessors contributed by materialized rooms; exits of
+        # the others come from the file's reverse CSR.
+        self._preds = {}
+        # File edges to IDs outside the file, by target ID (built on first use)
+        self._outside: dict[str, list[int]] | None = None
+
+    @property
+    def room_count(self) -> int:
+        return self._n + len(self._extra_ids)
+
+    @property
+    def materialized(self) -> int:
+        """Rooms currently held as Room objects."""
+        return len(self._rooms)
+
+    # --- File access ---
+    def _raw(self, s: int) -> bytes:
+        so, base = self._str_offsets, self._str_base
+        return self._mm[base + so[s] : base + so[s + 1]]
+
+    def _str(self, s: int) -> str:
+        return self._raw(s).decode()
+
+    def _id(self, i: int) -> str:
+        return self._str(self._room_id[i]) if i < self._n else self._extra_ids[i - self._n]
+
+    def _index_of(self, room_id: str) -> int | None:
+        i = self._extra.get(room_id)
+        if i is not None:
+            return i
+        key = room_id.encode()
+        by_id, ids, raw = self._by_id, self._room_id, self._raw
+        lo, hi = 0, self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if raw(ids[by_id[mid]]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._n and raw(ids[by_id[lo]]) == key:
+            return by_id[lo]
+        return None
+
+    def _view(self, i: int) -> Room:
+        room = Room(
+            id=self._id(i),
+            name=self._str(self._room_name[i]),
+            description=self._str(self._room_desc[i]),
+        )
+        targets, descs = self._edge_target, self._edge_desc
+        for e in range(self._edge_offsets[i], self._edge_offsets[i + 1]):
+            t = targets[e]
+            room.exits[self._str(self._edge_dir[e])] = Exit(
+                to_room=self._id(t) if t >= 0 else self._str(-1 - t),
+                description=None if descs[e] < 0 else self._str(descs[e]),
+                locked=bool(self._edge_locked[e]),
+            )
+        return room
+
+    def _edge_source(self, e: int) -> int:
+        offsets = np.frombuffer(self._edge_offsets, dtype=np.int64)
+        return int(np.searchsorted(offsets, e, side="right")) - 1
+
+    def _outside_edges(self) -> dict[str, list[int]]:
+        """File edges whose target is not a file room (stored as a string), by target ID."""
+        if self._outside is None:
+            targets = np.frombuffer(self._edge_target, dtype=np.int32)
+            self._outside = {}
+            for e in np.flatnonzero(targets < 0).tolist():
+                self._outside.setdefault(self._str(-1 - int(targets[e])), []).append(e)
+        return self._outside
+
+    def _materialize(self, i: int) -> Room:
+        room = self._view(i)
+        self._rooms[room.id] = room
+        self._materialized[i] = 1
+        for ex in room.exits.values():
+            if not ex.locked:
+                self._preds.setdefault(ex.to_room, []).append(room.id)
+        return room
+
+    # --- Mutation ---
+    def add_room(self, room: Room) -> None:
+        if self.has_room(room.id):
+            raise ValueError(f"Room {room.id} already exists")
+
+        self._extra[room.id] = self._n + len(self._extra_ids)
+        self._extra_ids.append(room.id)
+        super().add_room(room)
+        # File rooms with exits to this ID resolve them once materialized.
+        for e in self._outside_edges().get(room.id, ()):
+            i = self._edge_source(e)
+            if not self._materialized[i]:
+                self._materialize(i)
+
+    # --- Queries ---
+    def has_room(self, room_id: str) -> bool:
+        return room_id in self._rooms or self._index_of(room_id) is not None
+
+    def require_room(self, room_id: str) -> Room:
+        room = self._rooms.get(room_id)
+        if room is not None:
+            return room
+        i = self._index_of(room_id)
+        if i is None:
+            raise KeyError(f"Room not found: {room_id}")
+        return self._materialize(i)
+
+    def current_room(self, room_id: str) -> Room | None:
+        return self.require_room(room_id) if self.has_room(room_id) else None
+
+    def rooms(self) -> Iterator[Room]:
+        """All rooms; ones not yet materialized are yielded as detached views."""
+        for i in range(self._n):
+            yield self._rooms[self._id(i)] if self._materialized[i] else self._view(i)
+        for room_id in self._extra_ids:
+            yield self._rooms[room_id]
+
+    # --- Pathfinding ---
+    def _overlay_edges(self) -> tuple[list[int], list[int]]:
+        src: list[int] = []
+        dst: list[int] = []
+        for room in self._rooms.values():
+            i = self._index_of(room.id)
+            for ex in room.exits.values():
+                j = None if ex.locked else self._index_of(ex.to_room)
+                if i is not None and j is not None:
+                    src.append(i)
+                    dst.append(j)
+        return src, dst
+
+    def _open_edges(self) -> tuple[list[str], np.ndarray, np.ndarray]:
+        n = self._n
+        ids = [self._id(i) for i in range(n)] + self._extra_ids
+        offsets = np.frombuffer(self._edge_offsets, dtype=np.int64)
+        dst = np.frombuffer(self._edge_target, dtype=np.int32).astype(np.int64)
+        src = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+        locked = np.frombuffer(self._edge_locked, dtype=np.uint8)
+        materialized = np.frombuffer(self._materialized, dtype=np.uint8)
+        keep = (locked == 0) & (dst >= 0) & (materialized[src] == 0)
+        extra_src, extra_dst = self._overlay_edges()
+        return (
+            ids,
+            np.concatenate((src[keep], np.asarray(extra_src, dtype=np.int64))),
+            np.concatenate((dst[keep], np.asarray(extra_dst, dtype=np.int64))),
+        )
+
+    def _dangling_exits(self) -> list[tuple[str, str]]:
+        out = [
+            (room.id, ex.to_room)
+            for room in self._rooms.values()
+            for ex in room.exits.values()
+            if not ex.locked and not self.has_room(ex.to_room)
+        ]
+        for to_room, edges in self._outside_edges().items():
+            if self.has_room(to_room):
+                continue
+            for e in edges:
+                i = self._edge_source(e)
+                if not self._materialized[i] and not self._edge_locked[e]:
+                    out.append((self._id(i), to_room))
+        return out
+
+    def _bfs_path(self, start_id: str, goal_id: str) -> list[str] | None:
+        n, mat, rooms, index_of, preds = (
+            self._n, self._materialized, self._rooms, self._index_of, self._preds
+        )
+        offsets, targets, locked = self._edge_offsets, self._edge_target, self._edge_locked
+        rev_offsets, rev_source, rev_edge = self._rev_offsets, self._rev_source, self._rev_edge
+
+        def successors(i: int) -> list[int]:
+            if i >= n or mat[i]:
+                exits = rooms[self._id(i)].exits.values()
+                found = (index_of(ex.to_room) for ex in exits if not ex.locked)
+                return [j for j in found if j is not None]
+            return [
+                t
+                for e in range(offsets[i], offsets[i + 1])
+                if not locked[e] and (t := targets[e]) >= 0
+            ]
+
+        def predecessors(i: int) -> list[int]:
+            out = []
+            if i < n:
+                for r in range(rev_offsets[i], rev_offsets[i + 1]):
+                    u = rev_source[r]
+                    if not mat[u] and not locked[rev_edge[r]]:
+                        out.append(u)
+            if preds:
+                found = (index_of(u) for u in preds.get(self._id(i), ()))
+                out += [j for j in found if j is not None]
+            return out
+
+        start, goal = index_of(start_id), index_of(goal_id)
+        if start is None or goal is None:
+            return None
+        path = _bidirectional_bfs(start, goal, successors, predecessors)
+        return None if path is None else [self._id(i) for i in path]
+
+
+__all__ = [
+    "MAGIC",
+    "MappedWorld",
+    "VERSION",
+    "compile_world",
+]
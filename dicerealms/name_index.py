@@ -0,0 +1,112 @@
+# SPDX-License-Identifier: MIT
+# dicerealms/name_index.py
+"""
+Case-insensitive name lookup and prefix matching.
+
+A NameIndex maps display names to string IDs (player IDs on the server).
+Names are compared casefolded, so "ALICE", "alice" and "Alice" are the
+same key. Exact lookups are one dict hit; prefix queries walk a trie to
+the prefix node and collect IDs beneath it in sorted key order, so their
+cost depends on the prefix and the matches, not on how many names are
+indexed.
+
+Names need not be unique: every ID under a key is kept, in insertion order.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+
+def fold(name: str) -> str:
+    """Key a name is indexed under."""
+    return name.casefold()
+
+
+class _Node:
+    __slots__ = ("children", "ids")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        # IDs whose whole key ends at this node (dict as an ordered set)
+        self.ids: dict[str, None] = {}
+
+
+class NameIndex:
+    """Casefolded name -> IDs, with a prefix trie for partial matches."""
+
+    def __init__(self) -> None:
+        self._exact: dict[str, dict[str, None]] = {}
+        self._root = _Node()
+
+    def add(self, item_id: str, name: str) -> None:
+        key = fold(name)
+        self._exact.setdefault(key, {})[item_id] = None
+        node = self._root
+        for ch in key:
+            node = node.children.setdefault(ch, _Node())
+        node.ids[item_id] = None
+
+    def remove(self, item_id: str, name: str) -> None:
+        """Forget item_id under name; unknown pairs are ignored."""
+        key = fold(name)
+        ids = self._exact.get(key)
+        if ids is None or item_id not in ids:
+            return
+        del ids[item_id]
+        if not ids:
+            del self._exact[key]
+
+        path = [self._root]
+        for ch in key:
+            path.append(path[-1].children[ch])
+        del path[-1].ids[item_id]
+        # Prune nodes left with neither IDs nor children.
+        for depth in range(len(key), 0, -1):
+            node = path[depth]
+            if node.ids or node.children:
+                break
+            del path[depth - 1].children[key[depth - 1]]
+
+    def rename(self, item_id: str, old: str, new: str) -> None:
+        self.remove(item_id, old)
+        self.add(item_id, new)
+
+    def lookup(self, name: str) -> list[str]:
+        """IDs indexed under exactly this name (ignoring case)."""
+        return list(self._exact.get(fold(name), ()))
+
+    def first(self, name: str) -> str | None:
+        """First ID indexed under this name, or None."""
+        ids = self._exact.get(fold(name))
+        return next(iter(ids)) if ids else None
+
+    def prefix(self, prefix: str, limit: int | None = None) -> list[str]:
+        """IDs whose name starts with prefix, in sorted name order."""
+        node = self._root
+        for ch in fold(prefix):
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        out: list[str] = []
+        for ids in self._walk(node):
+            for item_id in ids:
+                if limit is not None and len(out) >= limit:
+                    return out
+                out.append(item_id)
+        return out
+
+    def _walk(self, node: _Node) -> Iterator[dict[str, None]]:
+        # Depth-first, children in key order: shorter names come first.
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.ids:
+                yield node.ids
+            stack.extend(node.children[ch] for ch in sorted(node.children, reverse=True))
+
+
+__all__ = [
+    "NameIndex",
+    "fold",
+]
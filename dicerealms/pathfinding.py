@@ -0,0 +1,293 @@
+# SPDX-License-Identifier: MIT
+# dicerealms/pathfinding.py
+"""
+Landmark (ALT) index for fast shortest paths on large worlds.
+
+A LandmarkIndex stores BFS distances from and to a handful of landmark
+rooms, chosen by farthest-point sampling. By the triangle inequality,
+    max(d(L, goal) - d(L, v), d(v, L) - d(goal, L))
+is a lower bound on d(v, goal), which turns A* into a tight, goal-directed
+search instead of a BFS that floods the whole graph.
+
+The index keeps its own integer CSR copy of the open (unlocked) exits and
+one int16 row per room (int32 for huge diameters) holding d(L, v) for each
+landmark followed by -d(v, L), so the bound for a room is a single
+max(goal - row): a 500k-room world with 8 landmarks costs ~16 MB of
+distances. Unreachable pairs use a sentinel that makes the bound prune
+rooms that cannot reach the goal.
+
+Exit changes arrive through World's topology hook. They are recorded in a
+small overlay on the CSR arrays, and landmarks are patched cheaply: adding
+an edge that shortens no landmark distance, or removing one that lies on
+no shortest path, leaves a landmark valid. Otherwise only that landmark is
+dropped from the heuristic, which stays admissible. A room added since the
+build is cut off until an exit touches it; it then joins the index with
+unreachable distances, and the edit is patched in like any other. The
+index rebuilds itself once half its landmarks are invalid or the overlay
+grows large.
+"""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from operator import sub
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from dicerealms.world import World
+
+LANDMARK_COUNT = 8
+
+
+def _bfs(offsets: np.ndarray, targets: np.ndarray, source: int) -> np.ndarray:
+    """Level-synchronous BFS over CSR arrays; -1 marks unreachable."""
+    n = len(offsets) - 1
+    dist = np.full(n, -1, dtype=np.int64)
+    dist[source] = 0
+    # claim[] dedupes a level without sorting: the last writer wins each room.
+    claim = np.empty(n, dtype=np.int64)
+    frontier = np.array([source], dtype=np.int64)
+    level = 0
+    while frontier.size:
+        level += 1
+        starts = offsets[frontier]
+        lens = offsets[frontier + 1] - starts
+        total = int(lens.sum())
+        if not total:
+            break
+        base = np.repeat(starts - np.cumsum(lens) + lens, lens)
+        nxt = targets[base + np.arange(total)]
+        nxt = nxt[dist[nxt] < 0]
+        slots = np.arange(len(nxt))
+        claim[nxt] = slots
+        frontier = nxt[claim[nxt] == slots]
+        dist[frontier] = level
+    return dist
+
+
+def _csr(n: int, src: np.ndarray, dst: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(src, kind="stable")
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+    return offsets, dst[order]
+
+
+class LandmarkIndex:
+    """
+    ALT heuristic data for one World, kept in sync through World's
+    topology hook (see World.build_landmarks).
+    """
+
+    def __init__(self, world: World, count: int = LANDMARK_COUNT) -> None:
+        if count <= 0:
+            raise ValueError(f"Landmark count must be > 0: {count}")
+        self.world = world
+        self.count = count
+        self.builds = 0
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Recompute the adjacency copy, landmarks and distances."""
+        ids, src, dst = self.world._open_edges()
+        s = np.asarray(src, dtype=np.int64)
+        d = np.asarray(dst, dtype=np.int64)
+        n = len(ids)
+        fwd = _csr(n, s, d)
+        rev = _csr(n, d, s)
+
+        # Farthest-point sampling over rooms with any open exit; rooms not
+        # reached by earlier landmarks count as farthest.
+        candidate = np.zeros(n, dtype=bool)
+        candidate[s] = True
+        candidate[d] = True
+        nearest = np.where(candidate, np.iinfo(np.int64).max, -1)
+        k = min(self.count, int(candidate.sum()))
+        landmarks: list[int] = []
+        dist_from = np.zeros((n, k), dtype=np.int64)
+        dist_to = np.zeros((n, k), dtype=np.int64)
+        if k:
+            seed = _bfs(*fwd, int(np.argmax(candidate)))
+            nearest = np.where(candidate & (seed >= 0), seed, nearest)
+        for li in range(k):
+            lm = int(np.argmax(nearest))
+            landmarks.append(lm)
+            f = _bfs(*fwd, lm)
+            dist_from[:, li] = f
+            dist_to[:, li] = _bfs(*rev, lm)
+            nearest = np.where((f >= 0) & (nearest >= 0), np.minimum(nearest, f), nearest)
+            nearest[lm] = -1
+
+        longest = int(max(dist_from.max(initial=0), dist_to.max(initial=0)))
+        typecode, dtype, inf = (
+            ("h", np.int16, 0x7FFF) if longest < 0x3FFF else ("i", np.int32, 0x3FFFFFFF)
+        )
+        dist_from[dist_from < 0] = inf
+        dist_to[dist_to < 0] = inf
+
+        self.ids = list(ids)
+        self.index = {room_id: i for i, room_id in enumerate(ids)}
+        self.landmarks = [ids[lm] for lm in landmarks]
+        self.inf = inf
+        # Finite distances stay below inf // 2, so any bound above it used the sentinel.
+        self._unreachable = inf // 2
+        self._k = k
+        self._dist = array(typecode, np.hstack((dist_from, -dist_to)).astype(dtype).tobytes())
+        self._offsets = array("q", fwd[0].tobytes())
+        self._targets = array("i", fwd[1].astype(np.int32).tobytes())
+        # Overlay of edge edits since the build: extra successors, removed counts.
+        self._added: dict[int, list[int]] = {}
+        self._removed: dict[int, dict[int, int]] = {}
+        self._edits = 0
+        self._max_edits = max(1024, len(self._targets) // 16)
+        self.valid = [True] * k
+        self.stale = False
+        self.builds += 1
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the distance and adjacency arrays."""
+        return sum(
+            len(a) * a.itemsize for a in (self._dist, self._offsets, self._targets)
+        )
+
+    # --- Patching (called from World's topology hook) ---
+    def edge_added(self, a_id: str, b_id: str) -> None:
+        a, b = self._room(a_id), self._room(b_id)
+        self._edit()
+        gone = self._removed.get(a)
+        if gone and gone.get(b):
+            gone[b] -= 1
+        else:
+            self._added.setdefault(a, []).append(b)
+        k, D = self._k, self._dist
+        ra, rb = 2 * k * a, 2 * k * b
+        for li in range(k):
+            # d(L, a) + 1 < d(L, b)  or  d(b, L) + 1 < d(a, L)
+            if D[ra + li] + 1 < D[rb + li] or -D[rb + k + li] + 1 < -D[ra + k + li]:
+                self.valid[li] = False
+
+    def edge_removed(self, a_id: str, b_id: str) -> None:
+        a, b = self.index.get(a_id), self.index.get(b_id)
+        if a is None or b is None:
+            return
+        self._edit()
+        extra = self._added.get(a)
+        if extra and b in extra:
+            extra.remove(b)
+        else:
+            gone = self._removed.setdefault(a, {})
+            gone[b] = gone.get(b, 0) + 1
+        k, D, inf = self._k, self._dist, self.inf
+        ra, rb = 2 * k * a, 2 * k * b
+        for li in range(k):
+            # The edge was on a shortest path from or to L.
+            fa, ta = D[ra + li], -D[ra + k + li]
+            if (fa != inf and D[rb + li] == fa + 1) or (ta != inf and ta == 1 - D[rb + k + li]):
+                self.valid[li] = False
+
+    def _room(self, room_id: str) -> int:
+        """Row of a room, appending one for a room unseen since the build."""
+        i = self.index.get(room_id)
+        if i is None:
+            # No exits yet: nothing reaches it and it reaches nothing, exactly.
+            i = self.index[room_id] = len(self.ids)
+            self.ids.append(room_id)
+            self._dist.extend([self.inf] * self._k + [-self.inf] * self._k)
+            self._offsets.append(self._offsets[-1])
+        return i
+
+    def _edit(self) -> None:
+        self._edits += 1
+        if self._edits > self._max_edits:
+            self.stale = True
+
+    def _successors(self, v: int) -> list[int]:
+        succ = self._targets[self._offsets[v] : self._offsets[v + 1]].tolist()
+        if v in self._added:
+            succ += self._added[v]
+        gone = self._removed.get(v)
+        if gone:
+            for u, times in gone.items():
+                for _ in range(times):
+                    succ.remove(u)
+        return succ
+
+    # --- Queries ---
+    def _refresh(self) -> None:
+        if self.stale or 2 * sum(self.valid) < self._k:
+            self.rebuild()
+
+    def _lookup(self, start_id: str, goal_id: str) -> tuple[int | None, int | None]:
+        self._refresh()
+        # A room missing here has had no open exit since the build: it is cut off.
+        return self.index.get(start_id), self.index.get(goal_id)
+
+    def _goal_vector(self, g: int) -> list[int]:
+        """Goal terms for max(goal - row); invalid landmarks can never win."""
+        width = 2 * self._k
+        goal = self._dist[g * width : (g + 1) * width].tolist()
+        never = -4 * self.inf
+        for li, ok in enumerate(self.valid):
+            if not ok:
+                goal[li] = goal[self._k + li] = never
+        return goal
+
+    def _bound(self, v: int, goal: list[int]) -> int:
+        width = len(goal)
+        return max(0, *map(sub, goal, self._dist[v * width : (v + 1) * width]))
+
+    def estimate(self, start_id: str, goal_id: str) -> int | None:
+        """Lower bound on the path length, or None if goal is provably unreachable."""
+        s, g = self._lookup(start_id, goal_id)
+        if s is None or g is None:
+            return 0 if start_id == goal_id else None
+        bound = self._bound(s, self._goal_vector(g))
+        return None if bound > self._unreachable else bound
+
+    def find_path(self, start_id: str, goal_id: str) -> list[str] | None:
+        """A* over the indexed graph, guided by the landmark bound."""
+        s, g = self._lookup(start_id, goal_id)
+        if s is None or g is None:
+            return [start_id] if start_id == goal_id else None
+        goal = self._goal_vector(g)
+        width = len(goal)
+        dist, unreachable, successors = self._dist, self._unreachable, self._successors
+
+        h0 = self._bound(s, goal)
+        if h0 > unreachable:
+            return None
+        came_from = {s: -1}
+        cost = {s: 0}
+        # Ties on f prefer the deeper room, which heads straight for the goal.
+        heap = [(h0, 0, s)]
+        while heap:
+            _, neg_dist, v = heapq.heappop(heap)
+            if v == g:
+                path = [v]
+                while (v := came_from[v]) != -1:
+                    path.append(v)
+                return [self.ids[i] for i in reversed(path)]
+            if -neg_dist > cost[v]:
+                continue
+            nd = 1 - neg_dist
+            for u in successors(v):
+                c = cost.get(u)
+                if c is not None and c <= nd:
+                    continue
+                # May dip below 0; still a consistent bound, and it saves a call.
+                est = max(map(sub, goal, dist[u * width : (u + 1) * width]))
+                if est > unreachable:
+                    continue
+                cost[u] = nd
+                came_from[u] = v
+                heapq.heappush(heap, (nd + est, -nd, u))
+        return None
+
+
+__all__ = [
+    "LANDMARK_COUNT",
+    "LandmarkIndex",
+]
@@ -0,0 +1,514 @@
+# SPDX-License-Identifier: MIT
+# dicerealms/procgen.py
+"""
+Deterministic procedural worlds.
+
+Every generator lays rooms out on an integer grid and decides each room
+and exit from a hash of (seed, coordinates), never from shared state, so
+any single room can be generated on its own, in any order, and comes out
+the same every time. That allows:
+- ProceduralWorld: generates rooms the first time they are looked up, so
+  an unbounded realm costs memory only for visited rooms
+- build_world(): eager worlds of a given size (10k, 100k, 1M rooms...)
+  for benchmarks; see benchmark_world()
+
+Room IDs are "<kind>:<x>,<y>" and exits are north (y - 1), south, east
+(x + 1) and west. Exits are symmetric unless locked doors say otherwise.
+
+Kinds:
+- grid: every cell open, linked to all four neighbours
+- caves: cells and passages open at random (above the percolation
+  threshold, so most caves join one large cave system)
+- town: streets every BLOCK cells; each building has one door onto a street
+- dungeon: a binary-tree maze (connected when bounded) with some extra
+  loops and a few locked doors
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+import tempfile
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from dicerealms.world import (
+    PATH_CACHE_SIZE,
+    SEARCH_LIMIT,
+    Direction,
+    Exit,
+    Room,
+    World,
+    _forward_bfs,
+)
+from dicerealms.world_io import load_world, save_world
+
+BENCH_SIZES = (10_000, 100_000, 1_000_000)
+
+_MASK = (1 << 64) - 1
+_STEPS: tuple[tuple[Direction, int, int], ...] = (
+    ("north", 0, -1),
+    ("east", 1, 0),
+    ("south", 0, 1),
+    ("west", -1, 0),
+)
+
+
+def _hash(*values: int) -> int:
+    """SplitMix64-style mix of the given ints; stable across runs and processes."""
+    h = 0x9E3779B97F4A7C15
+    for v in values:
+        h = (h ^ (v & _MASK)) * 0xBF58476D1CE4E5B9 & _MASK
+        h = (h ^ (h >> 27)) * 0x94D049BB133111EB & _MASK
+        h ^= h >> 31
+    return h
+
+
+def _unit(*values: int) -> float:
+    return _hash(*values) / 2.0**64
+
+
+class Generator:
+    """
+    Base class: a bounded (width x height) or unbounded grid of rooms.
+
+    Subclasses decide which cells are rooms (`is_open`), which neighbouring
+    rooms are linked (`linked`) and what rooms are called (`describe`).
+    """
+
+    kind = "grid"
+    NAMES: tuple[str, ...] = ("Field", "Meadow", "Heath", "Pasture", "Glade")
+    DETAILS: tuple[str, ...] = (
+        "Tall grass sways in the wind.",
+        "A stone marker stands half-buried here.",
+        "Wildflowers dot the ground.",
+        "The earth is trampled by many feet.",
+    )
+
+    def __init__(self, seed: int = 0, width: int | None = None, height: int | None = None) -> None:
+        if (width is not None and width <= 0) or (height is not None and height <= 0):
+            raise ValueError(f"World size must be positive: {width}x{height}")
+        self.seed = seed
+        self.width = width
+        self.height = height
+
+    @classmethod
+    def for_rooms(cls, rooms: int, seed: int = 0) -> Generator:
+        """A square generator with roughly `rooms` cells."""
+        side = max(1, math.isqrt(rooms - 1) + 1) if rooms > 0 else 1
+        return cls(seed, side, side)
+
+    @property
+    def bounded(self) -> bool:
+        return self.width is not None and self.height is not None
+
+    def room_id(self, x: int, y: int) -> str:
+        return f"{self.kind}:{x},{y}"
+
+    def parse(self, room_id: str) -> tuple[int, int] | None:
+        kind, sep, coords = room_id.partition(":")
+        if not sep or kind != self.kind:
+            return None
+        xs, comma, ys = coords.partition(",")
+        try:
+            x, y = int(xs), int(ys)
+        except ValueError:
+            return None
+        if not comma or room_id != self.room_id(x, y):
+            return None
+        return x, y
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return (self.width is None or 0 <= x < self.width) and (
+            self.height is None or 0 <= y < self.height
+        )
+
+    def contains(self, x: int, y: int) -> bool:
+        return self.in_bounds(x, y) and self.is_open(x, y)
+
+    # --- Layout hooks ---
+    def is_open(self, x: int, y: int) -> bool:
+        return True
+
+    def linked(self, x: int, y: int, nx: int, ny: int) -> bool:
+        """Whether neighbouring rooms (x, y) and (nx, ny) are connected."""
+        return True
+
+    def locked(self, x: int, y: int, nx: int, ny: int) -> bool:
+        return False
+
+    def describe(self, x: int, y: int) -> tuple[str, str]:
+        h = _hash(self.seed, x, y, 1)
+        name = self.NAMES[h % len(self.NAMES)]
+        detail = self.DETAILS[(h >> 16) % len(self.DETAILS)]
+        return f"{name} ({x}, {y})", detail
+
+    # --- Rooms ---
+    def start(self) -> str:
+        """ID of a room that always exists, for spawning players."""
+        return self.room_id(0, 0)
+
+    def room(self, room_id: str) -> Room | None:
+        """Generate one room, or None if room_id is not a room of this world."""
+        xy = self.parse(room_id)
+        if xy is None or not self.contains(*xy):
+            return None
+        return self._make(*xy)
+
+    def _make(self, x: int, y: int) -> Room:
+        name, description = self.describe(x, y)
+        room = Room(id=self.room_id(x, y), name=name, description=description)
+        for d, dx, dy in _STEPS:
+            nx, ny = x + dx, y + dy
+            if self.contains(nx, ny) and self.linked(x, y, nx, ny):
+                room.exits[d] = Exit(self.room_id(nx, ny), locked=self.locked(x, y, nx, ny))
+        return room
+
+    def rooms(self) -> Iterator[Room]:
+        """Every room, row by row (bounded generators only)."""
+        if not self.bounded:
+            raise ValueError("Cannot list the rooms of an unbounded world")
+        for y in range(self.height or 0):
+            for x in range(self.width or 0):
+                if self.is_open(x, y):
+                    yield self._make(x, y)
+
+
+def _edge(seed: int, x: int, y: int, nx: int, ny: int, salt: int) -> float:
+    """Hash of an undirected edge: the same from either end."""
+    a, b = sorted(((x, y), (nx, ny)))
+    return _unit(seed, *a, *b, salt)
+
+
+class GridGenerator(Generator):
+    """Open fields: every cell linked to every neighbour."""
+
+
+class CaveGenerator(Generator):
+    """Random caverns; `fill` of cells are open and `passage` of their links."""
+
+    kind = "caves"
+    NAMES = ("Cavern", "Grotto", "Tunnel", "Chasm", "Hollow")
+    DETAILS = (
+        "Water drips steadily from the ceiling.",
+        "Glittering crystals line the walls.",
+        "The air is cold and still.",
+        "Bats stir somewhere overhead.",
+    )
+
+    def __init__(
+        self,
+        seed: int = 0,
+        width: int | None = None,
+        height: int | None = None,
+        *,
+        fill: float = 0.85,
+        passage: float = 0.8,
+    ) -> None:
+        super().__init__(seed, width, height)
+        self.fill = fill
+        self.passage = passage
+
+    def is_open(self, x: int, y: int) -> bool:
+        return (x, y) == (0, 0) or _unit(self.seed, x, y, 2) < self.fill
+
+    def linked(self, x: int, y: int, nx: int, ny: int) -> bool:
+        return _edge(self.seed, x, y, nx, ny, 3) < self.passage
+
+
+class TownGenerator(Generator):
+    """Street grid every BLOCK cells; every other cell is a building with one door."""
+
+    kind = "town"
+    BLOCK = 3
+    STREETS = ("Lantern", "Market", "Miller", "Temple", "Harbor", "Ash", "Copper")
+    NAMES = ("Bakery", "Smithy", "Inn", "Chandlery", "House", "Shrine", "Tannery")
+    DETAILS = (
+        "The smell of fresh bread drifts in.",
+        "Shelves sag under goods of every kind.",
+        "A fire crackles in the hearth.",
+        "Townsfolk bustle past the windows.",
+    )
+
+    def is_street(self, x: int, y: int) -> bool:
+        # Bounded towns are ringed by streets so every building has a way out.
+        return (
+            x % self.BLOCK == 0
+            or y % self.BLOCK == 0
+            or x + 1 == self.width
+            or y + 1 == self.height
+        )
+
+    def door(self, x: int, y: int) -> tuple[int, int]:
+        """The street cell a building opens onto."""
+        streets = [(x + dx, y + dy) for _, dx, dy in _STEPS if self.is_street(x + dx, y + dy)]
+        return streets[_hash(self.seed, x, y, 4) % len(streets)]
+
+    def linked(self, x: int, y: int, nx: int, ny: int) -> bool:
+        a, b = self.is_street(x, y), self.is_street(nx, ny)
+        if a and b:
+            return True
+        if a:
+            return self.door(nx, ny) == (x, y)
+        if b:
+            return self.door(x, y) == (nx, ny)
+        return False
+
+    def describe(self, x: int, y: int) -> tuple[str, str]:
+        if not self.is_street(x, y):
+            return super().describe(x, y)
+        if y % self.BLOCK == 0:
+            street = self.STREETS[(y // self.BLOCK) % len(self.STREETS)]
+            return f"{street} Street ({x}, {y})", "Cobblestones run east and west."
+        road = self.STREETS[(x // self.BLOCK) % len(self.STREETS)]
+        return f"{road} Lane ({x}, {y})", "A narrow lane runs north and south."
+
+
+class DungeonGenerator(Generator):
+    """
+    Binary-tree maze: each cell carves north or east. `loops` of the other
+    walls are knocked through too, and `lock_rate` of doors are locked.
+    """
+
+    kind = "dungeon"
+    NAMES = ("Corridor", "Crypt", "Cell", "Vault", "Guardroom", "Ossuary")
+    DETAILS = (
+        "Chains hang from rusted brackets.",
+        "Old bones crunch underfoot.",
+        "Torchlight flickers on damp stone.",
+        "Something scratches behind the walls.",
+    )
+
+    def __init__(
+        self,
+        seed: int = 0,
+        width: int | None = None,
+        height: int | None = None,
+        *,
+        loops: float = 0.15,
+        lock_rate: float = 0.02,
+    ) -> None:
+        super().__init__(seed, width, height)
+        self.loops = loops
+        self.lock_rate = lock_rate
+
+    def carve(self, x: int, y: int) -> tuple[int, int] | None:
+        """The neighbour this cell opens onto (None for the top-right corner)."""
+        north = self.height is None or y > 0
+        east = self.width is None or x + 1 < self.width
+        if north and east:
+            north = _hash(self.seed, x, y, 5) & 1 == 0
+        if north:
+            return x, y - 1
+        return (x + 1, y) if east else None
+
+    def linked(self, x: int, y: int, nx: int, ny: int) -> bool:
+        return (
+            self.carve(x, y) == (nx, ny)
+            or self.carve(nx, ny) == (x, y)
+            or _edge(self.seed, x, y, nx, ny, 7) < self.loops
+        )
+
+    def locked(self, x: int, y: int, nx: int, ny: int) -> bool:
+        return _edge(self.seed, x, y, nx, ny, 6) < self.lock_rate
+
+
+GENERATORS: dict[str, type[Generator]] = {
+    cls.kind: cls for cls in (GridGenerator, CaveGenerator, TownGenerator, DungeonGenerator)
+}
+
+
+def make_generator(
+    kind: str, seed: int = 0, width: int | None = None, height: int | None = None
+) -> Generator:
+    try:
+        cls = GENERATORS[kind]
+    except KeyError:
+        known = ", ".join(GENERATORS)
+        raise ValueError(f"Unknown world kind '{kind}' (expected one of {known})") from None
+    return cls(seed, width, height)
+
+
+def build_world[W: World](
+    generator: Generator,
+    *,
+    world_cls: type[W] = World,
+    path_cache_size: int = PATH_CACHE_SIZE,
+) -> W:
+    """Eagerly generate every room of a bounded generator into a world."""
+    world = world_cls(
+        title=f"Generated {generator.kind} (seed {generator.seed})",
+        path_cache_size=path_cache_size,
+    )
+    world.start_room = generator.start()
+    for room in generator.rooms():
+        world.add_room(room)
+    return world
+
+
+class ProceduralWorld(World):
+    """
+    World whose rooms are generated on first lookup.
+
+    Generated rooms are cached and authoritative from then on, so World
+    methods can edit them. `rooms()` lists generated rooms only.
+    """
+
+    def __init__(
+        self,
+        generator: Generator,
+        *,
+        title: str | None = None,
+        search_limit: int = SEARCH_LIMIT,
+        path_cache_size: int = PATH_CACHE_SIZE,
+    ) -> None:
+        super().__init__(
+            title=title or f"Generated {generator.kind} (seed {generator.seed})",
+            path_cache_size=path_cache_size,
+        )
+        self.generator = generator
+        self.search_limit = search_limit
+        self.start_room = generator.start()
+
+    @property
+    def generated(self) -> int:
+        """Rooms held in memory."""
+        return len(self._rooms)
+
+    def _lookup(self, room_id: str) -> Room | None:
+        room = self._rooms.get(room_id)
+        if room is None:
+            room = self.generator.room(room_id)
+            if room is not None:
+                # Generation reveals a room; it doesn't change the graph.
+                self._rooms[room_id] = room
+        return room
+
+    def add_room(self, room: Room) -> None:
+        if self._lookup(room.id) is not None:
+            raise ValueError(f"Room {room.id} already exists")
+        super().add_room(room)
+
+    # Indexes need the whole graph (build_world() has one), so find_path stays a bounded BFS.
+    def build_landmarks(self, count: int = 8) -> None:
+        return None
+
+    def build_components(self) -> None:
+        return None
+
+    def has_room(self, room_id: str) -> bool:
+        return self._lookup(room_id) is not None
+
+    def require_room(self, room_id: str) -> Room:
+        room = self._lookup(room_id)
+        if room is None:
+            raise KeyError(f"Room not found: {room_id}")
+        return room
+
+    def current_room(self, room_id: str) -> Room | None:
+        return self._lookup(room_id)
+
+    def _bfs_path(self, start_id: str, goal_id: str) -> list[str] | None:
+        # Forward-only: an unbounded world has no predecessor lists.
+        return _forward_bfs(start_id, goal_id, self._lookup, self.search_limit)
+
+
+# --- Benchmarks ---
+@dataclass(slots=True)
+class WorldBenchmark:
+    """Timings for one generated world.
+
+    Attributes:
+        kind: Generator kind
+        rooms: Rooms in the world
+        build_seconds: Time to generate and add every room
+        path_seconds: Mean find_path time over random pairs (cache disabled)
+        path_length: Mean length of the paths found
+        move_seconds: Mean time per move() on a random walk
+        save_seconds: Time to write the world as JSON Lines
+        load_seconds: Time to stream it back in
+        file_bytes: Size of the JSON Lines file
+    """
+
+    kind: str
+    rooms: int
+    build_seconds: float
+    path_seconds: float
+    path_length: float
+    move_seconds: float
+    save_seconds: float
+    load_seconds: float
+    file_bytes: int
+
+
+def benchmark_world(
+    kind: str,
+    rooms: int,
+    *,
+    seed: int = 0,
+    paths: int = 10,
+    moves: int = 10_000,
+    world_cls: type[World] = World,
+) -> WorldBenchmark:
+    """Build a `kind` world of about `rooms` rooms and time common operations."""
+    generator = GENERATORS[kind].for_rooms(rooms, seed)
+    t0 = time.perf_counter()
+    world = build_world(generator, world_cls=world_cls, path_cache_size=0)
+    build = time.perf_counter() - t0
+
+    rng = random.Random(seed)
+    ids = [r.id for r in world.rooms()]
+    lengths: list[int] = []
+    t0 = time.perf_counter()
+    for _ in range(paths):
+        path = world.find_path(rng.choice(ids), rng.choice(ids))
+        if path is not None:
+            lengths.append(len(path) - 1)
+    path_time = (time.perf_counter() - t0) / max(1, paths)
+
+    here = generator.start()
+    t0 = time.perf_counter()
+    for _ in range(moves):
+        here = world.move(here, rng.choice(_STEPS)[0])[0] or here
+    move_time = (time.perf_counter() - t0) / max(1, moves)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "world.jsonl")
+        t0 = time.perf_counter()
+        save_world(world, path)
+        save = time.perf_counter() - t0
+        size = os.path.getsize(path)
+        t0 = time.perf_counter()
+        load_world(path, world_cls=world_cls)
+        load = time.perf_counter() - t0
+
+    return WorldBenchmark(
+        kind=kind,
+        rooms=len(ids),
+        build_seconds=build,
+        path_seconds=path_time,
+        path_length=sum(lengths) / len(lengths) if lengths else 0.0,
+        move_seconds=move_time,
+        save_seconds=save,
+        load_seconds=load,
+        file_bytes=size,
+    )
+
+
+__all__ = [
+    "BENCH_SIZES",
+    "CaveGenerator",
+    "DungeonGenerator",
+    "GENERATORS",
+    "Generator",
+    "GridGenerator",
+    "ProceduralWorld",
+    "SEARCH_LIMIT",
+    "TownGenerator",
+    "WorldBenchmark",
+    "benchmark_world",
+    "build_world",
+    "make_generator",
+]
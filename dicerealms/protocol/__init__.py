@@ -1,4 +1,22 @@
-from dicerealms.protocol.messages import ActionMessage, ChatMessage, ConnectMessage
+from dicerealms.protocol.messages import (
+    ActionMessage,
+    ChatMessage,
+    CompleteNameMessage,
+    ConnectMessage,
+    RenameMessage,
+    TurnChangedMessage,
+    TurnStatusMessage,
+    turn_status_for,
+)
 
-__all__ = ["ActionMessage", "ChatMessage", "ConnectMessage"]
+__all__ = [
+    "ActionMessage",
+    "ChatMessage",
+    "CompleteNameMessage",
+    "ConnectMessage",
+    "RenameMessage",
+    "TurnChangedMessage",
+    "TurnStatusMessage",
+    "turn_status_for",
+]
 
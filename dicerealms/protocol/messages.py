@@ -11,6 +11,7 @@ from typing import Literal, NotRequired, TypedDict
 class ConnectMessage(TypedDict):
     type: Literal["connect"]
     player_name: str
+    game_id: NotRequired[str]  # Game instance to join; "default" if omitted
 
 
 class ActionMessage(TypedDict):
@@ -25,10 +26,21 @@ class ChatMessage(TypedDict):
     target: NotRequired[str | None]  # For whispers
 
 
+class CompleteNameMessage(TypedDict):
+    type: Literal["complete_name"]
+    prefix: str  # Matched ignoring case
+
+
+class RenameMessage(TypedDict):
+    type: Literal["rename"]
+    player_name: str
+
+
 # Server -> Client Messages
 class ConnectedMessage(TypedDict):
     type: Literal["connected"]
     player_name: str
+    game_id: str
     message: str
 
 
@@ -53,6 +65,18 @@ class ChatBroadcastMessage(TypedDict):
     message: str
 
 
+class NameCompletionsMessage(TypedDict):
+    type: Literal["name_completions"]
+    prefix: str
+    names: list[str]  # Players in your game, sorted by name
+
+
+class PlayerRenamedMessage(TypedDict):
+    type: Literal["player_renamed"]
+    old_name: str
+    player: str
+
+
 class WelcomeMessage(TypedDict):
     type: Literal["welcome"]
     player_id: str
@@ -75,6 +99,15 @@ class ActionResultMessage(TypedDict):
     details: dict  # Action-specific details
 
 
+class TurnChangedMessage(TypedDict):
+    type: Literal["turn_changed"]
+    current_player: str
+    current_player_id: str | None
+    turn_in_progress: bool
+    queue: list[str]  # Player IDs in turn order
+
+
+# Derived by each client from TurnChangedMessage (see turn_status_for)
 class TurnStatusMessage(TypedDict):
     type: Literal["turn_status"]
     current_player: str
@@ -92,8 +125,28 @@ ServerMessage = {
     | PlayerLeftMessage
     | ErrorMessage
     | ChatBroadcastMessage
+    | NameCompletionsMessage
+    | PlayerRenamedMessage
     | ActionAnnouncementMessage
     | ActionResultMessage
-    | TurnStatusMessage
+    | TurnChangedMessage
 }
 
+
+def turn_status_for(message: TurnChangedMessage, player_id: str | None) -> TurnStatusMessage:
+    """
+    One player's view of a shared turn_changed frame.
+    """
+    queue = message["queue"]
+    current = message["current_player_id"]
+    is_your_turn = current is not None and current == player_id and not message["turn_in_progress"]
+    return {
+        "type": "turn_status",
+        "current_player": message["current_player"],
+        "current_player_id": current,
+        "is_your_turn": is_your_turn,
+        "waiting_for": None if is_your_turn else message["current_player"],
+        "queue_position": queue.index(player_id) if player_id in queue else -1,
+        "queue_size": len(queue),
+    }
+
@@ -1,5 +1,6 @@
+from dicerealms.server.game_instance import GameInstance
 from dicerealms.server.game_state import GameState, PlayerState
 from dicerealms.server.server import GameServer
 from dicerealms.server.turn_manager import TurnManager
 
-__all__ = ["GameState", "PlayerState", "GameServer", "TurnManager"]
+__all__ = ["GameInstance", "GameState", "PlayerState", "GameServer", "TurnManager"]
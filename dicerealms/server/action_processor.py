@@ -9,12 +9,19 @@ from collections.abc import Awaitable, Callable
 from loguru import logger
 
 from dicerealms.commands import COMMANDS, FREE_ACTIONS
-from dicerealms.core import roll_dice
+from dicerealms.core import (
+    ROLL_MAX_DICE,
+    ROLL_SUMMARY_THRESHOLD,
+    RngStreams,
+    compile_dice,
+    dice_stats,
+)
 from dicerealms.protocol.messages import (
     ActionAnnouncementMessage,
     ActionResultMessage,
     ErrorMessage,
 )
+from dicerealms.server.audit_log import RollAuditLog
 from dicerealms.server.game_state import GameState
 from dicerealms.server.turn_manager import TurnManager
 
@@ -29,7 +36,12 @@ class ActionProcessor:
         self, 
         game_state: GameState, 
         turn_manager: TurnManager, 
-        broadcast_callback: Callable[[dict], Awaitable[None]]):
+        broadcast_callback: Callable[[dict], Awaitable[None]],
+        rng: RngStreams | None = None,
+        roll_summary_threshold: int = ROLL_SUMMARY_THRESHOLD,
+        max_dice: int = ROLL_MAX_DICE,
+        audit_log: RollAuditLog | None = None,
+        game_id: str = "default"):
         """
         Initialize the Action Processor.
 
@@ -37,10 +49,21 @@ class ActionProcessor:
         - game_state: the shared game state.
         - turn_manager: the turn management system.
         - broadcast_callback: Async function to broadcast messages to all clients.
+        - rng: seeded streams; each player rolls from their own stream.
+        - roll_summary_threshold: rolls with more dice than this are sent as a
+          face-count summary instead of a list of every die.
+        - max_dice: rolls with more dice than this are refused; they run on the event loop.
+        - audit_log: if set, every roll is appended to this log.
+        - game_id: game recorded with each audited roll.
         """
         self.game_state = game_state
         self.turn_manager = turn_manager
         self.broadcast = broadcast_callback
+        self.rng = rng or RngStreams()
+        self.roll_summary_threshold = roll_summary_threshold
+        self.max_dice = max_dice
+        self.audit_log = audit_log
+        self.game_id = game_id
         self.action_delay = 2.0
 
     async def process_action(self, player_id: str, action: str, args: list[str]) -> dict:
@@ -68,8 +91,10 @@ class ActionProcessor:
 
         player_name = player.name
 
-        # FREE actions: skip turn validation, delay, and turn advance
-        if action.lower() in FREE_ACTIONS:
+        # FREE actions: skip turn validation, delay, and turn advance.
+        # Checking the odds of a roll doesn't roll anything, so it's free too.
+        is_odds = action.lower() == "roll" and args[:1] == ["--odds"]
+        if action.lower() in FREE_ACTIONS or is_odds:
             try:
                 result = await self._execute_action(player_id, action, args)
                 action_result: ActionResultMessage = {
@@ -177,7 +202,7 @@ class ActionProcessor:
 
         action_lower = action.lower()
         if action_lower == "roll":
-            return await self._execute_roll(args)
+            return await self._execute_roll(player_id, args)
         elif action_lower == "move":
             return await self._execute_move(player_id, args)
         elif action_lower == "look":
@@ -194,17 +219,44 @@ class ActionProcessor:
             raise ValueError(f"Unknown action: {action}")
 
 
-    async def _execute_roll(self, args: list[str]) -> dict:
+    async def _execute_roll(self, player_id: str, args: list[str]) -> dict:
         """
         Execute a dice roll action.
         """
 
-        if not args:
+        if not args or args == ["--odds"]:
             raise ValueError("Roll action requires a dice expression (IE: 2d6+1)")
-        
+
+        if args[0] == "--odds":
+            return await self._execute_odds(args[1])
+
         dice_expr = args[0]
         try:
-            total, parts = roll_dice(dice_expr)
+            expr = compile_dice(dice_expr)
+            if expr.num_dice > self.max_dice:
+                raise ValueError(f"Too many dice: {expr.num_dice} (limit {self.max_dice})")
+            rng = self.rng.stream(player_id)
+            if expr.num_dice > self.roll_summary_threshold:
+                summary = expr.roll_summary(rng)
+                if self.audit_log:
+                    self.audit_log.record(
+                        self.game_id, player_id, dice_expr, summary.total, n_parts=summary.dice
+                    )
+                return {
+                    "result": (
+                        f"Rolled {dice_expr} -> {summary.total} "
+                        f"({summary.dice} dice, min {summary.min_face}, max {summary.max_face})"
+                    ),
+                    "details": {
+                        "expression": dice_expr,
+                        "total": summary.total,
+                        "summary": summary.to_dict(),
+                    },
+                }
+
+            total, parts = expr.roll(rng)
+            if self.audit_log:
+                self.audit_log.record(self.game_id, player_id, dice_expr, total, parts)
             return {
                 "result": f"Rolled {dice_expr} -> {total} (Parts: {parts})",
                 "details": {
@@ -217,6 +269,37 @@ class ActionProcessor:
             raise ValueError(f"Invalid dice expression: {dice_expr} - {(e)}") from e
 
 
+    async def _execute_odds(self, dice_expr: str) -> dict:
+        """
+        Execute a 'roll --odds' action: exact stats for an expression, no roll.
+        """
+        try:
+            # Large keep terms take a while; don't stall the other tables meanwhile.
+            loop = asyncio.get_running_loop()
+            stats = await loop.run_in_executor(None, dice_stats, dice_expr)
+        except ValueError as e:
+            raise ValueError(f"Invalid dice expression: {dice_expr} - {(e)}") from e
+
+        p10, median, p90 = (stats.percentile(q) for q in (10, 50, 90))
+        return {
+            "result": (
+                f"Odds for {dice_expr}: mean {stats.mean:.2f} (sd {stats.std:.2f}), "
+                f"range {stats.min_total}-{stats.max_total}, "
+                f"10/50/90%: {p10}/{median}/{p90}"
+            ),
+            "details": {
+                "expression": dice_expr,
+                "mean": stats.mean,
+                "std": stats.std,
+                "min": stats.min_total,
+                "max": stats.max_total,
+                "p10": p10,
+                "median": median,
+                "p90": p90,
+            },
+        }
+
+
     async def _execute_move(self, player_id: str, args: list[str]) -> dict:
         """
         Execute a move action.
@@ -230,9 +313,10 @@ class ActionProcessor:
         if success:
             player = self.game_state.get_player(player_id)
             room = self.game_state.get_room(player.room) if player else None
+            render = self.game_state.world.render(room.id) if room else None
 
-            room_description = room.description if room else "Unknown room"
-            exits = ",".join(room.exits.keys()) if room and room.exits else "No Exits"
+            room_description = render.description if render else "Unknown room"
+            exits = ",".join(render.all_exits) if render and render.all_exits else "No Exits"
 
             return {
                 "result": message,
@@ -262,9 +346,10 @@ class ActionProcessor:
         players_in_room = self.game_state.get_players_in_room(player.room)
         other_players = [p.name for p in players_in_room if p.player_id != player_id]
 
-        exits = ",".join(room.exits.keys()) if room and room.exits else "None"
+        render = self.game_state.world.render(room.id)
+        exits = ",".join(render.all_exits) if render.all_exits else "None"
 
-        description = f"{room.description}\n"
+        description = f"{render.description}\n"
         if other_players:
             description += f"Other players in the room: {', '.join(other_players)}\n"
         description += f"Exits: {exits}"
@@ -273,8 +358,8 @@ class ActionProcessor:
             "result": description,
             "details": {
                 "room": player.room if player else "Unknown",
-                "description": room.description if room else "Unknown",
-                "exits": list(room.exits.keys()),
+                "description": render.description,
+                "exits": list(render.all_exits),
                 "other_players": [p.name for p in players_in_room],
             },
         }
@@ -322,16 +407,16 @@ class ActionProcessor:
             raise ValueError("Usage: inspect <player_name>")
         
         target_name = args[0]
-        target = next(
-            (p for p in self.game_state.players.values()
-            if p.name.lower() == target_name.lower()),
-            None,
-        )
+        target = self.game_state.find_player(target_name)
         if not target:
-            raise ValueError(f"Player '{target_name}' not found.")
+            # Fall back to a partial name, as long as it is unambiguous.
+            matches = self.game_state.players_with_prefix(target_name, limit=2)
+            if len(matches) != 1:
+                raise ValueError(f"Player '{target_name}' not found.")
+            target = matches[0]
         
         result = (
-            f"[{target_name}]\n"
+            f"[{target.name}]\n"
             f"Level: {target.level}  "
             f"HP: {target.hp}/{target.max_hp}  "
             f"MP: {target.mp}/{target.max_mp}"
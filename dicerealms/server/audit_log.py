@@ -0,0 +1,225 @@
+"""
+Append-only binary audit log of dice rolls for DiceRealms.
+
+Every roll is one fixed-size record (see RECORD_DTYPE), so the file is a
+flat array that can be memory-mapped and filtered with NumPy. Game IDs,
+player IDs and expressions are stored as 64-bit hashes (see id_hash); to
+look up a player, hash the ID you are auditing.
+
+Writes go through a background thread so disk I/O never runs on the event
+loop; record() only enqueues.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import queue
+import threading
+import time
+from collections.abc import Sequence
+from functools import lru_cache
+
+import numpy as np
+from loguru import logger
+
+MAGIC = b"DRRL"
+VERSION = 1
+HEADER_SIZE = 16
+# Dice beyond this are counted in n_parts but not stored.
+MAX_PARTS = 16
+# Records batched per write by the writer thread.
+WRITE_BATCH = 4096
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("ts_ns", "<i8"),
+        ("game", "<u8"),
+        ("player", "<u8"),
+        ("expr", "<u8"),
+        ("total", "<i8"),
+        ("n_parts", "<u4"),
+        ("parts", "<i4", (MAX_PARTS,)),
+    ]
+)
+
+
+@lru_cache(maxsize=4096)
+def id_hash(value: str) -> int:
+    """Stable 64-bit hash of an ID or expression, as stored in the log."""
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "little")
+
+
+def _header() -> bytes:
+    return (
+        MAGIC
+        + VERSION.to_bytes(4, "little")
+        + RECORD_DTYPE.itemsize.to_bytes(4, "little")
+        + bytes(HEADER_SIZE - 12)
+    )
+
+
+def _check_header(path: str, head: bytes) -> None:
+    if head != _header():
+        raise ValueError(f"Not a DiceRealms roll log (or wrong version): {path}")
+
+
+class RollAuditLog:
+    """
+    Buffered, append-only writer for the roll log.
+
+    Args:
+        path: Log file; created with a header if missing, appended to otherwise.
+            A partial record left at the end (e.g. by a crash mid-write) is
+            dropped first so new records stay aligned.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size >= HEADER_SIZE:
+            self._file = open(path, "r+b")
+            try:
+                _check_header(path, self._file.read(HEADER_SIZE))
+            except ValueError:
+                self._file.close()
+                raise
+            self._file.truncate(size - (size - HEADER_SIZE) % RECORD_DTYPE.itemsize)
+            self._file.seek(0, os.SEEK_END)
+        else:
+            self._file = open(path, "wb")
+            self._file.write(_header())
+            self._file.flush()
+
+        self._queue: queue.SimpleQueue[tuple | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="dicerealms-roll-log", daemon=True
+        )
+        self._thread.start()
+        self._closed = False
+
+    def record(
+        self,
+        game_id: str,
+        player_id: str,
+        expression: str,
+        total: int,
+        parts: Sequence[int] = (),
+        n_parts: int | None = None,
+    ) -> None:
+        """
+        Queue one roll for writing. `n_parts` defaults to len(parts); pass
+        it explicitly for summarized rolls that don't carry their dice.
+        """
+        if self._closed:
+            raise RuntimeError("Roll log is closed.")
+        self._queue.put(
+            (
+                time.time_ns(),
+                id_hash(game_id),
+                id_hash(player_id),
+                id_hash(expression),
+                total,
+                len(parts) if n_parts is None else n_parts,
+                list(parts[:MAX_PARTS]),
+            )
+        )
+
+    def _run(self) -> None:
+        done = False
+        while not done:
+            batch = [self._queue.get()]
+            while len(batch) < WRITE_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                done = True
+                batch = [r for r in batch if r is not None]
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: list[tuple]) -> None:
+        # Anything escaping here would kill the writer thread and silently
+        # drop every later record, so a bad batch is logged and skipped.
+        try:
+            arr = np.zeros(len(batch), dtype=RECORD_DTYPE)
+            columns = list(zip(*batch, strict=True))
+            for name, column in zip(RECORD_DTYPE.names[:-1], columns[:-1], strict=True):
+                arr[name] = column
+            parts = arr["parts"]
+            for i, row in enumerate(columns[-1]):
+                parts[i, : len(row)] = row
+            self._file.write(arr.tobytes())
+            self._file.flush()
+        except Exception as e:
+            logger.error(f"Roll log write failed ({len(batch)} records lost): {e!r}")
+
+    def close(self) -> None:
+        """Flush queued records and close the file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+
+
+class RollLogReader:
+    """
+    Memory-mapped, read-only view of a roll log.
+
+    `records` is a structured NumPy array over the file; a trailing
+    partial record (e.g. from a crash mid-write) is ignored.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            _check_header(path, f.read(HEADER_SIZE))
+        count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        if count:
+            self.records = np.memmap(
+                path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,)
+            )
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def filter(
+        self,
+        *,
+        game: str | None = None,
+        player: str | None = None,
+        expression: str | None = None,
+        since_ns: int | None = None,
+        until_ns: int | None = None,
+    ) -> np.ndarray:
+        """Records matching every given criterion (IDs/expressions by hash)."""
+        recs = self.records
+        mask = np.ones(len(recs), dtype=bool)
+        for field, value in (("game", game), ("player", player), ("expr", expression)):
+            if value is not None:
+                mask &= recs[field] == np.uint64(id_hash(value))
+        if since_ns is not None:
+            mask &= recs["ts_ns"] >= since_ns
+        if until_ns is not None:
+            mask &= recs["ts_ns"] < until_ns
+        return recs[mask]
+
+    @staticmethod
+    def parts(record: np.void) -> list[int]:
+        """Stored dice of a record (at most MAX_PARTS)."""
+        return record["parts"][: min(int(record["n_parts"]), MAX_PARTS)].tolist()
+
+
+__all__ = [
+    "MAX_PARTS",
+    "RECORD_DTYPE",
+    "RollAuditLog",
+    "RollLogReader",
+    "id_hash",
+]
@@ -0,0 +1,413 @@
+"""
+Multi-process serving: one dispatcher in front of N GameServer workers.
+
+`dicerealms server --workers N` runs a Dispatcher on the public port and
+N worker processes, each a GameServer on a free loopback port. A game must
+live in exactly one process, and SO_REUSEPORT would spread a game's players
+over workers before their connect message says which game they want. So
+the dispatcher reads that first message, routes the game to one worker
+(the least loaded one, if the game is new) and then relays frames both
+ways; client frames are only decoded to stop a connection switching
+games. Every connection to a game reaches the same worker until the
+game's last connection closes.
+
+Workers report their load every report_interval seconds. A worker that
+exits, or stops reporting for health_timeout once it is listening, is
+killed and restarted; the games it hosted are lost and their connections
+closed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+import os
+import queue
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import websockets
+from loguru import logger
+from websockets import ServerConnection
+
+from dicerealms.protocol.messages import ErrorMessage
+from dicerealms.server.game_instance import DEFAULT_GAME
+from dicerealms.server.server import GameServer
+
+REPORT_INTERVAL = 2.0
+HEALTH_TIMEOUT = 15.0
+CONNECT_TIMEOUT = 30.0
+LOG_INTERVAL = 60.0
+# How long a killed or terminated worker gets to exit before it is left behind.
+EXIT_TIMEOUT = 5.0
+
+
+@dataclass(slots=True)
+class WorkerLoad:
+    """One worker as the dispatcher sees it.
+
+    Attributes:
+        index: Worker number
+        pid: Process ID of the current run
+        port: Loopback port it listens on (None until ready)
+        healthy: Alive, listening and reporting on time
+        restarts: Times it has been restarted
+        relayed: Client connections relayed to it right now
+        games: Games routed to it
+        report: Its last load report (see GameServer.load)
+        report_age: Seconds since that report (None if there is none yet)
+    """
+
+    index: int
+    pid: int | None
+    port: int | None
+    healthy: bool
+    restarts: int
+    relayed: int
+    games: int
+    report: dict[str, int] = field(default_factory=dict)
+    report_age: float | None = None
+
+
+def _connect_message(frame: str | bytes) -> dict[str, Any] | None:
+    """The frame as a message if it is a connect message, else None."""
+    try:
+        message = json.loads(frame)
+    except ValueError:
+        return None
+    if isinstance(message, dict) and message.get("type") == "connect":
+        return message
+    return None
+
+
+def _game_of(message: dict[str, Any] | None) -> str:
+    game_id = message.get("game_id") if message is not None else None
+    return game_id if isinstance(game_id, str) and game_id else DEFAULT_GAME
+
+
+def requested_game(frame: str | bytes) -> str:
+    """The game a client's connect message asks for, else the default game."""
+    return _game_of(_connect_message(frame))
+
+
+async def _wait_exited(processes: list[Any], timeout: float) -> None:
+    """Wait for processes to exit without blocking the event loop, then reap them."""
+    deadline = time.monotonic() + timeout
+    while any(p.is_alive() for p in processes) and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    for p in processes:
+        p.join(timeout=0)
+
+
+# --- Worker processes ---
+def run_worker(index: int, server_kwargs: dict[str, Any], reports: Any, interval: float) -> None:
+    """Body of a worker process: a GameServer on a free loopback port."""
+    try:
+        asyncio.run(_serve_worker(index, server_kwargs, reports, interval))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _serve_worker(
+    index: int, server_kwargs: dict[str, Any], reports: Any, interval: float
+) -> None:
+    server = GameServer(host="127.0.0.1", port=0, **server_kwargs)
+    pid = os.getpid()
+    serving = asyncio.create_task(
+        server.run(started=lambda port: reports.put(("ready", index, pid, port)))
+    )
+    while True:
+        done, _ = await asyncio.wait({serving}, timeout=interval)
+        if done:
+            serving.result()
+            return
+        reports.put(("load", index, pid, server.load()))
+
+
+class _Worker:
+    __slots__ = ("index", "process", "port", "last_report", "report", "restarts", "relayed")
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.process: Any = None
+        self.port: int | None = None
+        self.last_report = 0.0
+        self.report: dict[str, int] = {}
+        self.restarts = 0
+        self.relayed = 0
+
+
+class _Route:
+    __slots__ = ("worker", "relays")
+
+    def __init__(self, worker: _Worker) -> None:
+        self.worker = worker
+        self.relays = 0
+
+
+class Dispatcher:
+    """
+    Public endpoint that pins each game to one worker process.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 8765,
+        workers: int = 2,
+        server_kwargs: dict[str, Any] | None = None,
+        report_interval: float = REPORT_INTERVAL,
+        health_timeout: float = HEALTH_TIMEOUT,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        log_interval: float = LOG_INTERVAL,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.host = host
+        self.port = port
+        # GameServer arguments; worker i gets seed + i and its own audit log file.
+        self.server_kwargs = server_kwargs or {}
+        self.report_interval = report_interval
+        self.health_timeout = health_timeout
+        self.connect_timeout = connect_timeout
+        self.log_interval = log_interval
+        self._ctx = multiprocessing.get_context("spawn")
+        self._reports = self._ctx.Queue()
+        self._workers = [_Worker(i) for i in range(workers)]
+        self._routes: dict[str, _Route] = {}
+
+    # --- Workers ---
+    def _worker_kwargs(self, index: int) -> dict[str, Any]:
+        kwargs = dict(self.server_kwargs)
+        if kwargs.get("seed") is not None:
+            kwargs["seed"] += index
+        if kwargs.get("audit_log_path"):
+            kwargs["audit_log_path"] = f"{kwargs['audit_log_path']}.{index}"
+        return kwargs
+
+    def _start(self, worker: _Worker) -> None:
+        worker.port = None
+        worker.report = {}
+        worker.last_report = time.monotonic()
+        worker.process = self._ctx.Process(
+            target=run_worker,
+            args=(worker.index, self._worker_kwargs(worker.index), self._reports, self.report_interval),
+            name=f"dicerealms-worker-{worker.index}",
+            daemon=True,
+        )
+        worker.process.start()
+
+    async def _restart(self, worker: _Worker) -> None:
+        if worker.process.is_alive():
+            worker.process.kill()
+        # Its games are gone; their open relays end as the sockets drop.
+        for game_id, route in list(self._routes.items()):
+            if route.worker is worker:
+                del self._routes[game_id]
+        await _wait_exited([worker.process], EXIT_TIMEOUT)
+        worker.restarts += 1
+        self._start(worker)
+
+    def _healthy(self, worker: _Worker, now: float) -> bool:
+        return (
+            worker.process is not None
+            and worker.process.is_alive()
+            and worker.port is not None
+            and now - worker.last_report <= self.health_timeout
+        )
+
+    def _drain_reports(self) -> None:
+        while True:
+            try:
+                kind, index, pid, data = self._reports.get_nowait()
+            except queue.Empty:
+                return
+            worker = self._workers[index]
+            if worker.process is None or worker.process.pid != pid:
+                continue  # from a run that has since been replaced
+            worker.last_report = time.monotonic()
+            if kind == "ready":
+                worker.port = data
+                logger.info(f"Worker {index} (pid {pid}) listening on port {data}")
+            else:
+                worker.report = data
+
+    async def check_workers(self) -> None:
+        """Take in load reports and restart workers that died or went quiet."""
+        self._drain_reports()
+        now = time.monotonic()
+        for worker in self._workers:
+            if not worker.process.is_alive():
+                logger.error(f"Worker {worker.index} exited ({worker.process.exitcode}); restarting")
+                await self._restart(worker)
+            elif worker.port is not None and now - worker.last_report > self.health_timeout:
+                # Only once listening: loading a large world may take a while.
+                logger.error(f"Worker {worker.index} stopped reporting; restarting")
+                await self._restart(worker)
+
+    async def _monitor(self) -> None:
+        last_log = time.monotonic()
+        while True:
+            await asyncio.sleep(self.report_interval / 2)
+            await self.check_workers()
+            if time.monotonic() - last_log >= self.log_interval:
+                last_log = time.monotonic()
+                for w in self.load():
+                    status = "healthy" if w.healthy else "unhealthy"
+                    zones = (
+                        f", {w.report['resident_zones']} zones resident "
+                        f"(max load {w.report.get('max_zone_load_ms', 0)} ms)"
+                        if "resident_zones" in w.report
+                        else ""
+                    )
+                    logger.info(
+                        f"Worker {w.index} (pid {w.pid}): {status}, {w.relayed} connections, "
+                        f"{w.games} games, {w.report.get('players', 0)} players, "
+                        f"{w.report.get('queued', 0)} queued, {w.restarts} restarts{zones}"
+                    )
+
+    def load(self) -> list[WorkerLoad]:
+        """Per-worker health and load."""
+        now = time.monotonic()
+        games = [0] * len(self._workers)
+        for route in self._routes.values():
+            games[route.worker.index] += 1
+        return [
+            WorkerLoad(
+                index=w.index,
+                pid=w.process.pid if w.process is not None else None,
+                port=w.port,
+                healthy=self._healthy(w, now),
+                restarts=w.restarts,
+                relayed=w.relayed,
+                games=games[w.index],
+                report=dict(w.report),
+                report_age=now - w.last_report if w.report else None,
+            )
+            for w in self._workers
+        ]
+
+    # --- Routing ---
+    def route(self, game_id: str) -> _Route | None:
+        """
+        The route pinning game_id to its worker; a new game goes to the
+        healthy worker relaying the fewest connections. None if no worker is up.
+        """
+        route = self._routes.get(game_id)
+        if route is not None:
+            return route
+        now = time.monotonic()
+        ready = [w for w in self._workers if self._healthy(w, now)]
+        if not ready:
+            return None
+        route = self._routes[game_id] = _Route(min(ready, key=lambda w: w.relayed))
+        return route
+
+    async def handle_client(self, websocket: ServerConnection) -> None:
+        """
+        Route a client by its first message, then relay it to its worker.
+        """
+        try:
+            first = await asyncio.wait_for(websocket.recv(), self.connect_timeout)
+        except TimeoutError:
+            await websocket.close(code=1008, reason="Send 'connect' first")
+            return
+        except websockets.exceptions.ConnectionClosed:
+            return
+
+        game_id = requested_game(first)
+        route = self.route(game_id)
+        if route is None:
+            await websocket.close(code=1013, reason="No workers available")
+            return
+        worker = route.worker
+        route.relays += 1
+        worker.relayed += 1
+        code, reason = 1000, ""
+        try:
+            async with websockets.connect(f"ws://127.0.0.1:{worker.port}") as upstream:
+                await upstream.send(first)
+                await self._relay(websocket, upstream, game_id)
+                if upstream.close_code is not None:
+                    # Pass on why the worker hung up; 1005/1006 can't be sent.
+                    code, reason = upstream.close_code, upstream.close_reason or ""
+                    if code in (1005, 1006):
+                        code, reason = 1011, "Worker went away"
+        except (OSError, websockets.exceptions.WebSocketException) as e:
+            logger.warning(f"Relay to worker {worker.index} failed: {e}")
+            code, reason = 1011, "Worker unavailable"
+        finally:
+            route.relays -= 1
+            worker.relayed -= 1
+            if not route.relays and self._routes.get(game_id) is route:
+                del self._routes[game_id]
+            await websocket.close(code=code, reason=reason)
+
+    async def _relay(self, client: ServerConnection, upstream: Any, game_id: str) -> None:
+        async def down() -> None:
+            async for frame in upstream:
+                await client.send(frame)
+
+        async def up() -> None:
+            async for frame in client:
+                # A connection stays on its game's worker, so it can't switch games.
+                message = _connect_message(frame)
+                if message is not None and _game_of(message) != game_id:
+                    err: ErrorMessage = {
+                        "type": "error",
+                        "message": "Reconnect to join another game.",
+                    }
+                    await client.send(json.dumps(err))
+                    continue
+                await upstream.send(frame)
+
+        tasks = [asyncio.create_task(down()), asyncio.create_task(up())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # --- Lifecycle ---
+    def start_workers(self) -> None:
+        for worker in self._workers:
+            self._start(worker)
+
+    async def stop_workers(self) -> None:
+        processes = [w.process for w in self._workers if w.process is not None]
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        await _wait_exited(processes, EXIT_TIMEOUT)
+
+    async def run(self, started: Callable[[int], None] | None = None) -> None:
+        """
+        Start the workers and the public Websocket endpoint. `started` is
+        called with the bound port once it is listening.
+        """
+        logger.info(
+            f"Starting DiceRealms dispatcher on {self.host}:{self.port} "
+            f"with {len(self._workers)} workers"
+        )
+        self.start_workers()
+        monitor = asyncio.create_task(self._monitor())
+        try:
+            async with websockets.serve(self.handle_client, self.host, self.port) as ws_server:
+                if started:
+                    started(ws_server.sockets[0].getsockname()[1])
+                await asyncio.Future() # Run forever
+        finally:
+            monitor.cancel()
+            await self.stop_workers()
+
+
+__all__ = [
+    "Dispatcher",
+    "WorkerLoad",
+    "requested_game",
+    "run_worker",
+]
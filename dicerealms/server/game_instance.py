@@ -0,0 +1,80 @@
+"""
+Game instances (tables) hosted by one server.
+
+Each instance is an independent party: its own members, turn queue,
+game state and action processor. Instances share the server's dice
+streams, audit log and (read-only) world, so hundreds of small tables
+cost little more than their players.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+
+from dicerealms.core import ROLL_SUMMARY_THRESHOLD, RngStreams
+from dicerealms.server.action_processor import ActionProcessor
+from dicerealms.server.audit_log import RollAuditLog
+from dicerealms.server.game_state import GameState
+from dicerealms.server.turn_manager import TurnManager
+from dicerealms.world import World
+
+DEFAULT_GAME = "default"
+MAX_GAME_ID_LENGTH = 64
+
+
+class GameInstance:
+    """
+    One table: the players that joined it and the game they are playing.
+    """
+
+    def __init__(
+        self,
+        game_id: str,
+        broadcast_callback: Callable[[dict], Awaitable[None]],
+        world: World | None = None,
+        rng: RngStreams | None = None,
+        roll_summary_threshold: int = ROLL_SUMMARY_THRESHOLD,
+        audit_log: RollAuditLog | None = None,
+    ):
+        self.game_id = game_id
+        # Player IDs that joined, in join order (dict as an ordered set)
+        self.members: dict[str, None] = {}
+        self.turn_manager = TurnManager()
+        self.game_state = GameState(world)
+        self.action_processor = ActionProcessor(
+            game_state = self.game_state,
+            turn_manager = self.turn_manager,
+            broadcast_callback = broadcast_callback,
+            rng = rng,
+            roll_summary_threshold = roll_summary_threshold,
+            audit_log = audit_log,
+            game_id = game_id,
+        )
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self.members
+
+    def join(self, player_id: str, player_name: str) -> None:
+        self.members[player_id] = None
+        self.turn_manager.add_player(player_id)
+        self.game_state.add_player(player_id, player_name)
+
+    def leave(self, player_id: str) -> None:
+        self.members.pop(player_id, None)
+        self.turn_manager.remove_player(player_id)
+        if self.game_state.get_player(player_id):
+            self.game_state.remove_player(player_id)
+
+
+def valid_game_id(game_id: object) -> bool:
+    return isinstance(game_id, str) and 0 < len(game_id) <= MAX_GAME_ID_LENGTH
+
+
+__all__ = [
+    "DEFAULT_GAME",
+    "GameInstance",
+    "valid_game_id",
+]
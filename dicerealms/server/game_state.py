@@ -2,10 +2,12 @@
 Manages shared game state for DiceRealms.
 """
 
+from collections.abc import Iterator
 from dataclasses import dataclass
 
 from loguru import logger
 
+from dicerealms.name_index import NameIndex
 from dicerealms.world import World, load_default_world
 
 
@@ -28,17 +30,29 @@ class GameState:
     Manages shared game state for DiceRealms.
     """
 
-    def __init__(self):
+    def __init__(self, world: World | None = None):
         self.players: dict[str, PlayerState] = {}
-        self.world: World = load_default_world()
+        self.world: World = world if world is not None else load_default_world()
+        # Room ID -> IDs of the players in it (dict as an insertion-ordered set)
+        self._occupancy: dict[str, dict[str, None]] = {}
+        self.names = NameIndex()
 
     def add_player(self, player_id: str, name: str) -> PlayerState:
         """
-        Add a new player to the game.
+        Add a new player to the game, in the world's start room. A player
+        already in the game keeps their state and is renamed to name.
         """
+        existing = self.players.get(player_id)
+        if existing is not None:
+            if existing.name != name:
+                self.rename_player(player_id, name)
+            return existing
 
-        player = PlayerState(player_id=player_id, name=name)
+        player = PlayerState(player_id=player_id, name=name, room=self.world.start_room)
         self.players[player_id] = player
+        self.names.add(player_id, name)
+        self._enter(player_id, player.room)
+        self.world.occupy(player.room)
         logger.info(f"[{player_id}] Player {name} joined the game.")
         return player
 
@@ -48,6 +62,9 @@ class GameState:
         """
         if player_id in self.players:
             name = self.players[player_id].name
+            self.names.remove(player_id, name)
+            self._leave(player_id, self.players[player_id].room)
+            self.world.vacate(self.players[player_id].room)
             del self.players[player_id]
             logger.info(f"[{player_id}] Removed player {name} from the game.")
 
@@ -58,11 +75,71 @@ class GameState:
 
         return self.players.get(player_id)
 
+    def find_player(self, name: str) -> PlayerState | None:
+        """
+        Get a player by name, ignoring case. The earliest joiner wins a tie.
+        """
+        player_id = self.names.first(name)
+        return self.players[player_id] if player_id is not None else None
+
+    def players_with_prefix(self, prefix: str, limit: int | None = None) -> list[PlayerState]:
+        """
+        Get players whose name starts with prefix (ignoring case), sorted by name.
+        """
+        return [self.players[pid] for pid in self.names.prefix(prefix, limit)]
+
+    def complete_name(self, prefix: str, limit: int = 10) -> list[str]:
+        """
+        Player names that complete prefix, for autocompletion.
+        """
+        return [p.name for p in self.players_with_prefix(prefix, limit)]
+
+    def rename_player(self, player_id: str, new_name: str) -> bool:
+        """
+        Change a player's display name. Returns False if the player is unknown.
+        """
+        player = self.players.get(player_id)
+        if player is None:
+            return False
+        self.names.rename(player_id, player.name, new_name)
+        logger.info(f"[{player_id}] Player {player.name} is now {new_name}.")
+        player.name = new_name
+        return True
+
     def get_players_in_room(self, room_name: str) -> list[PlayerState]:
         """
         Get all players in a specific room.
         """
-        return [p for p in self.players.values() if p.room == room_name]
+        return list(self.iter_players_in_room(room_name))
+
+    def iter_players_in_room(self, room_id: str) -> Iterator[PlayerState]:
+        """
+        Iterate over the players in a room, in the order they entered it.
+        """
+        players = self.players
+        return (players[pid] for pid in self._occupancy.get(room_id, ()))
+
+    def room_population(self, room_id: str) -> int:
+        """
+        Number of players in a room.
+        """
+        return len(self._occupancy.get(room_id, ()))
+
+    def occupied_rooms(self) -> Iterator[str]:
+        """
+        Iterate over the IDs of rooms with at least one player.
+        """
+        return iter(self._occupancy)
+
+    def _enter(self, player_id: str, room_id: str) -> None:
+        self._occupancy.setdefault(room_id, {})[player_id] = None
+
+    def _leave(self, player_id: str, room_id: str) -> None:
+        occupants = self._occupancy.get(room_id)
+        if occupants is not None:
+            occupants.pop(player_id, None)
+            if not occupants:
+                del self._occupancy[room_id]
 
     def move_player(self, player_id: str, direction: str) -> tuple[bool, str]:
         """
@@ -74,6 +151,10 @@ class GameState:
 
         new_room_id, message = self.world.move(player.room, direction)
         if new_room_id:
+            self.world.occupy(new_room_id)
+            self.world.vacate(player.room)
+            self._leave(player_id, player.room)
+            self._enter(player_id, new_room_id)
             player.room = new_room_id
             return True, message
         
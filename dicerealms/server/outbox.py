@@ -0,0 +1,164 @@
+"""
+Bounded outbound queues, one per connected client.
+
+Each Outbox holds encoded frames for one client and a writer task that
+sends them in order, so a stalled socket only ever blocks its own writer.
+When a queue is full, the overflow policy of the incoming message's type
+decides what happens:
+- "coalesce": state snapshots (turn_changed). A queued, unsent message of
+  the same type is dropped for the new one, full or not; the client only
+  ever needs the latest. The new one goes to the back, so it still follows
+  the frames that led up to it.
+- "drop_oldest": chatter (chat). The oldest queued droppable message makes
+  room; if nothing is droppable, the new message is dropped instead.
+- "disconnect": everything else. A client this far behind is cut off.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Literal
+
+from websockets import ServerConnection
+
+OverflowPolicy = Literal["coalesce", "drop_oldest", "disconnect"]
+
+QUEUE_LIMIT = 256
+DEFAULT_POLICY: OverflowPolicy = "disconnect"
+DEFAULT_POLICIES: dict[str, OverflowPolicy] = {
+    "turn_changed": "coalesce",
+    "chat": "drop_oldest",
+}
+
+
+@dataclass(slots=True)
+class OutboxStats:
+    """Counters for one client's outbound queue.
+
+    Attributes:
+        depth: Frames waiting to be sent
+        max_depth: Deepest the queue has been
+        sent: Frames written to the socket
+        coalesced: Frames replaced by a newer one of the same type
+        dropped: Frames discarded to make room
+    """
+
+    depth: int = 0
+    max_depth: int = 0
+    sent: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+
+
+class Outbox:
+    """
+    Outbound frames for one client, drained by its own writer task.
+    """
+
+    def __init__(
+        self,
+        player_id: str,
+        websocket: ServerConnection,
+        send: Callable[[str], Awaitable[bool]],
+        on_dead: Callable[[str], None],
+        *,
+        limit: int = QUEUE_LIMIT,
+        policies: dict[str, OverflowPolicy] | None = None,
+    ):
+        self.player_id = player_id
+        self.websocket = websocket
+        self.limit = limit
+        self.policies = DEFAULT_POLICIES if policies is None else policies
+        self._send = send
+        self._on_dead = on_dead
+        # (message type, frame); _latest holds the queued entry of each coalesce type.
+        self._queue: deque[tuple[str, str]] = deque()
+        self._latest: dict[str, tuple[str, str]] = {}
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._stats = OutboxStats()
+        self._task = asyncio.create_task(self._run())
+
+    def policy(self, msg_type: str) -> OverflowPolicy:
+        return self.policies.get(msg_type, DEFAULT_POLICY)
+
+    def put(self, msg_type: str, frame: str) -> bool:
+        """
+        Queue a frame. Returns False if it overflowed a "disconnect" (or
+        uncoalescable "coalesce") type, meaning the client should be dropped.
+        """
+        policy = self.policy(msg_type)
+        stats = self._stats
+        if policy == "coalesce" and msg_type in self._latest:
+            self._queue.remove(self._latest.pop(msg_type))
+            stats.coalesced += 1
+
+        if len(self._queue) >= self.limit and not self._evict():
+            if policy != "drop_oldest":
+                return False
+            stats.dropped += 1
+            return True
+
+        entry = (msg_type, frame)
+        self._queue.append(entry)
+        if policy == "coalesce":
+            self._latest[msg_type] = entry
+        stats.max_depth = max(stats.max_depth, len(self._queue))
+        self._idle.clear()
+        self._ready.set()
+        return True
+
+    def _evict(self) -> bool:
+        """Drop the oldest droppable frame; False if there is none."""
+        for i, (msg_type, _) in enumerate(self._queue):
+            if self.policy(msg_type) == "drop_oldest":
+                del self._queue[i]
+                self._stats.dropped += 1
+                return True
+        return False
+
+    async def _run(self) -> None:
+        while True:
+            if not self._queue:
+                self._idle.set()
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            entry = self._queue.popleft()
+            msg_type, frame = entry
+            if self._latest.get(msg_type) is entry:
+                del self._latest[msg_type]
+            if not await self._send(frame):
+                self._on_dead(self.player_id)
+                return
+            self._stats.sent += 1
+
+    async def flush(self) -> None:
+        """Wait until every queued frame is sent (or the writer has stopped)."""
+        idle = asyncio.ensure_future(self._idle.wait())
+        await asyncio.wait((idle, self._task), return_when=asyncio.FIRST_COMPLETED)
+        idle.cancel()
+
+    def close(self) -> None:
+        """Stop the writer; unsent frames are discarded."""
+        if self._task is not asyncio.current_task():
+            self._task.cancel()
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> OutboxStats:
+        """Snapshot of this queue's counters."""
+        s = self._stats
+        return OutboxStats(
+            depth=len(self._queue),
+            max_depth=s.max_depth,
+            sent=s.sent,
+            coalesced=s.coalesced,
+            dropped=s.dropped,
+        )
@@ -6,24 +6,50 @@ from __future__ import annotations
 
 import asyncio
 import json
+import os
+from collections.abc import Callable, Coroutine
+from functools import partial
+from typing import Any
 
 import websockets
 from loguru import logger
 from websockets import ServerConnection
 
+from dicerealms.core import ROLL_SUMMARY_THRESHOLD, RngStreams
 from dicerealms.protocol.messages import (
     ChatBroadcastMessage,
     ConnectedMessage,
     ErrorMessage,
+    NameCompletionsMessage,
     PlayerJoinedMessage,
     PlayerLeftMessage,
+    PlayerRenamedMessage,
     ServerMessage,
-    TurnStatusMessage,
+    TurnChangedMessage,
     WelcomeMessage,
 )
 from dicerealms.server.action_processor import ActionProcessor
+from dicerealms.server.audit_log import RollAuditLog
+from dicerealms.server.game_instance import DEFAULT_GAME, GameInstance, valid_game_id
 from dicerealms.server.game_state import GameState
+from dicerealms.server.outbox import (
+    DEFAULT_POLICIES,
+    QUEUE_LIMIT,
+    Outbox,
+    OutboxStats,
+    OverflowPolicy,
+)
 from dicerealms.server.turn_manager import TurnManager
+from dicerealms.world import World, load_default_world
+from dicerealms.world_io import WorldIOProgress, load_world
+from dicerealms.zoned_world import ZoneDirectory, ZonedWorld
+
+# Seconds a single send may take before the client is dropped as too slow
+SEND_TIMEOUT = 5.0
+# Game instances one server hosts at most
+MAX_GAMES = 1000
+# Seconds between zone cache reports when serving a zoned world
+ZONE_LOG_INTERVAL = 60.0
 
 
 class GameServer:
@@ -31,23 +57,133 @@ class GameServer:
     Main game server for multiplayer DiceRealms.
     """
 
-    def __init__(self, host: str = "localhost", port: int = 8765):
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 8765,
+        seed: int | None = None,
+        roll_summary_threshold: int = ROLL_SUMMARY_THRESHOLD,
+        dice_pool_capacity: int | None = 1024,
+        audit_log_path: str | None = None,
+        world_path: str | None = None,
+        start_room: str | None = None,
+        max_zones: int | None = None,
+        send_timeout: float = SEND_TIMEOUT,
+        queue_limit: int = QUEUE_LIMIT,
+        overflow_policies: dict[str, OverflowPolicy] | None = None,
+        max_games: int = MAX_GAMES,
+    ):
         self.host  = host
         self.port = port
+        self.send_timeout = send_timeout
+        # Outbound frames are queued per client (see dicerealms.server.outbox).
+        self.queue_limit = queue_limit
+        self.overflow_policies = {**DEFAULT_POLICIES, **(overflow_policies or {})}
+        self._outboxes: dict[str, Outbox] = {}
+        # Each player's stream is a DicePool of pre-rolled faces (see RngStreams.pool_stats).
+        self.rng = RngStreams(seed, pool_capacity=dice_pool_capacity)
+        self.audit_log = RollAuditLog(audit_log_path) if audit_log_path else None
         self.connected_clients: dict[str, ServerConnection] = {}
         self.player_names: dict[str, str] = {}
         self._next_player_id = 1
+        # Closes of clients dropped as too slow, kept alive until done
+        self._closing: set[asyncio.Task] = set()
+        # Leave notices for the games of dropped clients
+        self._notices: set[asyncio.Task] = set()
+
+        # Game instances (tables), joined by ID at connect; every instance shares one world.
+        # A directory of zone files is served as a ZonedWorld, max_zones of them resident.
+        self.world = (
+            self._load_world(world_path, start_room, max_zones)
+            if world_path
+            else load_default_world()
+        )
+        self.roll_summary_threshold = roll_summary_threshold
+        self.max_games = max_games
+        self.games: dict[str, GameInstance] = {}
+        self.player_games: dict[str, str] = {}
+        self.default_game = self.create_game(DEFAULT_GAME)
+
+
+    # The default instance, for single-table use
+    @property
+    def turn_manager(self) -> TurnManager:
+        return self.default_game.turn_manager
+
+    @property
+    def game_state(self) -> GameState:
+        return self.default_game.game_state
 
-        # Initialize game systems
-        self.turn_manager = TurnManager()
-        self.game_state = GameState()
+    @property
+    def action_processor(self) -> ActionProcessor:
+        return self.default_game.action_processor
 
-        # Initialize action processor with broadcast callback
-        self.action_processor = ActionProcessor(
-            game_state = self.game_state,
-            turn_manager = self.turn_manager,
-            broadcast_callback = self.broadcast,
+
+    def create_game(self, game_id: str, world: World | None = None) -> GameInstance:
+        """
+        Start a new game instance; broadcasts from its actions reach only its members.
+        """
+        if game_id in self.games:
+            raise ValueError(f"Game already exists: {game_id}")
+        game = self.games[game_id] = GameInstance(
+            game_id,
+            partial(self._broadcast_game, game_id),
+            world=world or self.world,
+            rng=self.rng,
+            roll_summary_threshold=self.roll_summary_threshold,
+            audit_log=self.audit_log,
         )
+        logger.info(f"Game started: {game_id}")
+        return game
+
+
+    def game_of(self, player_id: str) -> GameInstance:
+        """
+        The instance a player joined (the default one if they haven't joined).
+        """
+        return self.games.get(self.player_games.get(player_id, DEFAULT_GAME), self.default_game)
+
+
+    def _leave_game(self, player_id: str) -> GameInstance | None:
+        """
+        Take a player out of their instance, ending it if it is now empty.
+        """
+        game_id = self.player_games.pop(player_id, None)
+        game = self.games.get(game_id) if game_id is not None else None
+        if game is None:
+            # Never joined; undo any direct use of the default instance.
+            self.default_game.leave(player_id)
+            return None
+        game.leave(player_id)
+        if not game.members and game is not self.default_game:
+            del self.games[game.game_id]
+            logger.info(f"Game ended: {game.game_id}")
+        return game
+
+
+    @staticmethod
+    def _load_world(path: str, start_room: str | None = None, max_zones: int | None = None) -> World:
+        """
+        Stream a world file in (see dicerealms.world_io), logging progress,
+        or open a zone directory (see dicerealms.zoned_world) lazily.
+        """
+        def report(p: WorldIOProgress) -> None:
+            pct = f" ({p.fraction:.0%})" if p.fraction is not None else ""
+            logger.info(f"Loading world: {p.rooms} rooms{pct}")
+
+        world: World
+        if os.path.isdir(path):
+            world = ZonedWorld(
+                ZoneDirectory.open(path), title=os.path.basename(os.path.normpath(path)), max_zones=max_zones
+            )
+        else:
+            world = load_world(path, progress=report)
+        if start_room is not None:
+            world.start_room = start_room
+        if not world.has_room(world.start_room):
+            raise ValueError(f"World {path} has no start room '{world.start_room}'")
+        logger.info(f"Loaded world '{world.title}' from {path}")
+        return world
 
 
     async def handle_client(self, websocket: ServerConnection, path: str | None = None):
@@ -58,7 +194,6 @@ class GameServer:
         self._next_player_id += 1
 
         self.connected_clients[player_id] = websocket
-        self.turn_manager.add_player(player_id)
         logger.info(f"Client connected: {player_id}")
 
         try:
@@ -76,26 +211,21 @@ class GameServer:
 
         except websockets.exceptions.ConnectionClosed:
             logger.info(f"Client disconnected: {player_id}")
-            self.turn_manager.remove_player(player_id)
 
         finally:
             # Clean-up
             if player_id in self.connected_clients:
                 del self.connected_clients[player_id]
+            self._close_outbox(player_id)
+            # Remove from their game's turn manager and game state
+            game = self._leave_game(player_id)
+            self.rng.forget(player_id)
             if player_id in self.player_names:
                 name = self.player_names[player_id]
                 del self.player_names[player_id]
-                
-                left: PlayerLeftMessage = {
-                    "type": "player_left", 
-                    "player": name
-                }
-                await self.broadcast(left)
 
-            # Remove from turn manager and game state
-            self.turn_manager.remove_player(player_id)
-            if self.game_state.get_player(player_id):
-                self.game_state.remove_player(player_id)
+                if game is not None:
+                    await self._announce_left(game, name)
 
 
     async def handle_message(self, player_id: str, raw_message: str):
@@ -112,6 +242,10 @@ class GameServer:
                 await self.handle_action(player_id, message)
             elif msg_type == "chat":
                 await self.handle_chat(player_id, message)
+            elif msg_type == "complete_name":
+                await self.handle_complete_name(player_id, message)
+            elif msg_type == "rename":
+                await self.handle_rename(player_id, message)
             else:
                 err: ErrorMessage = {
                     "type": "error", 
@@ -138,39 +272,58 @@ class GameServer:
 
     async def handle_connect(self, player_id: str, message: dict):
         """
-        Handle player connection/name setting.
+        Handle player connection/name setting, joining the game named by
+        game_id (the default game if omitted). Unknown games are started.
         """
         player_name = message.get("player_name")
+        game_id = message.get("game_id") or DEFAULT_GAME
+        error = None
         if not player_name:
+            error = "Player name is required."
+        elif not valid_game_id(game_id):
+            error = "Invalid game ID."
+        elif game_id not in self.games and len(self.games) >= self.max_games:
+            error = "The server is hosting too many games; try an existing one."
+        if error:
             err: ErrorMessage = {
                 "type": "error",
-                "message": "Player name is required."
+                "message": error
             }
             await self.send_to_client(player_id, err)
             return
 
+        # Switching games leaves the old one first, telling its players
+        if player_id in self.player_games:
+            old = self._leave_game(player_id)
+            if old is not None:
+                await self._announce_left(old, self.player_names.get(player_id, player_name))
+        game = self.games.get(game_id)
+        if game is None:
+            game = self.create_game(game_id)
         self.player_names[player_id] = player_name
+        self.player_games[player_id] = game_id
 
-        # Add player to game state
-        self.game_state.add_player(player_id, player_name)
+        # Add player to the game's turn queue and state
+        game.join(player_id, player_name)
 
-        # Broadcast player joined message to all clients
+        # Broadcast player joined message to the game's players
         joined: PlayerJoinedMessage = {
             "type": "player_joined",
             "player": player_name,
         }
-        await self.broadcast(joined)
+        await self.broadcast(joined, game_id)
 
         # Send confirmation message to player
         confirmed: ConnectedMessage = {
             "type": "connected",
             "player_name": player_name,
+            "game_id": game_id,
             "message": f"Welcome, {player_name}",
         }
         await self.send_to_client(player_id, confirmed)
 
         # Broadcast initial turn status
-        await self._broadcast_turn_status()
+        await self._broadcast_turn_status(game)
 
 
     async def handle_action(self, player_id: str, message: dict):
@@ -189,7 +342,8 @@ class GameServer:
             return
 
         # Process the action (includes turn validation, announcement, execution, result)
-        result = await self.action_processor.process_action(player_id, action, args)
+        game = self.game_of(player_id)
+        result = await game.action_processor.process_action(player_id, action, args)
 
         # if there was an error, send it to the player
         if not result.get("success"):
@@ -200,14 +354,15 @@ class GameServer:
             await self.send_to_client(player_id, err)
 
         # Broadcast turn status update after action completes
-        await self._broadcast_turn_status()
+        await self._broadcast_turn_status(game)
 
 
     async def handle_chat(self, player_id: str, message: dict):
         """
         Handle chat messages.
         """
-        player = self.game_state.get_player(player_id)
+        game = self.game_of(player_id)
+        player = game.game_state.get_player(player_id)
         if not player:
             player_name = self.player_names.get(player_id, "Unknown")
         else:
@@ -220,76 +375,277 @@ class GameServer:
             "message": chat_message,
         }
 
-        await self.broadcast(chat)
+        await self.broadcast(chat, game.game_id)
+
+
+    async def handle_complete_name(self, player_id: str, message: dict):
+        """
+        Reply with the names in the player's game that start with a prefix.
+        """
+        prefix = message.get("prefix", "")
+        if not isinstance(prefix, str):
+            err: ErrorMessage = {
+                "type": "error",
+                "message": "Prefix must be a string."
+            }
+            await self.send_to_client(player_id, err)
+            return
+
+        completions: NameCompletionsMessage = {
+            "type": "name_completions",
+            "prefix": prefix,
+            "names": self.game_of(player_id).game_state.complete_name(prefix),
+        }
+        await self.send_to_client(player_id, completions)
+
+
+    async def handle_rename(self, player_id: str, message: dict):
+        """
+        Change a joined player's display name and tell their game.
+        """
+        new_name = message.get("player_name")
+        error = None
+        if not new_name or not isinstance(new_name, str):
+            error = "Player name is required."
+        elif player_id not in self.player_games:
+            error = "Connect before renaming."
+        if error:
+            err: ErrorMessage = {
+                "type": "error",
+                "message": error
+            }
+            await self.send_to_client(player_id, err)
+            return
+
+        game = self.game_of(player_id)
+        old_name = self.player_names[player_id]
+        game.game_state.rename_player(player_id, new_name)
+        self.player_names[player_id] = new_name
+        renamed: PlayerRenamedMessage = {
+            "type": "player_renamed",
+            "old_name": old_name,
+            "player": new_name,
+        }
+        await self.broadcast(renamed, game.game_id)
+        # The turn frame carries the current player's name
+        await self._broadcast_turn_status(game)
+
+
+    async def _announce_left(self, game: GameInstance, player_name: str) -> None:
+        """
+        Tell a game's remaining players who left and whose turn it is now.
+        """
+        left: PlayerLeftMessage = {
+            "type": "player_left",
+            "player": player_name
+        }
+        await self.broadcast(left, game.game_id)
+        await self._broadcast_turn_status(game)
 
 
-    async def _broadcast_turn_status(self):
+    async def _broadcast_turn_status(self, game: GameInstance | None = None):
         """
-        Broadcast turn status to all players.
+        Broadcast a game's turn state to its players as one shared frame;
+        each client derives its own status from it (see turn_status_for).
         """
-        current_player_id = self.turn_manager.get_current_player()
+        if game is None:
+            game = self.default_game
+        turn = game.turn_manager.snapshot()
+        current_player_id = turn["current_player"]
         current_player_name = "None"
 
         if current_player_id:
-            player = self.game_state.get_player(current_player_id)
+            player = game.game_state.get_player(current_player_id)
             if player:
                 current_player_name = player.name
 
-        # Send turn status to all connected clients
-        for player_id, _ in self.game_state.players.items():
-            turn_status = self.turn_manager.get_turn_status(player_id)
-
-            turn: TurnStatusMessage = {
-                "type": "turn_status",
-                "current_player": current_player_name,
-                "current_player_id": current_player_id,
-                "is_your_turn": turn_status["is_your_turn"],
-                "waiting_for": current_player_name if not turn_status["is_your_turn"] else None,
-                "queue_position": turn_status["queue_position"],
-                "queue_size": turn_status["queue_size"]
-            }
-
-            await self.send_to_client(player_id, turn)
+        changed: TurnChangedMessage = {
+            "type": "turn_changed",
+            "current_player": current_player_name,
+            "current_player_id": current_player_id,
+            "turn_in_progress": turn["turn_in_progress"],
+            "queue": turn["queue"],
+        }
+        await self.broadcast(changed, game.game_id)
 
 
     async def send_to_client(self, player_id: str, message: ServerMessage) -> None:
         """
-        Send message to a specific client.
+        Queue a message for a specific client.
         """
-        if player_id in self.connected_clients:
-            try:
-                await self.connected_clients[player_id].send(json.dumps(message))
-            except websockets.exceptions.ConnectionClosed:
-                logger.warning(f"Failed to send to {player_id}: connection closed")
+        self._enqueue(player_id, message["type"], json.dumps(message))
 
 
-    async def broadcast(self, message: ServerMessage) -> None:
+    async def broadcast(self, message: ServerMessage, game_id: str | None = None) -> None:
         """
-        Broadcast message to all connected clients.
+        Broadcast message to the players of one game, or to every connected
+        client if game_id is None.
+
+        The message is encoded once and queued for everyone; each client's
+        writer task sends it, so a slow client delays nobody else.
         """
-        disconnected = []
-        for player_id, websocket in self.connected_clients.items():
-            try:
-                await websocket.send(json.dumps(message))
-            except websockets.exceptions.ConnectionClosed:
-                disconnected.append(player_id)
+        if game_id is None:
+            targets = list(self.connected_clients)
+        else:
+            game = self.games.get(game_id)
+            targets = list(game.members) if game is not None else []
+        frame = json.dumps(message)
+        for player_id in targets:
+            self._enqueue(player_id, message["type"], frame)
 
-        # Clean-up disconnected clients
-        for player_id in disconnected:
-            if player_id in self.connected_clients:
-                del self.connected_clients[player_id]
-            if player_id in self.player_names:
-                del self.player_names[player_id]
-            self.turn_manager.remove_player(player_id)
-            if self.game_state.get_player(player_id):
-                self.game_state.remove_player(player_id)
+
+    async def _broadcast_game(self, game_id: str, message: ServerMessage) -> None:
+        # Resolves self.broadcast on each call, so it can be swapped out later.
+        await self.broadcast(message, game_id)
+
+
+    def _enqueue(self, player_id: str, msg_type: str, frame: str) -> None:
+        outbox = self._outbox(player_id)
+        if outbox is not None and not outbox.put(msg_type, frame):
+            logger.warning(f"Dropping {player_id}: {outbox.depth} messages queued")
+            self._drop_client(player_id)
 
 
-    async def run(self):
+    def _outbox(self, player_id: str) -> Outbox | None:
         """
-        Start the Websocket Server.
+        The client's outbound queue, started on first use.
+        """
+        websocket = self.connected_clients.get(player_id)
+        if websocket is None:
+            return None
+        outbox = self._outboxes.get(player_id)
+        if outbox is None or outbox.websocket is not websocket:
+            if outbox is not None:
+                outbox.close()
+            outbox = self._outboxes[player_id] = Outbox(
+                player_id,
+                websocket,
+                partial(self._send_frame, player_id, websocket),
+                self._drop_client,
+                limit=self.queue_limit,
+                policies=self.overflow_policies,
+            )
+        return outbox
+
+
+    def _close_outbox(self, player_id: str) -> None:
+        outbox = self._outboxes.pop(player_id, None)
+        if outbox is not None:
+            outbox.close()
+
+
+    async def _send_frame(self, player_id: str, websocket: ServerConnection, frame: str) -> bool:
+        """
+        Send an encoded frame, giving up after send_timeout. Returns False if the
+        client is gone or too slow.
+        """
+        try:
+            await asyncio.wait_for(websocket.send(frame), self.send_timeout)
+            return True
+        except websockets.exceptions.ConnectionClosed:
+            return False
+        except TimeoutError:
+            logger.warning(f"Dropping {player_id}: send took over {self.send_timeout}s")
+            return False
+
+
+    def _drop_client(self, player_id: str) -> None:
+        """
+        Forget a client whose connection failed or fell behind, closing its
+        socket and telling its game in the background.
+        """
+        self._close_outbox(player_id)
+        websocket = self.connected_clients.pop(player_id, None)
+        if websocket is not None:
+            self._keep(self._closing, websocket.close(code=1008, reason="Too slow"))
+        name = self.player_names.pop(player_id, None)
+        game = self._leave_game(player_id)
+        if name is not None and game is not None:
+            self._keep(self._notices, self._announce_left(game, name))
+
+
+    @staticmethod
+    def _keep(tasks: set[asyncio.Task], coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coro)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+
+    async def flush(self) -> None:
+        """
+        Wait until every client's queued messages are sent (or it is dropped).
+        """
+        while self._notices:
+            await asyncio.gather(*self._notices)
+        await asyncio.gather(*(outbox.flush() for outbox in list(self._outboxes.values())))
+
+
+    def outbox_stats(self) -> dict[str, OutboxStats]:
+        """
+        Queue depth and counters per connected client.
+        """
+        return {player_id: outbox.stats() for player_id, outbox in self._outboxes.items()}
+
+
+    def load(self) -> dict[str, int]:
+        """
+        Current load, as reported by cluster workers (see dicerealms.server.cluster).
+        """
+        return {
+            "connections": len(self.connected_clients),
+            "games": len(self.games),
+            "players": len(self.player_games),
+            "queued": sum(outbox.depth for outbox in self._outboxes.values()),
+            **self._zone_load(),
+        }
+
+
+    def _zone_load(self) -> dict[str, int]:
+        if not isinstance(self.world, ZonedWorld):
+            return {}
+        stats = self.world.zone_stats()
+        return {
+            "resident_zones": stats.resident_zones,
+            "resident_rooms": stats.resident_rooms,
+            "zone_loads": stats.loads,
+            "max_zone_load_ms": round(stats.max_load_seconds * 1000),
+        }
+
+
+    async def _log_zones(self, world: ZonedWorld) -> None:
+        while True:
+            await asyncio.sleep(ZONE_LOG_INTERVAL)
+            s = world.zone_stats()
+            logger.info(
+                f"Zones: {s.resident_zones} resident ({s.resident_rooms} rooms, "
+                f"{s.occupied_zones} occupied), {s.loads} loads "
+                f"(mean {s.mean_load_seconds * 1000:.1f} ms, max {s.max_load_seconds * 1000:.1f} ms), "
+                f"{s.evictions} evictions"
+            )
+
+
+    async def run(self, started: Callable[[int], None] | None = None):
+        """
+        Start the Websocket Server. `started` is called with the bound port
+        once it is listening (port 0 picks a free one).
         """
         logger.info(f"Starting DiceRealms server on {self.host}:{self.port}")
-        async with websockets.serve(self.handle_client, self.host, self.port):
-            await asyncio.Future() # Run forever
+        logger.info(f"Dice master seed: {self.rng.seed} (pass --seed to replay)")
+        if self.audit_log:
+            logger.info(f"Auditing rolls to {self.audit_log.path}")
+        zones = (
+            asyncio.create_task(self._log_zones(self.world)) if isinstance(self.world, ZonedWorld) else None
+        )
+        try:
+            async with websockets.serve(self.handle_client, self.host, self.port) as ws_server:
+                if started:
+                    started(ws_server.sockets[0].getsockname()[1])
+                await asyncio.Future() # Run forever
+        finally:
+            if zones is not None:
+                zones.cancel()
+            for player_id in list(self._outboxes):
+                self._close_outbox(player_id)
+            if self.audit_log:
+                self.audit_log.close()
 
@@ -160,6 +160,22 @@ class TurnManager:
             "turn_in_progress": self.turn_in_progress
         }
 
+    def snapshot(self) -> dict:
+        """
+        Turn state shared by every player, for a single broadcast.
+        Returns dict with:
+            - current_player: str | None (player_id)
+            - turn_in_progress: bool
+            - queue: list[str] (player_ids in turn order)
+        Each player's queue_position is their index in queue, so no
+        per-player status needs to be built.
+        """
+        return {
+            "current_player": self.get_current_player(),
+            "turn_in_progress": self.turn_in_progress,
+            "queue": self.turn_queue.copy(),
+        }
+
     def get_turn_queue(self) -> list[str]:
         """
         Get the current turn queue (ordered list of player_ids)
@@ -0,0 +1,186 @@
+# SPDX-License-Identifier: MIT
+# dicerealms/simulate.py
+"""
+Monte Carlo simulation of dice expressions, sharded across processes.
+
+Trials are split into fixed-size shards. Each shard rolls from its own
+RngStreams path (seed, "simulate", expression index, shard index), so a run
+is reproducible for a given seed no matter how many workers execute it.
+Shard histograms are merged as they finish, letting callers report running
+percentiles long before a 10^8-trial sweep completes.
+"""
+
+from __future__ import annotations
+
+import math
+import multiprocessing
+import os
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from dicerealms.core import RngStreams, compile_dice
+
+SHARD_TRIALS = 1_000_000
+# Faces rolled per vectorized chunk inside a shard; bounds worker memory.
+CHUNK_FACES = 8_000_000
+
+
+@dataclass(slots=True)
+class Histogram:
+    """Counts of each total, starting at `min_total`.
+
+    Attributes:
+        min_total: Total represented by counts[0]
+        counts: int64 occurrences of each total
+    """
+
+    min_total: int = 0
+    counts: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+
+    @classmethod
+    def from_totals(cls, totals: np.ndarray) -> Histogram:
+        if not len(totals):
+            return cls()
+        lo = int(totals.min())
+        return cls(min_total=lo, counts=np.bincount(totals - lo).astype(np.int64))
+
+    @property
+    def trials(self) -> int:
+        return int(self.counts.sum())
+
+    @property
+    def max_total(self) -> int:
+        return self.min_total + len(self.counts) - 1
+
+    def merge(self, other: Histogram) -> Histogram:
+        """Return the combined histogram of self and other."""
+        if not len(other.counts):
+            return self
+        if not len(self.counts):
+            return other
+        lo = min(self.min_total, other.min_total)
+        hi = max(self.max_total, other.max_total)
+        counts = np.zeros(hi - lo + 1, dtype=np.int64)
+        for h in (self, other):
+            start = h.min_total - lo
+            counts[start : start + len(h.counts)] += h.counts
+        return Histogram(min_total=lo, counts=counts)
+
+    @property
+    def mean(self) -> float:
+        values = np.arange(self.min_total, self.max_total + 1)
+        return float(values @ self.counts) / self.trials
+
+    @property
+    def std(self) -> float:
+        values = np.arange(self.min_total, self.max_total + 1)
+        var = float(((values - self.mean) ** 2) @ self.counts) / self.trials
+        return math.sqrt(var)
+
+    def percentile(self, q: float) -> int:
+        """Smallest total whose cumulative share of trials reaches q percent."""
+        if not 0 <= q <= 100:
+            raise ValueError(f"Percentile must be within [0, 100]: {q}")
+        cum = np.cumsum(self.counts)
+        i = int(np.searchsorted(cum, q / 100.0 * cum[-1]))
+        return self.min_total + min(i, len(self.counts) - 1)
+
+    def to_dict(self) -> dict:
+        return {"min_total": self.min_total, "counts": self.counts.tolist()}
+
+
+@dataclass(slots=True)
+class SimulationProgress:
+    """Running state of one expression's simulation.
+
+    Attributes:
+        expression: The dice expression being simulated
+        histogram: Merged histogram of all finished shards
+        shards_done: Shards merged so far
+        shards_total: Shards scheduled for this expression
+    """
+
+    expression: str
+    histogram: Histogram
+    shards_done: int
+    shards_total: int
+
+    @property
+    def finished(self) -> bool:
+        return self.shards_done == self.shards_total
+
+
+def simulate_shard(expression: str, trials: int, seed: int, index: int, shard: int) -> Histogram:
+    """Roll `trials` totals for one shard. Runs inside a worker process."""
+    expr = compile_dice(expression)
+    rng = RngStreams(seed).stream("simulate", index, shard)
+    chunk = max(1, CHUNK_FACES // max(1, expr.num_dice))
+    hist = Histogram()
+    done = 0
+    while done < trials:
+        n = min(chunk, trials - done)
+        hist = hist.merge(Histogram.from_totals(expr.roll_batch(n, rng).totals))
+        done += n
+    return hist
+
+
+def simulate(
+    expressions: Sequence[str],
+    trials: int,
+    *,
+    workers: int | None = None,
+    seed: int | None = None,
+    shard_trials: int = SHARD_TRIALS,
+) -> Iterator[SimulationProgress]:
+    """
+    Simulate each expression `trials` times.
+
+    Yields a SimulationProgress each time a shard finishes, in completion
+    order. workers=1 runs in-process; otherwise a ProcessPoolExecutor with
+    `workers` processes (default: one per CPU) does the rolling.
+    """
+    if trials <= 0:
+        raise ValueError(f"Trials must be > 0: {trials}")
+    for expr in expressions:
+        compile_dice(expr)  # fail fast on bad input, before spawning workers
+
+    seed = RngStreams(seed).seed
+    shards = math.ceil(trials / shard_trials)
+    progress = [SimulationProgress(e, Histogram(), 0, shards) for e in expressions]
+
+    jobs = [
+        (expr, min(shard_trials, trials - s * shard_trials), seed, i, s)
+        for i, expr in enumerate(expressions)
+        for s in range(shards)
+    ]
+
+    def merge(index: int, shard: Histogram) -> SimulationProgress:
+        prev = progress[index]
+        progress[index] = SimulationProgress(
+            prev.expression, prev.histogram.merge(shard), prev.shards_done + 1, shards
+        )
+        return progress[index]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for job in jobs:
+            yield merge(job[3], simulate_shard(*job))
+        return
+
+    # 'spawn' keeps workers clear of threads (e.g. the dice-pool refiller) in this process.
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        futures = {pool.submit(simulate_shard, *job): job[3] for job in jobs}
+        for fut in as_completed(futures):
+            yield merge(futures[fut], fut.result())
+
+
+__all__ = [
+    "Histogram",
+    "SimulationProgress",
+    "simulate",
+    "simulate_shard",
+]
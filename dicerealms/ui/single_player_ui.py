@@ -10,6 +10,8 @@ class SinglePlayerUI:
             return self._render_move(result)
         elif t == "roll":
             return self._render_roll(result)
+        elif t == "odds":
+            return self._render_odds(result)
         elif t == "stats":
             return self._render_stats(result)
         elif t == "help":
@@ -26,6 +28,8 @@ class SinglePlayerUI:
 
 
     def _render_look(self, result: dict) -> str:
+        if "markup" in result:
+            return result["markup"]
         exits = ", ".join(result.get("exits", []))
         return (
             f"[bold cyan]{result['room']}[/bold cyan]\n"
@@ -35,6 +39,8 @@ class SinglePlayerUI:
     
 
     def _render_move(self, result: dict) -> str:
+        if "markup" in result:
+            return f"[green]{result['message']}[/green]\n\n{result['markup']}"
         exits = ", ".join(result.get("exits", []))
         return (
             f"[green]{result['message']}[/green]\n\n"
@@ -45,6 +51,13 @@ class SinglePlayerUI:
     
 
     def _render_roll(self, result: dict) -> str:
+        if "summary" in result:
+            s = result["summary"]
+            return (
+                f"[dim]{result['expression']}[/dim] → "
+                f"[bold yellow]{result['total']}[/bold yellow]  "
+                f"[dim]{s['dice']} dice, min {s['min']}, max {s['max']}[/dim]"
+            )
         return (
             f"[dim]{result['expression']}[/dim] → "
             f"[bold yellow]{result['total']}[/bold yellow]  "
@@ -52,6 +65,15 @@ class SinglePlayerUI:
         )
     
 
+    def _render_odds(self, result: dict) -> str:
+        return (
+            f"[dim]{result['expression']}[/dim] → "
+            f"mean [bold yellow]{result['mean']:.2f}[/bold yellow] "
+            f"[dim](sd {result['std']:.2f}, range {result['min']}-{result['max']})[/dim]\n"
+            f"10% / 50% / 90%: {result['p10']} / {result['median']} / {result['p90']}"
+        )
+
+
     def _render_stats(self, result: dict) -> str:
         return (
             f"[bold]{result['name']}[/bold]\n"
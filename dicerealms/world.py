@@ -12,18 +12,32 @@ Design goals (M2):
 Future-ready (not required for M2):
 - Weighted edges (costs), locks/keys, visibility rules
 - Zones/realms, procedural generation hooks
-- Pathfinding helpers (basic BFS now; A* later if needed)
+- Pathfinding helpers (bidirectional BFS + path cache; landmark A* via build_landmarks)
 """
 
 from __future__ import annotations
 
-from collections import deque
-from collections.abc import Iterable
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Sequence
 from dataclasses import dataclass, field
+from itertools import chain
+from operator import attrgetter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from dicerealms.components import ComponentIndex
+    from dicerealms.pathfinding import LandmarkIndex
 
 # canonical lowercase strings: "north", "east", "south", "west", "up", "down"
 Direction = str
 
+# Default number of (start, goal) pairs remembered by World.find_path
+PATH_CACHE_SIZE = 1024
+# Where new players appear unless a world names another start room
+START_ROOM = "town_square"
+# Rooms a search over on-demand rooms (see _forward_bfs) may discover before giving up
+SEARCH_LIMIT = 1_000_000
+
 # Opposite direction mapping for convenience when creating bidirectional exits
 OPPOSITE: dict[Direction, Direction] = {
     "north": "south",
@@ -50,6 +64,52 @@ class Exit:
     locked: bool = False
 
 
+@dataclass(slots=True, frozen=True)
+class RoomRender:
+    """Look output for one version of a room, built once and reused.
+
+    Attributes:
+        version: Room.version this was built from
+        name: Room display name
+        description: Room description
+        exits: Open exit directions, sorted
+        all_exits: Every exit direction, locked ones included, in room order
+        plain: Plain-text look block (World.look)
+        text: Plain-text look block of the single-player front ends
+        markup: Rich markup look block
+    """
+
+    version: int
+    name: str
+    description: str
+    exits: tuple[Direction, ...]
+    all_exits: tuple[Direction, ...]
+    plain: str
+    text: str
+    markup: str
+
+    @classmethod
+    def of(cls, room: Room) -> RoomRender:
+        exits = tuple(sorted(room.neighbor()))
+        pretty = ", ".join(exits)
+        lines = [room.name, "", room.description.strip(), ""]
+        lines.append(f"Exits: {pretty}" if exits else "No obvious exits.")
+        return cls(
+            version=room.version,
+            name=room.name,
+            description=room.description,
+            exits=exits,
+            all_exits=tuple(room.exits),
+            plain="\n".join(lines).strip(),
+            text=f"{room.name}\n\n{room.description}\n\nExits: {pretty}",
+            markup=(
+                f"[bold cyan]{room.name}[/bold cyan]\n"
+                f"{room.description}\n\n"
+                f"[dim]Exits: {pretty}[/dim]"
+            ),
+        )
+
+
 @dataclass(slots=True)
 class Room:
     """Node in the world graph.
@@ -59,12 +119,16 @@ class Room:
         name: Display name
         description: Long-form description
         exits: mapping direction -> Exit
+        version: Bumped on every change to name, description or exits;
+            add_exit and World methods bump it, direct edits must call touch()
     """
 
     id: str
     name: str
     description: str = ""
     exits: dict[Direction, Exit] = field(default_factory=dict)
+    version: int = field(default=0, compare=False, repr=False)
+    _render: RoomRender | None = field(default=None, init=False, compare=False, repr=False)
 
     def add_exit(
         self,
@@ -76,10 +140,186 @@ class Room:
     ) -> None:
         d = direction.lower()
         self.exits[d] = Exit(to_room=to_room, description=description, locked=locked)
+        self.version += 1
+
+    def touch(self) -> None:
+        """Mark the room changed after editing its fields directly."""
+        self.version += 1
 
     def neighbor(self) -> dict[Direction, str]:
         return {d: ex.to_room for d, ex in self.exits.items() if not ex.locked}
 
+    def render(self) -> RoomRender:
+        """Cached look output; rebuilt only when `version` has moved on."""
+        cached = self._render
+        if cached is None or cached.version != self.version:
+            cached = self._render = RoomRender.of(self)
+        return cached
+
+    def to_dict(self) -> dict:
+        """Serialized form, as used in World.to_dict()["rooms"] and world files."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "exits": {
+                d: {
+                    "to": ex.to_room,
+                    "description": ex.description,
+                    "locked": ex.locked,
+                }
+                for d, ex in self.exits.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Room:
+        r = cls(
+            id=data["id"],
+            name=data.get("name", data["id"]),
+            description=data.get("description", ""),
+        )
+        for d, ex in data.get("exits", {}).items():
+            r.add_exit(
+                d,
+                to_room=ex["to"],
+                description=ex.get("description"),
+                locked=ex.get("locked", False),
+            )
+        return r
+
+
+@dataclass(slots=True)
+class PathCacheStats:
+    """Counters for World's find_path cache.
+
+    Attributes:
+        hits: Queries answered from the cache
+        misses: Queries that ran a search
+        evictions: Entries dropped to stay within the size bound
+        invalidations: Times the cache was cleared by a topology change
+        size: Entries currently cached
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass(slots=True)
+class FlatExits:
+    """A world's exits as flat columns, for whole-graph checks (see World._flat_exits).
+
+    Attributes:
+        ids: Room IDs, plus IDs only named by exits
+        exists: Whether ids[i] is an actual room
+        counts: Exits of ids[i]; exits are listed ID by ID in this order
+        dir_names: Direction names by code
+        dirs: Direction code of each exit
+        targets: Index into ids of each exit's target
+        locked: Whether each exit is locked
+    """
+
+    ids: list[str]
+    exists: Sequence[bool]
+    counts: Sequence[int]
+    dir_names: list[str]
+    dirs: Sequence[int]
+    targets: Sequence[int]
+    locked: Sequence[bool]
+
+
+_room_id = attrgetter("id")
+_exits = attrgetter("exits")
+_to_room = attrgetter("to_room")
+_locked = attrgetter("locked")
+
+
+def _bidirectional_bfs[N: Hashable](
+    start: N,
+    goal: N,
+    successors: Callable[[N], Iterable[N]],
+    predecessors: Callable[[N], Iterable[N]],
+) -> list[N] | None:
+    """
+    Shortest path by expanding whole BFS levels from whichever end has the
+    smaller frontier. Stops once no undiscovered path can beat the best
+    meeting point, i.e. when best <= depth_forward + depth_backward + 1.
+    """
+    parents = ({start: start}, {goal: goal})
+    depths = ({start: 0}, {goal: 0})
+    fronts = ([start], [goal])
+    level = [0, 0]
+    best, meet = None, start
+    while fronts[0] and fronts[1] and (best is None or best > level[0] + level[1] + 1):
+        side = 0 if len(fronts[0]) <= len(fronts[1]) else 1
+        expand = successors if side == 0 else predecessors
+        parent, depth = parents[side], depths[side]
+        other = depths[1 - side]
+        level[side] += 1
+        nxt_front = []
+        for cur in fronts[side]:
+            for nxt in expand(cur):
+                if nxt in parent:
+                    continue
+                parent[nxt] = cur
+                depth[nxt] = level[side]
+                nxt_front.append(nxt)
+                if nxt in other and (best is None or level[side] + other[nxt] < best):
+                    best, meet = level[side] + other[nxt], nxt
+        fronts[side][:] = nxt_front
+    if best is None:
+        return None
+
+    path = [meet]
+    while path[-1] != start:
+        path.append(parents[0][path[-1]])
+    path.reverse()
+    while path[-1] != goal:
+        path.append(parents[1][path[-1]])
+    return path
+
+
+def _forward_bfs(
+    start_id: str,
+    goal_id: str,
+    lookup: Callable[[str], Room | None],
+    limit: int | None = None,
+) -> list[str] | None:
+    """
+    Plain BFS over open exits for worlds that load rooms on demand and so
+    cannot list predecessors. Gives up (None) after discovering `limit` rooms.
+    """
+    came_from: dict[str, str | None] = {start_id: None}
+    frontier = [start_id]
+    while frontier:
+        nxt: list[str] = []
+        for cur in frontier:
+            room = lookup(cur)
+            if room is None:
+                continue
+            for ex in room.exits.values():
+                if ex.locked or ex.to_room in came_from:
+                    continue
+                came_from[ex.to_room] = cur
+                if ex.to_room == goal_id:
+                    path = [goal_id]
+                    while (prev := came_from[path[-1]]) is not None:
+                        path.append(prev)
+                    return path[::-1]
+                nxt.append(ex.to_room)
+            if limit is not None and len(came_from) > limit:
+                return None
+        frontier = nxt
+    return None
+
 
 class World:
     """A lightweight, directional graph of rooms.
@@ -90,11 +330,25 @@ class World:
         - move(room_id, direction) -> tuple[new_room_id | None, message]
         - neighbors(room_id) -> dict[direction, room_id]
         - find_path(start_id, goal_id) -> list[room_id] | None (BFS)
+
+    find_path results are cached per (start, goal) and the cache is dropped
+    whenever `topology_version` changes, which every exit change made
+    through World methods bumps.
     """
 
-    def __init__(self, *, title: str = "DiceRealms") -> None:
+    def __init__(self, *, title: str = "DiceRealms", path_cache_size: int = PATH_CACHE_SIZE) -> None:
         self.title = title
+        self.start_room = START_ROOM
         self._rooms: dict[str, Room] = {}
+        self._landmarks: LandmarkIndex | None = None
+        self._components: ComponentIndex | None = None
+        self.topology_version = 0
+        self._path_cache: OrderedDict[tuple[str, str], list[str] | None] = OrderedDict()
+        self._path_cache_size = path_cache_size
+        self._path_cache_version = 0
+        self._path_stats = PathCacheStats()
+        # Open-exit predecessors for backward search; built on first use.
+        self._preds: dict[str, list[str]] | None = None
 
     # --- Mutation ---
     def add_room(self, room: Room) -> None:
@@ -102,6 +356,11 @@ class World:
             raise ValueError(f"Room {room.id} already exists")
 
         self._rooms[room.id] = room
+        if self._components is not None:
+            self._components.room_added(room.id)
+        for ex in room.exits.values():
+            if not ex.locked:
+                self._edge_changed(room.id, added=ex.to_room)
 
     def add(self, room_id: str, name: str, description: str = "") -> Room:
         room = Room(id=room_id, name=name, description=description)
@@ -125,21 +384,137 @@ class World:
 
         If bidir is True and back_locked is None, the back edge inherits `locked`.
         """
-        a = self.require_room(a_id)
-        b = self.require_room(b_id)
-        a.add_exit(direction, b_id, description=description, locked=locked)
+        self.require_room(a_id)
+        self.require_room(b_id)
+        self.add_exit(a_id, direction, b_id, description=description, locked=locked)
         if bidir:
             back_dir = OPPOSITE.get(direction.lower())
             if not back_dir:
                 raise ValueError(f"No opposite direction for '{direction}'")
 
-            b.add_exit(
+            self.add_exit(
+                b_id,
                 back_dir,
                 a_id,
                 description=back_description,
                 locked=locked if back_locked is None else back_locked,
             )
 
+    def add_exit(
+        self,
+        room_id: str,
+        direction: Direction,
+        to_room: str,
+        *,
+        description: str | None = None,
+        locked: bool = False,
+    ) -> None:
+        """Add (or replace) a single directed exit from room_id."""
+        room = self.require_room(room_id)
+        old = room.exits.get(direction.lower())
+        room.add_exit(direction, to_room, description=description, locked=locked)
+        self._edge_changed(
+            room_id,
+            removed=old.to_room if old and not old.locked else None,
+            added=None if locked else to_room,
+        )
+
+    def set_locked(self, room_id: str, direction: Direction, locked: bool = True) -> None:
+        """Lock or unlock an existing exit."""
+        d = direction.lower()
+        ex = self.require_room(room_id).exits.get(d)
+        if not ex:
+            raise KeyError(f"No exit {d} from room {room_id}")
+        if ex.locked != locked:
+            ex.locked = locked
+            self.require_room(room_id).touch()
+            self._edge_changed(
+                room_id,
+                removed=ex.to_room if locked else None,
+                added=None if locked else ex.to_room,
+            )
+
+    def describe(
+        self, room_id: str, *, name: str | None = None, description: str | None = None
+    ) -> None:
+        """Change a room's display name and/or description."""
+        room = self.require_room(room_id)
+        if name is not None:
+            room.name = name
+        if description is not None:
+            room.description = description
+        room.touch()
+
+    def _edge_changed(
+        self, room_id: str, *, removed: str | None = None, added: str | None = None
+    ) -> None:
+        """
+        Topology hook, called after every change to the passable graph: an
+        open edge room_id -> `removed` went away and/or room_id -> `added`
+        appeared. Exits edited directly on Room objects bypass it.
+        """
+        self.topology_version += 1
+        if self._preds is not None:
+            preds = self._preds.get(removed) if removed is not None else None
+            if preds and room_id in preds:
+                preds.remove(room_id)
+            if added is not None:
+                self._preds.setdefault(added, []).append(room_id)
+        if self._landmarks is not None:
+            if removed is not None:
+                self._landmarks.edge_removed(room_id, removed)
+            if added is not None:
+                self._landmarks.edge_added(room_id, added)
+        if self._components is not None:
+            if removed is not None:
+                self._components.edge_removed(room_id, removed)
+            if added is not None:
+                self._components.edge_added(room_id, added)
+
+    def build_landmarks(self, count: int = 8) -> LandmarkIndex | None:
+        """
+        Precompute a landmark index; find_path then runs ALT A* instead of BFS.
+        The index is patched or rebuilt as exits change through this World.
+        Worlds that load rooms on demand can't index their whole graph and
+        return None.
+        """
+        # Imported here so plain worlds don't pull in NumPy.
+        from dicerealms.pathfinding import LandmarkIndex
+
+        self._landmarks = LandmarkIndex(self, count)
+        return self._landmarks
+
+    def drop_landmarks(self) -> None:
+        self._landmarks = None
+
+    def build_components(self) -> ComponentIndex | None:
+        """
+        Label every room with its region over open exits (see `components`).
+        The index follows exits changed through this World, region by region.
+        None where the whole graph can't be indexed (see build_landmarks).
+        """
+        from dicerealms.components import ComponentIndex
+
+        self._components = ComponentIndex(self)
+        return self._components
+
+    def drop_components(self) -> None:
+        self._components = None
+
+    @property
+    def components(self) -> ComponentIndex | None:
+        """Region index over open exits, built on first use (None if unsupported)."""
+        if self._components is None:
+            return self.build_components()
+        return self._components
+
+    # --- Presence (no-ops here; ZonedWorld keeps occupied zones loaded) ---
+    def occupy(self, room_id: str) -> None:
+        """A player entered room_id."""
+
+    def vacate(self, room_id: str) -> None:
+        """A player left room_id."""
+
     # --- Queries ---
     def has_room(self, room_id: str) -> bool:
         return room_id in self._rooms
@@ -153,18 +528,12 @@ class World:
     def current_room(self, room_id: str) -> Room | None:
         return self._rooms.get(room_id)
 
-    def look(self, room_id: str) -> str:
-        room = self.require_room(room_id)
-        lines: list[str] = [room.name, "", room.description.strip()]
-        exits = room.neighbor()
-
-        if exits:
-            pretty = ", ".join(sorted(exits.keys()))
-            lines += ["", f"Exits: {pretty}"]
-        else:
-            lines += ["", "No obvious exits."]
+    def render(self, room_id: str) -> RoomRender:
+        """Cached look output for a room (see Room.render)."""
+        return self.require_room(room_id).render()
 
-        return "\n".join(lines).strip()
+    def look(self, room_id: str) -> str:
+        return self.render(room_id).plain
 
     def neighbors(self, room_id: str) -> dict[Direction, str]:
         return self.require_room(room_id).neighbor()
@@ -185,70 +554,145 @@ class World:
     def rooms(self) -> Iterable[Room]:
         return self._rooms.values()
 
-    # --- Pathfinding (simple BFS for now) ---
+    # --- Pathfinding (bidirectional BFS, or ALT A* once build_landmarks() has run) ---
     def find_path(self, start_id: str, goal_id: str) -> list[str] | None:
         if start_id == goal_id:
             return [start_id]
 
-        if start_id not in self._rooms or goal_id not in self._rooms:
+        if not self.has_room(start_id) or not self.has_room(goal_id):
             return None
 
-        q = deque([start_id])
-        come_from: dict[str, str | None] = {start_id: None}
-        while q:
-            cur = q.popleft()
-            for nxt in self.neighbors(cur).values():
-                if nxt not in come_from:
-                    come_from[nxt] = cur
-                    if nxt == goal_id:
-                        path: list[str] = [nxt]
-                        while cur is not None:
-                            path.append(cur)
-                            cur = come_from[cur]
-                        path.reverse()
-                        return path
-                    q.append(nxt)
-        return None
-
-    # --- Serialization helpers (for M3) ---
+        cache, stats = self._path_cache, self._path_stats
+        if self._path_cache_version != self.topology_version:
+            if cache:
+                cache.clear()
+                stats.invalidations += 1
+            self._path_cache_version = self.topology_version
+
+        key = (start_id, goal_id)
+        if key in cache:
+            stats.hits += 1
+            cache.move_to_end(key)
+            path = cache[key]
+            return None if path is None else list(path)
+
+        stats.misses += 1
+        if self._landmarks is not None:
+            path = self._landmarks.find_path(start_id, goal_id)
+        else:
+            path = self._bfs_path(start_id, goal_id)
+        if self._path_cache_size > 0:
+            cache[key] = None if path is None else list(path)
+            if len(cache) > self._path_cache_size:
+                cache.popitem(last=False)
+                stats.evictions += 1
+        return path
+
+    def path_cache_stats(self) -> PathCacheStats:
+        """Snapshot of find_path cache counters."""
+        s = self._path_stats
+        return PathCacheStats(
+            hits=s.hits,
+            misses=s.misses,
+            evictions=s.evictions,
+            invalidations=s.invalidations,
+            size=len(self._path_cache),
+        )
+
+    def _open_edges(self) -> tuple[list[str], Sequence[int], Sequence[int]]:
+        """All rooms, plus (source, target) row indices of unlocked exits between them."""
+        ids = list(self._rooms)
+        index = {room_id: i for i, room_id in enumerate(ids)}
+        src: list[int] = []
+        dst: list[int] = []
+        for i, room in enumerate(self._rooms.values()):
+            for ex in room.exits.values():
+                j = index.get(ex.to_room)
+                if j is not None and not ex.locked:
+                    src.append(i)
+                    dst.append(j)
+        return ids, src, dst
+
+    def _dangling_exits(self) -> list[tuple[str, str]]:
+        """Unlocked exits into rooms that don't exist (yet), as (room ID, target ID)."""
+        return [
+            (room.id, ex.to_room)
+            for room in self._rooms.values()
+            for ex in room.exits.values()
+            if not ex.locked and ex.to_room not in self._rooms
+        ]
+
+    def _flat_exits(self) -> FlatExits:
+        """Every exit as flat columns, grouped by source (see FlatExits)."""
+        # Whole-column map() calls keep the per-exit work in C.
+        rooms = list(self.rooms())
+        ids = list(map(_room_id, rooms))
+        exit_dicts = list(map(_exits, rooms))
+        counts = list(map(len, exit_dicts))
+        dir_keys = list(chain.from_iterable(exit_dicts))
+        exits = list(chain.from_iterable(map(dict.values, exit_dicts)))
+        to_rooms = list(map(_to_room, exits))
+        locked = list(map(_locked, exits))
+
+        exists = [True] * len(ids)
+        index = {room_id: i for i, room_id in enumerate(ids)}
+        targets = list(map(index.get, to_rooms))
+        if None in targets:
+            for e, t in enumerate(targets):
+                if t is None:
+                    t = index.get(to_rooms[e])
+                    if t is None:
+                        t = index[to_rooms[e]] = len(ids)
+                        ids.append(to_rooms[e])
+                        exists.append(False)
+                        counts.append(0)
+                    targets[e] = t
+        dir_codes = {d: code for code, d in enumerate(dict.fromkeys(dir_keys))}
+        dirs = list(map(dir_codes.__getitem__, dir_keys))
+        return FlatExits(ids, exists, counts, list(dir_codes), dirs, targets, locked)
+
+    def _bfs_path(self, start_id: str, goal_id: str) -> list[str] | None:
+        rooms = self._rooms
+        if self._preds is None:
+            preds: dict[str, list[str]] = {}
+            for room in rooms.values():
+                for ex in room.exits.values():
+                    if not ex.locked:
+                        preds.setdefault(ex.to_room, []).append(room.id)
+            self._preds = preds
+        preds = self._preds
+
+        def successors(room_id: str) -> list[str]:
+            room = rooms.get(room_id)
+            if room is None:  # dangling exit target
+                return []
+            return [ex.to_room for ex in room.exits.values() if not ex.locked]
+
+        return _bidirectional_bfs(start_id, goal_id, successors, lambda r: preds.get(r, ()))
+
+    # --- Serialization helpers (for M3; see dicerealms.world_io for streaming files) ---
     def to_dict(self) -> dict:
         return {
             "title": self.title,
-            "rooms": [
-                {
-                    "id": r.id,
-                    "name": r.name,
-                    "description": r.description,
-                    "exits": {
-                        d: {
-                            "to": ex.to_room,
-                            "description": ex.description,
-                            "locked": ex.locked,
-                        }
-                        for d, ex in r.exits.items()
-                    },
-                }
-                for r in self.rooms()
-            ],
+            "start_room": self.start_room,
+            "rooms": [r.to_dict() for r in self.rooms()],
         }
 
     @classmethod
-    def from_dict(cls, data: dict) -> World:
+    def from_dict(cls, data: dict, *, strict: bool = False) -> World:
+        """
+        Build a world from to_dict() output. strict=True rejects exits to rooms
+        that don't exist (dicerealms.world_check reports every problem).
+        """
         w = cls(title=data.get("title", "DiceRealms"))
+        w.start_room = data.get("start_room", START_ROOM)
         for rdata in data.get("rooms", []):
-            r = Room(
-                id=rdata["id"],
-                name=rdata.get("name", rdata["id"]),
-                description=rdata.get("description", ""),
-            )
-            for d, ex in rdata.get("exits", {}).items():
-                r.add_exit(
-                    d,
-                    to_room=ex["to"],
-                    description=ex.get("description"),
-                    locked=ex.get("locked", False),
-                )
-            w.add_room(r)
+            w.add_room(Room.from_dict(rdata))
+        if strict:
+            for room in w.rooms():
+                for d, ex in room.exits.items():
+                    if not w.has_room(ex.to_room):
+                        raise ValueError(f"Dangling exit {room.id} {d} -> {ex.to_room}")
         return w
 
 
@@ -311,7 +755,13 @@ def load_default_world() -> World:
 __all__ = [
     "Direction",
     "Exit",
+    "FlatExits",
+    "PATH_CACHE_SIZE",
+    "SEARCH_LIMIT",
+    "START_ROOM",
+    "PathCacheStats",
     "Room",
+    "RoomRender",
     "World",
     "load_default_world",
 ]
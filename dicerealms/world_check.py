@@ -0,0 +1,371 @@
+# SPDX-License-Identifier: MIT
+# dicerealms/world_check.py
+"""
+Structural checks for worlds before they go live.
+
+validate_world() flattens a World into integer arrays (interned room IDs,
+exits sorted by (room, direction); see World._flat_exits, which worlds
+stored as arrays answer without walking their rooms) and then runs,
+sharded across processes:
+- per chunk of rooms: dangling exits (target room missing) and asymmetric
+  links (an exit with an opposite direction whose way back is missing,
+  leads elsewhere, or differs in being locked)
+- once each: reachability from the start room over all exits and over open
+  exits only, giving unreachable rooms and locked-only regions (rooms that
+  exist behind a lock) together with the locked exits that guard them
+
+Dangling exits are errors; the rest are warnings, since one-way exits and
+unreachable staging rooms can be deliberate. The report is plain data
+(ValidationReport.to_dict) for `dicerealms world validate --json`.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+from dicerealms.world import OPPOSITE, World
+
+REPORT_FORMAT = "dicerealms-world-report"
+REPORT_VERSION = 1
+CHUNK_ROOMS = 100_000
+SAMPLE_LIMIT = 100
+# Search levels narrower than this are expanded in plain Python; numpy's
+# per-call overhead only pays off on wide ones.
+WIDE_FRONTIER = 256
+
+# Asymmetric-link problems, by code
+PROBLEMS = ("missing", "mismatched", "locked")
+
+
+@dataclass(slots=True)
+class WorldGraph:
+    """A world's exits as flat arrays, sorted by (room, direction).
+
+    Attributes:
+        ids: Interned room IDs; includes IDs only named by exits
+        exists: Whether ids[i] is an actual room
+        dir_names: Direction names by code
+        opposite: Opposite direction code by code, or -1
+        offsets: Exits of room i are offsets[i]:offsets[i + 1]
+        sources: Source room of each exit
+        targets: Target room of each exit
+        dirs: Direction code of each exit
+        locked: Whether each exit is locked
+        start: Index of the first room, or -1 for an empty world
+    """
+
+    ids: list[str]
+    exists: np.ndarray
+    dir_names: list[str]
+    opposite: np.ndarray
+    offsets: np.ndarray
+    sources: np.ndarray
+    targets: np.ndarray
+    dirs: np.ndarray
+    locked: np.ndarray
+    start: int = -1
+
+    @classmethod
+    def of(cls, world: World) -> WorldGraph:
+        flat = world._flat_exits()
+        n = len(flat.ids)
+        exists = np.asarray(flat.exists, dtype=bool)
+        counts = np.asarray(flat.counts, dtype=np.int64)
+        dir_codes = {d: code for code, d in enumerate(flat.dir_names)}
+        # Opposites get codes even if no exit uses them, so a missing way back is found.
+        for d in flat.dir_names:
+            if d in OPPOSITE:
+                dir_codes.setdefault(OPPOSITE[d], len(dir_codes))
+        dir_names = list(dir_codes)
+        opposite = np.array(
+            [dir_codes[OPPOSITE[d]] if d in OPPOSITE else -1 for d in dir_names], dtype=np.int64
+        )
+        # Exits come grouped by source already; this only orders each room's by direction.
+        sources = np.repeat(np.arange(n, dtype=np.int64), counts)
+        dirs = np.asarray(flat.dirs, dtype=np.int64)
+        order = np.lexsort((dirs, sources))
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        present = np.flatnonzero(exists)
+        return cls(
+            ids=flat.ids,
+            exists=exists,
+            dir_names=dir_names,
+            opposite=opposite,
+            offsets=offsets,
+            sources=sources,
+            targets=np.asarray(flat.targets, dtype=np.int64)[order],
+            dirs=dirs[order],
+            locked=np.asarray(flat.locked, dtype=bool)[order],
+            start=int(present[0]) if present.size else -1,
+        )
+
+    @property
+    def rooms(self) -> int:
+        return int(self.exists.sum())
+
+    def exit_dict(self, e: int) -> dict:
+        return {
+            "room": self.ids[self.sources[e]],
+            "direction": self.dir_names[self.dirs[e]],
+            "to": self.ids[self.targets[e]],
+        }
+
+
+@dataclass(slots=True)
+class Findings:
+    """One kind of problem: how many, plus the first few.
+
+    Attributes:
+        count: Total problems of this kind
+        samples: Up to the report's sample limit, in room order
+    """
+
+    count: int = 0
+    samples: list = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "samples": self.samples}
+
+
+@dataclass(slots=True)
+class ValidationReport:
+    """Result of validate_world.
+
+    Attributes:
+        rooms: Rooms checked
+        exits: Exits checked
+        start: Room reachability was measured from (None if empty)
+        dangling: Exits to rooms that don't exist (errors)
+        asymmetric: Exits whose way back is missing, elsewhere or differently locked
+        unreachable: Rooms not reachable from start, even through locks
+        locked_only: Rooms reachable from start only through locked exits
+        gates: Locked exits leading from open ground into locked-only rooms
+        seconds: Wall time of the whole check
+    """
+
+    rooms: int
+    exits: int
+    start: str | None
+    dangling: Findings
+    asymmetric: Findings
+    unreachable: Findings
+    locked_only: Findings
+    gates: Findings
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.dangling.count == 0
+
+    def to_dict(self) -> dict:
+        return {
+            "format": REPORT_FORMAT,
+            "version": REPORT_VERSION,
+            "ok": self.ok,
+            "rooms": self.rooms,
+            "exits": self.exits,
+            "start": self.start,
+            "errors": {"dangling": self.dangling.to_dict()},
+            "warnings": {
+                "asymmetric": self.asymmetric.to_dict(),
+                "unreachable": self.unreachable.to_dict(),
+                "locked_only": self.locked_only.to_dict(),
+                "gates": self.gates.to_dict(),
+            },
+            "seconds": self.seconds,
+        }
+
+
+# --- Checks (run inside worker processes) ---
+_GRAPH: WorldGraph | None = None
+# (source, direction) key of each exit; ascending, as exits are sorted that way
+_KEYS: np.ndarray | None = None
+
+
+def _init_worker(graph: WorldGraph) -> None:
+    global _GRAPH, _KEYS
+    _GRAPH = graph
+    _KEYS = graph.sources * len(graph.dir_names) + graph.dirs
+
+
+def _worker_graph() -> tuple[WorldGraph, np.ndarray]:
+    if _GRAPH is None or _KEYS is None:
+        raise RuntimeError("No world graph loaded; call _init_worker(graph) first")
+    return _GRAPH, _KEYS
+
+
+def check_chunk(lo: int, hi: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Check the exits of rooms lo..hi-1. Returns (dangling exit indices,
+    asymmetric exit indices, their PROBLEMS codes).
+    """
+    g, keys = _worker_graph()
+    a, b = int(g.offsets[lo]), int(g.offsets[hi])
+    edges = np.arange(a, b)
+    targets = g.targets[a:b]
+    ok = g.exists[targets]
+    dangling = edges[~ok]
+
+    opp = g.opposite[g.dirs[a:b]]
+    check = ok & (opp >= 0)
+    edges, targets, opp = edges[check], targets[check], opp[check]
+    query = targets * len(g.dir_names) + opp
+    pos = np.minimum(np.searchsorted(keys, query), len(keys) - 1)
+    found = keys[pos] == query
+    problem = np.full(len(edges), -1, dtype=np.int64)
+    problem[~found] = 0
+    problem[found & (g.targets[pos] != g.sources[edges])] = 1
+    problem[(problem < 0) & (g.locked[pos] != g.locked[edges])] = 2
+    bad = problem >= 0
+    return dangling, edges[bad], problem[bad]
+
+
+def reachable(open_only: bool) -> np.ndarray:
+    """
+    Rooms reachable from g.start, over open exits only or over all of them.
+
+    Only which rooms are found matters, not in what order, so the search
+    switches freely between two modes: while few rooms are waiting it
+    walks them one at a time in Python (a corridor would otherwise cost a
+    round of tiny array calls per room); once many are, it expands all of
+    them at once with array operations.
+    """
+    g, _ = _worker_graph()
+    visited = bytearray(len(g.ids))
+    seen = np.frombuffer(visited, dtype=bool)
+    if g.start < 0:
+        return seen.copy()
+    blocked = g.locked if open_only else np.zeros(len(g.targets), dtype=bool)
+    lists: tuple[list[int], list[int], list[bool]] | None = None
+    visited[g.start] = 1
+    # Found rooms whose exits haven't been followed yet
+    waiting: list[int] | np.ndarray = [g.start]
+    while len(waiting):
+        if len(waiting) < WIDE_FRONTIER:
+            if lists is None:
+                lists = g.offsets.tolist(), g.targets.tolist(), blocked.tolist()
+            offsets, targets, skip = lists
+            stack = waiting if isinstance(waiting, list) else waiting.tolist()
+            while stack and len(stack) < WIDE_FRONTIER:
+                i = stack.pop()
+                for e in range(offsets[i], offsets[i + 1]):
+                    t = targets[e]
+                    if not visited[t] and not skip[e]:
+                        visited[t] = 1
+                        stack.append(t)
+            waiting = stack
+            continue
+        rooms = np.asarray(waiting, dtype=np.int64)
+        starts = g.offsets[rooms]
+        counts = g.offsets[rooms + 1] - starts
+        # Exit indices of every frontier room, one run per room
+        edges = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        found = g.targets[edges[~blocked[edges]]]
+        waiting = np.unique(found[~seen[found]])
+        seen[waiting] = True
+    return seen & g.exists
+
+
+def validate_world(
+    world: World | WorldGraph,
+    *,
+    start: str | None = None,
+    workers: int | None = None,
+    chunk_rooms: int = CHUNK_ROOMS,
+    limit: int = SAMPLE_LIMIT,
+) -> ValidationReport:
+    """
+    Check a world (or an already flattened WorldGraph).
+
+    Reachability is measured from `start` (default: the world's start room,
+    or the first room if it has none).
+    workers=1 runs in-process; otherwise a ProcessPoolExecutor with
+    `workers` processes (default: one per CPU) checks chunks of
+    `chunk_rooms` rooms while two more tasks run the reachability searches.
+    Each kind of finding keeps at most `limit` samples.
+    """
+    t0 = time.perf_counter()
+    if isinstance(world, WorldGraph):
+        g = world
+    else:
+        g = WorldGraph.of(world)
+        if start is None and world.has_room(world.start_room):
+            start = world.start_room
+    if start is not None:
+        try:
+            i = g.ids.index(start)
+        except ValueError:
+            i = -1
+        if i < 0 or not g.exists[i]:
+            raise ValueError(f"Start room not found: {start}")
+        g = replace(g, start=i)
+
+    n = len(g.ids)
+    chunks = [(lo, min(n, lo + chunk_rooms)) for lo in range(0, n, max(1, chunk_rooms))]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(g)
+        results = [check_chunk(lo, hi) for lo, hi in chunks]
+        reach_all, reach_open = reachable(False), reachable(True)
+    else:
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks) + 2),
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(g,),
+        ) as pool:
+            # Searches first: they are the longest single tasks.
+            searches = [pool.submit(reachable, open_only) for open_only in (False, True)]
+            futures = [pool.submit(check_chunk, lo, hi) for lo, hi in chunks]
+            results = [f.result() for f in futures]
+            reach_all, reach_open = (f.result() for f in searches)
+
+    dangling: list[dict] = []
+    asymmetric: list[dict] = []
+    n_dangling = n_asymmetric = 0
+    for bad, asym, problems in results:
+        n_dangling += len(bad)
+        n_asymmetric += len(asym)
+        for e in bad[: max(0, limit - len(dangling))].tolist():
+            dangling.append(g.exit_dict(e))
+        room_left = max(0, limit - len(asymmetric))
+        for e, p in zip(asym[:room_left].tolist(), problems[:room_left].tolist(), strict=True):
+            asymmetric.append({**g.exit_dict(e), "problem": PROBLEMS[p]})
+
+    unreachable = np.flatnonzero(g.exists & ~reach_all)
+    locked_only = reach_all & ~reach_open
+    gates = np.flatnonzero(g.locked & reach_open[g.sources] & locked_only[g.targets])
+    locked_rooms = np.flatnonzero(locked_only)
+
+    return ValidationReport(
+        rooms=g.rooms,
+        exits=len(g.targets),
+        start=g.ids[g.start] if g.start >= 0 else None,
+        dangling=Findings(n_dangling, dangling),
+        asymmetric=Findings(n_asymmetric, asymmetric),
+        unreachable=Findings(len(unreachable), [g.ids[i] for i in unreachable[:limit]]),
+        locked_only=Findings(len(locked_rooms), [g.ids[i] for i in locked_rooms[:limit]]),
+        gates=Findings(len(gates), [g.exit_dict(e) for e in gates[:limit].tolist()]),
+        seconds=time.perf_counter() - t0,
+    )
+
+
+__all__ = [
+    "CHUNK_ROOMS",
+    "Findings",
+    "PROBLEMS",
+    "SAMPLE_LIMIT",
+    "ValidationReport",
+    "WorldGraph",
+    "check_chunk",
+    "reachable",
+    "validate_world",
+]
@@ -0,0 +1,268 @@
+# SPDX-License-Identifier: MIT
+# dicerealms/world_io.py
+"""
+Streaming world files for DiceRealms.
+
+World.to_dict/from_dict hold the whole realm as one nested dict, which
+doubles peak memory for big worlds. The streaming formats store one record
+per room instead, so a loader only ever holds the graph it is building plus
+a single room:
+
+    {"format": "dicerealms-world", "version": 1, "title": "...", "start_room": "..."}  # header
+    {"id": "town_square", "name": "...", "description": "...", "exits": {...}}
+    ...
+
+Rooms use the same shape as World.to_dict()["rooms"] entries (Room.to_dict).
+Two encodings are supported, picked by file extension:
+- JSON Lines (.jsonl, .ndjson): one JSON object per line
+- msgpack (.msgpack, .mpk): a stream of concatenated msgpack maps; needs
+  the optional `msgpack` package (`pip install dicerealms[msgpack]`)
+
+Legacy whole-document .json files (World.to_dict output) can still be read
+and written here, but are not streamed. Compiled .drw files (see
+dicerealms.mapped_world) are written by compiling and opened by mmap.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import IO, Any
+
+from dicerealms.mapped_world import MappedWorld, compile_world
+from dicerealms.world import START_ROOM, Room, World
+
+FORMAT = "dicerealms-world"
+FORMAT_VERSION = 1
+# Rooms between progress callbacks.
+PROGRESS_EVERY = 10_000
+
+_EXTENSIONS = {
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".msgpack": "msgpack",
+    ".mpk": "msgpack",
+    ".json": "json",
+    ".drw": "drw",
+}
+
+
+@dataclass(slots=True)
+class WorldIOProgress:
+    """Progress of a streaming load or save.
+
+    Attributes:
+        rooms: Rooms read or written so far
+        bytes: Bytes of the file consumed or produced so far
+        total_bytes: File size when loading; None when saving
+    """
+
+    rooms: int
+    bytes: int
+    total_bytes: int | None = None
+
+    @property
+    def fraction(self) -> float | None:
+        if not self.total_bytes:
+            return None
+        return min(1.0, self.bytes / self.total_bytes)
+
+
+ProgressCallback = Callable[[WorldIOProgress], None]
+
+
+def detect_format(path: str) -> str:
+    """'jsonl', 'msgpack', 'json' or 'drw', from the file extension."""
+    fmt = _EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        known = ", ".join(sorted(_EXTENSIONS))
+        raise ValueError(f"Unknown world file extension (expected one of {known}): {path}")
+    return fmt
+
+
+def _msgpack() -> Any:
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError(
+            "msgpack world files need the optional 'msgpack' package "
+            "(pip install dicerealms[msgpack])"
+        ) from None
+    return msgpack
+
+
+def _header(world: World) -> dict:
+    return {
+        "format": FORMAT,
+        "version": FORMAT_VERSION,
+        "title": world.title,
+        "start_room": world.start_room,
+    }
+
+
+def _check_header(path: str, header: Any) -> dict:
+    if (
+        not isinstance(header, dict)
+        or header.get("format") != FORMAT
+        or header.get("version") != FORMAT_VERSION
+    ):
+        raise ValueError(f"Not a DiceRealms world stream (or wrong version): {path}")
+    return header
+
+
+def _encode_jsonl(record: dict) -> bytes:
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode()
+
+
+def _iter_jsonl(f: IO[bytes]) -> Iterator[tuple[dict, int]]:
+    pos = 0
+    for line in f:
+        pos += len(line)
+        if line.strip():
+            yield json.loads(line), pos
+
+
+def _iter_msgpack(f: IO[bytes]) -> Iterator[tuple[dict, int]]:
+    unpacker = _msgpack().Unpacker(f, raw=False)
+    for record in unpacker:
+        yield record, unpacker.tell()
+
+
+def iter_rooms(
+    path: str, *, fmt: str | None = None
+) -> tuple[dict, Iterator[tuple[Room, int]]]:
+    """
+    Open a streaming world file.
+
+    Returns the header and an iterator of (room, bytes consumed so far);
+    the file stays open until the iterator is exhausted or closed.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in ("jsonl", "msgpack"):
+        raise ValueError(f"Not a streaming world format: {fmt}")
+    f = open(path, "rb")
+    try:
+        records = _iter_jsonl(f) if fmt == "jsonl" else _iter_msgpack(f)
+        first = next(records, None)
+        header = _check_header(path, first[0] if first else None)
+    except BaseException:
+        f.close()
+        raise
+
+    def rooms() -> Iterator[tuple[Room, int]]:
+        with f:
+            for record, pos in records:
+                yield Room.from_dict(record), pos
+
+    return header, rooms()
+
+
+def load_world[W: World](
+    path: str,
+    *,
+    fmt: str | None = None,
+    world_cls: type[W] = World,
+    progress: ProgressCallback | None = None,
+    progress_every: int = PROGRESS_EVERY,
+) -> W:
+    """
+    Build a world from a file, one room at a time.
+
+    `progress` is called every `progress_every` rooms and once at the end.
+    Any World subclass with the standard constructor works as `world_cls`
+    (e.g. CompactWorld for very large realms); .drw files always open as a
+    MappedWorld, which reads rooms lazily instead.
+    """
+    fmt = fmt or detect_format(path)
+    total = os.path.getsize(path)
+    if fmt == "drw":
+        world = MappedWorld(path)
+        if progress:
+            progress(WorldIOProgress(world.room_count, total, total))
+        return world  # type: ignore[return-value]
+    if fmt == "json":
+        with open(path, encoding="utf-8") as f:
+            world = world_cls.from_dict(json.load(f))
+        if progress:
+            progress(WorldIOProgress(sum(1 for _ in world.rooms()), total, total))
+        return world
+
+    header, rooms = iter_rooms(path, fmt=fmt)
+    world = world_cls(title=header.get("title", "DiceRealms"))
+    world.start_room = header.get("start_room", START_ROOM)
+    count = pos = 0
+    for room, pos in rooms:
+        world.add_room(room)
+        count += 1
+        if progress and count % progress_every == 0:
+            progress(WorldIOProgress(count, pos, total))
+    if progress:
+        progress(WorldIOProgress(count, pos, total))
+    return world
+
+
+def save_world(
+    world: World,
+    path: str,
+    *,
+    fmt: str | None = None,
+    progress: ProgressCallback | None = None,
+    progress_every: int = PROGRESS_EVERY,
+) -> int:
+    """
+    Write a world one room at a time; returns the number of rooms written.
+
+    The file is written next to `path` and renamed into place, so readers
+    never see a half-written world.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt == "jsonl":
+        encode: Callable[[dict], bytes] = _encode_jsonl
+    elif fmt == "msgpack":
+        encode = _msgpack().Packer().pack
+    elif fmt == "drw":
+        count = compile_world(world, path)
+        if progress:
+            progress(WorldIOProgress(count, os.path.getsize(path)))
+        return count
+    elif fmt != "json":
+        raise ValueError(f"Unknown world format: {fmt}")
+
+    tmp = f"{path}.tmp"
+    count = written = 0
+    try:
+        with open(tmp, "wb") as f:
+            if fmt == "json":
+                data = world.to_dict()
+                count = len(data["rooms"])
+                written = f.write(json.dumps(data, indent=2).encode())
+            else:
+                written = f.write(encode(_header(world)))
+                for room in world.rooms():
+                    written += f.write(encode(room.to_dict()))
+                    count += 1
+                    if progress and count % progress_every == 0:
+                        progress(WorldIOProgress(count, written))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    if progress:
+        progress(WorldIOProgress(count, written))
+    return count
+
+
+__all__ = [
+    "FORMAT",
+    "FORMAT_VERSION",
+    "PROGRESS_EVERY",
+    "ProgressCallback",
+    "WorldIOProgress",
+    "detect_format",
+    "iter_rooms",
+    "load_world",
+    "save_world",
+]
@@ -0,0 +1,321 @@
+# SPDX-License-Identifier: MIT
+# dicerealms/zoned_world.py
+"""
+Zone-sharded World for realms larger than memory.
+
+A zone is a group of rooms stored and loaded together. ZonedWorld asks a
+ZoneSource which zone a room belongs to and loads that zone the first time
+any of its rooms is looked up, so exits into other zones resolve lazily:
+following one (move, find_path) pulls the target zone in. find_path searches
+forward only, gives up after `search_limit` rooms and lets zones it has
+walked through be evicted as it goes.
+
+Zones stay resident while a player is in them (see World.occupy/vacate).
+Unoccupied zones are kept in LRU order and evicted once more than
+`max_zones` zones or `max_rooms` rooms are resident. Zones edited through
+World methods are written back with `source.save()` before eviction; if
+the source cannot save, edited zones are never evicted.
+
+`rooms()` and `to_dict()` cover resident rooms only. Rooms that belong to
+no zone (source.zone_of() returns None) can be added directly and are
+always resident.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Protocol
+
+from dicerealms.world import PATH_CACHE_SIZE, SEARCH_LIMIT, Room, World, _forward_bfs
+from dicerealms.world_io import iter_rooms, save_world
+
+
+class ZoneSource(Protocol):
+    """Where ZonedWorld finds zones. `save(zone, rooms)` is optional."""
+
+    def zone_of(self, room_id: str) -> str | None: ...
+
+    def load(self, zone: str) -> Iterable[Room]: ...
+
+
+@dataclass(slots=True)
+class ZoneStats:
+    """Counters for ZonedWorld's zone cache.
+
+    Attributes:
+        loads: Zones loaded from the source
+        evictions: Zones dropped to stay within budget
+        saves: Edited zones written back before eviction
+        resident_zones: Zones currently loaded
+        resident_rooms: Rooms currently loaded (zoned or not)
+        occupied_zones: Loaded zones with at least one player
+        load_seconds: Total time spent loading zones
+        max_load_seconds: Slowest single zone load
+    """
+
+    loads: int = 0
+    evictions: int = 0
+    saves: int = 0
+    resident_zones: int = 0
+    resident_rooms: int = 0
+    occupied_zones: int = 0
+    load_seconds: float = 0.0
+    max_load_seconds: float = 0.0
+
+    @property
+    def mean_load_seconds(self) -> float:
+        return self.load_seconds / self.loads if self.loads else 0.0
+
+
+class ZoneDirectory:
+    """
+    Zones stored as one world file per zone in a directory.
+
+    Room IDs carry their zone as a prefix, e.g. "crypt:altar" lives in
+    "<root>/crypt.jsonl"; IDs without the separator belong to no zone.
+    """
+
+    def __init__(self, root: str, *, fmt: str = "jsonl", sep: str = ":") -> None:
+        if fmt not in ("jsonl", "msgpack"):
+            raise ValueError(f"Zone files must use a streaming format: {fmt}")
+        self.root = root
+        self.fmt = fmt
+        self.sep = sep
+
+    def path(self, zone: str) -> str:
+        return os.path.join(self.root, f"{zone}.{self.fmt}")
+
+    def zone_of(self, room_id: str) -> str | None:
+        zone, sep, _ = room_id.partition(self.sep)
+        return zone if sep else None
+
+    def load(self, zone: str) -> Iterable[Room]:
+        if not os.path.exists(self.path(zone)):
+            return ()
+        _, rooms = iter_rooms(self.path(zone), fmt=self.fmt)
+        return (room for room, _ in rooms)
+
+    def save(self, zone: str, rooms: Iterable[Room]) -> None:
+        w = World(title=zone)
+        for room in rooms:
+            w.add_room(room)
+        save_world(w, self.path(zone), fmt=self.fmt)
+
+    @classmethod
+    def open(cls, root: str, *, sep: str = ":") -> ZoneDirectory:
+        """A directory written by from_world, in whichever format its files use."""
+        if not os.path.isdir(root):
+            raise ValueError(f"Not a zone directory: {root}")
+        names = os.listdir(root)
+        for fmt in ("jsonl", "msgpack"):
+            if any(name.endswith(f".{fmt}") for name in names):
+                return cls(root, fmt=fmt, sep=sep)
+        raise ValueError(f"No zone files in {root}")
+
+    @classmethod
+    def from_world(
+        cls, world: World, root: str, *, fmt: str = "jsonl", sep: str = ":"
+    ) -> ZoneDirectory:
+        """Split a world's zoned rooms into per-zone files under root."""
+        zones = cls(root, fmt=fmt, sep=sep)
+        os.makedirs(root, exist_ok=True)
+        grouped: dict[str, list[Room]] = {}
+        for room in world.rooms():
+            zone = zones.zone_of(room.id)
+            if zone is not None:
+                grouped.setdefault(zone, []).append(room)
+        for zone, rooms in grouped.items():
+            zones.save(zone, rooms)
+        return zones
+
+
+class ZonedWorld(World):
+    """World whose rooms are loaded and evicted a zone at a time."""
+
+    def __init__(
+        self,
+        source: ZoneSource,
+        *,
+        title: str = "DiceRealms",
+        max_zones: int | None = None,
+        max_rooms: int | None = None,
+        search_limit: int = SEARCH_LIMIT,
+        path_cache_size: int = PATH_CACHE_SIZE,
+    ) -> None:
+        super().__init__(title=title, path_cache_size=path_cache_size)
+        self.source = source
+        self.max_zones = max_zones
+        self.max_rooms = max_rooms
+        self.search_limit = search_limit
+        # Resident zones in LRU order -> their room IDs
+        self._zones: OrderedDict[str, list[str]] = OrderedDict()
+        self._room_zone: dict[str, str] = {}
+        self._occupants: dict[str, int] = {}
+        self._dirty: set[str] = set()
+        self._stats = ZoneStats()
+
+    # --- Zone cache ---
+    def _load(self, zone: str) -> None:
+        if zone in self._zones:
+            self._zones.move_to_end(zone)
+            return
+
+        t0 = time.perf_counter()
+        ids: list[str] = []
+        for room in self.source.load(zone):
+            # Loading reveals stored rooms; it doesn't change the graph.
+            if room.id not in self._rooms:
+                self._rooms[room.id] = room
+                self._room_zone[room.id] = zone
+                ids.append(room.id)
+        self._zones[zone] = ids
+        elapsed = time.perf_counter() - t0
+        stats = self._stats
+        stats.loads += 1
+        stats.load_seconds += elapsed
+        stats.max_load_seconds = max(stats.max_load_seconds, elapsed)
+        self._enforce_budget()
+
+    def _lookup(self, room_id: str) -> Room | None:
+        room = self._rooms.get(room_id)
+        if room is None:
+            zone = self.source.zone_of(room_id)
+            if zone is None or zone in self._zones:
+                return None
+            self._load(zone)
+            return self._rooms.get(room_id)
+        zone = self._room_zone.get(room_id)
+        if zone is not None:
+            self._zones.move_to_end(zone)
+        return room
+
+    def _evictable(self, zone: str) -> bool:
+        if self._occupants.get(zone):
+            return False
+        return zone not in self._dirty or hasattr(self.source, "save")
+
+    def _over_budget(self) -> bool:
+        return (self.max_zones is not None and len(self._zones) > self.max_zones) or (
+            self.max_rooms is not None and len(self._rooms) > self.max_rooms
+        )
+
+    def _enforce_budget(self) -> None:
+        # Never evict the most recently used zone: it is the one being entered.
+        candidates = [z for z in list(self._zones)[:-1] if self._evictable(z)]
+        for zone in candidates:
+            if not self._over_budget():
+                break
+            self.evict(zone)
+
+    def evict(self, zone: str) -> bool:
+        """Unload a resident zone now (saving edits); False if it is occupied or pinned."""
+        if zone not in self._zones or not self._evictable(zone):
+            return False
+        ids = self._zones.pop(zone)
+        if zone in self._dirty:
+            rooms = (self._rooms[room_id] for room_id in ids)
+            self.source.save(zone, rooms)  # type: ignore[attr-defined]
+            self._dirty.discard(zone)
+            self._stats.saves += 1
+        for room_id in ids:
+            del self._rooms[room_id]
+            del self._room_zone[room_id]
+        self._stats.evictions += 1
+        return True
+
+    def resident_zones(self) -> list[str]:
+        """Loaded zones, least recently used first."""
+        return list(self._zones)
+
+    def zone_stats(self) -> ZoneStats:
+        """Snapshot of zone cache counters."""
+        s = self._stats
+        return ZoneStats(
+            loads=s.loads,
+            evictions=s.evictions,
+            saves=s.saves,
+            resident_zones=len(self._zones),
+            resident_rooms=len(self._rooms),
+            occupied_zones=sum(1 for z in self._zones if self._occupants.get(z)),
+            load_seconds=s.load_seconds,
+            max_load_seconds=s.max_load_seconds,
+        )
+
+    # --- Presence ---
+    def occupy(self, room_id: str) -> None:
+        zone = self.source.zone_of(room_id)
+        if zone is not None:
+            self._occupants[zone] = self._occupants.get(zone, 0) + 1
+            self._load(zone)
+
+    def vacate(self, room_id: str) -> None:
+        zone = self.source.zone_of(room_id)
+        if zone is not None and self._occupants.get(zone):
+            self._occupants[zone] -= 1
+            if not self._occupants[zone]:
+                del self._occupants[zone]
+                self._enforce_budget()
+
+    # --- Mutation ---
+    def add_room(self, room: Room) -> None:
+        zone = self.source.zone_of(room.id)
+        if zone is not None:
+            self._load(zone)
+        super().add_room(room)
+        if zone is not None:
+            self._zones[zone].append(room.id)
+            self._room_zone[room.id] = zone
+            self._dirty.add(zone)
+
+    def describe(
+        self, room_id: str, *, name: str | None = None, description: str | None = None
+    ) -> None:
+        super().describe(room_id, name=name, description=description)
+        zone = self._room_zone.get(room_id)
+        if zone is not None:
+            self._dirty.add(zone)
+
+    def _edge_changed(
+        self, room_id: str, *, removed: str | None = None, added: str | None = None
+    ) -> None:
+        zone = self._room_zone.get(room_id)
+        if zone is not None:
+            self._dirty.add(zone)
+        super()._edge_changed(room_id, removed=removed, added=added)
+
+    # Indexes need every zone resident, so find_path stays a bounded BFS.
+    def build_landmarks(self, count: int = 8) -> None:
+        return None
+
+    def build_components(self) -> None:
+        return None
+
+    # --- Queries ---
+    def has_room(self, room_id: str) -> bool:
+        return self._lookup(room_id) is not None
+
+    def require_room(self, room_id: str) -> Room:
+        room = self._lookup(room_id)
+        if room is None:
+            raise KeyError(f"Room not found: {room_id}")
+        return room
+
+    def current_room(self, room_id: str) -> Room | None:
+        return self._lookup(room_id)
+
+    def _bfs_path(self, start_id: str, goal_id: str) -> list[str] | None:
+        # Forward-only: predecessors would need every zone loaded. The search
+        # keeps room IDs only, so zones it has left may be evicted as it goes.
+        return _forward_bfs(start_id, goal_id, self._lookup, self.search_limit)
+
+
+__all__ = [
+    "ZoneDirectory",
+    "ZoneSource",
+    "ZoneStats",
+    "ZonedWorld",
+]
@@ -6,9 +6,12 @@ from unittest.mock import AsyncMock
 
 import pytest
 
+from dicerealms.core import RngStreams, roll_dice
 from dicerealms.server.action_processor import ActionProcessor
+from dicerealms.server.audit_log import RollAuditLog, RollLogReader
 from dicerealms.server.game_state import GameState
 from dicerealms.server.turn_manager import TurnManager
+from dicerealms.world import World
 
 
 @pytest.fixture
@@ -103,6 +106,20 @@ class TestActionProcessor:
         assert details["level"] == 1
         assert details["xp"] == 0
 
+    @pytest.mark.asyncio
+    async def test_inspect_by_name_or_unique_prefix(self, action_processor, game_state):
+        game_state.add_player("player_1", "Alice")
+        game_state.add_player("player_2", "Alfred")
+
+        result = await action_processor.process_action("player_1", "inspect", ["ALICE"])
+        assert result["result"]["details"]["name"] == "Alice"
+
+        result = await action_processor.process_action("player_1", "inspect", ["alf"])
+        assert result["result"]["details"]["name"] == "Alfred"
+
+        result = await action_processor.process_action("player_1", "inspect", ["al"])
+        assert result["success"] is False
+
     @pytest.mark.asyncio
     async def test_process_action_delay(self, action_processor, game_state, turn_manager, broadcast_callback):
         """Test that action processing includes delay."""
@@ -116,4 +133,105 @@ class TestActionProcessor:
         
         # Should take at least action_delay seconds
         elapsed = end_time - start_time
-        assert elapsed >= action_processor.action_delay
\ No newline at end of file
+        assert elapsed >= action_processor.action_delay
+
+    @pytest.mark.asyncio
+    async def test_roll_odds_is_free(self, action_processor, game_state, turn_manager):
+        """Test that 'roll --odds' reports stats without using the turn."""
+        player_id = "player_1"
+        other_player = "player_2"
+        game_state.add_player(player_id, "Alice")
+        game_state.add_player(other_player, "Bob")
+        turn_manager.add_player(player_id)
+        turn_manager.add_player(other_player)
+
+        # Bob can check odds even though it's Alice's turn
+        result = await action_processor.process_action(other_player, "roll", ["--odds", "2d6"])
+
+        assert result["success"] is True
+        details = result["result"]["details"]
+        assert (details["min"], details["max"], details["median"]) == (2, 12, 7)
+        assert turn_manager.get_current_player() == player_id
+
+    @pytest.mark.asyncio
+    async def test_roll_uses_player_stream(self, game_state, turn_manager, broadcast_callback):
+        """Test that rolls replay from the same master seed."""
+        game_state.add_player("player_1", "Alice")
+        processor = ActionProcessor(game_state, turn_manager, broadcast_callback, rng=RngStreams(11))
+
+        result = await processor._execute_roll("player_1", ["5d20"])
+
+        expected = roll_dice("5d20", RngStreams(11).stream("player_1"))
+        assert result["details"]["parts"] == expected[1]
+
+    @pytest.mark.asyncio
+    async def test_big_roll_sends_summary(self, game_state, turn_manager, broadcast_callback):
+        """Test that rolls above the threshold omit the parts list."""
+        game_state.add_player("player_1", "Alice")
+        processor = ActionProcessor(
+            game_state, turn_manager, broadcast_callback, roll_summary_threshold=10
+        )
+
+        small = await processor._execute_roll("player_1", ["10d6"])
+        big = await processor._execute_roll("player_1", ["11d6"])
+
+        assert len(small["details"]["parts"]) == 10
+        assert "parts" not in big["details"]
+        assert big["details"]["summary"]["dice"] == 11
+
+    @pytest.mark.asyncio
+    async def test_look_and_move_match_uncached_output(self, turn_manager, broadcast_callback):
+        """Test that look/move list locked exits and word empty rooms as before caching."""
+        world = World()
+        world.add("hall", "Hall", "A long hall.")
+        world.add("den", "Den", "A dead end.")
+        world.connect("hall", "north", "den", bidir=False)
+        world.add_exit("hall", "east", "den", locked=True)
+        world.start_room = "hall"
+        game_state = GameState(world)
+        game_state.add_player("player_1", "Alice")
+        processor = ActionProcessor(game_state, turn_manager, broadcast_callback)
+
+        look = await processor._execute_look("player_1")
+        assert look["result"] == "A long hall.\nExits: north,east"
+        assert look["details"]["exits"] == ["north", "east"]
+
+        move = await processor._execute_move("player_1", ["north"])
+        assert move["details"]["description"] == "A dead end."
+        assert move["details"]["exits"] == "No Exits"
+        look = await processor._execute_look("player_1")
+        assert look["result"] == "A dead end.\nExits: None"
+        assert look["details"]["exits"] == []
+
+    @pytest.mark.asyncio
+    async def test_too_many_dice_refused(self, game_state, turn_manager, broadcast_callback):
+        """Test that rolls over max_dice are refused before any dice are thrown."""
+        game_state.add_player("player_1", "Alice")
+        processor = ActionProcessor(game_state, turn_manager, broadcast_callback, max_dice=100)
+
+        await processor._execute_roll("player_1", ["50d6+50d6"])
+        with pytest.raises(ValueError, match="Too many dice"):
+            await processor._execute_roll("player_1", ["50d6+51d6"])
+        with pytest.raises(ValueError, match="Too many dice"):
+            await ActionProcessor(
+                game_state, turn_manager, broadcast_callback
+            )._execute_roll("player_1", ["2000000000d6"])
+
+    @pytest.mark.asyncio
+    async def test_rolls_are_audited(self, game_state, turn_manager, broadcast_callback, tmp_path):
+        """Test that rolls, including summarized ones, reach the audit log."""
+        game_state.add_player("player_1", "Alice")
+        log = RollAuditLog(str(tmp_path / "rolls.drl"))
+        processor = ActionProcessor(
+            game_state, turn_manager, broadcast_callback,
+            roll_summary_threshold=10, audit_log=log, game_id="table_1",
+        )
+
+        small = await processor._execute_roll("player_1", ["3d6"])
+        await processor._execute_roll("player_1", ["20d6"])
+        log.close()
+
+        records = RollLogReader(log.path).filter(game="table_1", player="player_1")
+        assert len(records) == 2
+        assert RollLogReader.parts(records[0]) == small["details"]["parts"]
+        assert int(records[1]["n_parts"]) == 20
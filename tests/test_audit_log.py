@@ -0,0 +1,130 @@
+# SPDX-License-Identifier: MIT
+"""Tests for the binary roll audit log."""
+
+import numpy as np
+import pytest
+
+from dicerealms.server.audit_log import (
+    MAX_PARTS,
+    RECORD_DTYPE,
+    RollAuditLog,
+    RollLogReader,
+    id_hash,
+)
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    """Path for a fresh audit log."""
+    return str(tmp_path / "rolls.drl")
+
+
+class TestRollAuditLog:
+    """Test suite for writing the audit log."""
+
+    def test_round_trip(self, log_path):
+        log = RollAuditLog(log_path)
+        log.record("g1", "player_1", "2d6+1", 8, [3, 4])
+        log.close()
+
+        reader = RollLogReader(log_path)
+        assert len(reader) == 1
+        rec = reader.records[0]
+        assert int(rec["total"]) == 8
+        assert int(rec["expr"]) == id_hash("2d6+1")
+        assert RollLogReader.parts(rec) == [3, 4]
+
+    def test_appends_to_existing_log(self, log_path):
+        for total in (1, 2):
+            log = RollAuditLog(log_path)
+            log.record("g1", "player_1", "1d6", total, [total])
+            log.close()
+        assert RollLogReader(log_path).records["total"].tolist() == [1, 2]
+
+    def test_long_rolls_truncate_parts(self, log_path):
+        log = RollAuditLog(log_path)
+        log.record("g1", "player_1", "40d6", 140, [4] * 40)
+        log.close()
+        rec = RollLogReader(log_path).records[0]
+        assert int(rec["n_parts"]) == 40
+        assert RollLogReader.parts(rec) == [4] * MAX_PARTS
+
+    def test_record_after_close_raises(self, log_path):
+        log = RollAuditLog(log_path)
+        log.close()
+        with pytest.raises(RuntimeError):
+            log.record("g1", "player_1", "1d6", 1, [1])
+
+    def test_rejects_foreign_file(self, log_path):
+        with open(log_path, "wb") as f:
+            f.write(b"not a roll log at all")
+        with pytest.raises(ValueError):
+            RollAuditLog(log_path)
+
+    def test_reopen_drops_partial_trailing_record(self, log_path):
+        log = RollAuditLog(log_path)
+        log.record("g1", "player_1", "1d6", 1, [1])
+        log.close()
+        with open(log_path, "ab") as f:
+            f.write(b"\xff" * (RECORD_DTYPE.itemsize // 2))
+
+        log = RollAuditLog(log_path)
+        log.record("g1", "player_1", "1d6", 2, [2])
+        log.close()
+        reader = RollLogReader(log_path)
+        assert reader.records["total"].tolist() == [1, 2]
+        assert RollLogReader.parts(reader.records[1]) == [2]
+
+    def test_bad_batch_does_not_stop_writer(self, log_path):
+        log = RollAuditLog(log_path)
+        # A total too big for the record fails while the batch is built.
+        log._write([(0, 0, 0, 0, 2**70, 1, [1])])
+        log.record("g1", "player_1", "1d6", 3, [3])
+        log.close()
+        assert RollLogReader(log_path).records["total"].tolist() == [3]
+
+
+class TestRollLogReader:
+    """Test suite for reading and filtering the audit log."""
+
+    def test_filter(self, log_path):
+        log = RollAuditLog(log_path)
+        for i in range(30):
+            log.record(f"g{i % 2}", f"player_{i % 3}", "1d20", i, [i])
+        log.close()
+
+        reader = RollLogReader(log_path)
+        assert len(reader.filter(game="g0")) == 15
+        assert len(reader.filter(player="player_1")) == 10
+        both = reader.filter(game="g0", player="player_0")
+        assert both["total"].tolist() == [0, 6, 12, 18, 24]
+        assert len(reader.filter(expression="2d6")) == 0
+
+    def test_time_window(self, log_path):
+        log = RollAuditLog(log_path)
+        log.record("g", "p", "1d6", 1, [1])
+        log.close()
+        ts = int(RollLogReader(log_path).records[0]["ts_ns"])
+        reader = RollLogReader(log_path)
+        assert len(reader.filter(since_ns=ts)) == 1
+        assert len(reader.filter(until_ns=ts)) == 0
+
+    def test_empty_log(self, log_path):
+        RollAuditLog(log_path).close()
+        reader = RollLogReader(log_path)
+        assert len(reader) == 0
+        assert len(reader.filter(player="p")) == 0
+
+    def test_ignores_partial_trailing_record(self, log_path):
+        log = RollAuditLog(log_path)
+        log.record("g", "p", "1d6", 5, [5])
+        log.close()
+        with open(log_path, "ab") as f:
+            f.write(b"\x00" * (RECORD_DTYPE.itemsize // 2))
+        assert len(RollLogReader(log_path)) == 1
+
+    def test_records_are_memory_mapped(self, log_path):
+        log = RollAuditLog(log_path)
+        log.record("g", "p", "1d6", 5, [5])
+        log.close()
+        assert isinstance(RollLogReader(log_path).records, np.memmap)
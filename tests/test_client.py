@@ -42,6 +42,8 @@ def send_callback():
     ("connected", "display_connected"),
     ("player_joined", "display_player_joined"),
     ("player_left", "display_player_left"),
+    ("player_renamed", "display_player_renamed"),
+    ("name_completions", "display_name_completions"),
     ("chat", "display_chat"),
     ("action_announcement", "display_action_announcement"),
     ("action_result", "display_action_result"),
@@ -71,6 +73,25 @@ async def test_send_message_serializes_json():
     await client.send_message({"type": "chat", "message": "hi"})
     assert client._ws.sent == ['{"type": "chat", "message": "hi"}']
 
+async def test_receive_loop_derives_turn_status():
+    client = GameClient("ws://localhost:8765", "Alice")
+    client.ui = MagicMock()
+    welcome = {"type": "welcome", "player_id": "p2", "message": "Welcome!"}
+    changed = {
+        "type": "turn_changed",
+        "current_player": "Bob",
+        "current_player_id": "p1",
+        "turn_in_progress": False,
+        "queue": ["p1", "p2"],
+    }
+    client._ws = FakeWebSocket([json.dumps(welcome), json.dumps(changed)])
+    await client._receive_loop()
+    status = client.ui.display.call_args[0][0]
+    assert status["type"] == "turn_status"
+    assert status["is_your_turn"] is False
+    assert status["waiting_for"] == "Bob"
+    assert status["queue_position"] == 1
+
 async def test_receive_loop_dispatches_to_ui():
     client = GameClient("ws://localhost:8765", "Alice")
     client.ui = MagicMock()
@@ -110,10 +131,13 @@ async def test_connect_sends_connect_message():
     ("chat hello world", {"type": "chat", "message": "hello world"}),
     ("roll 2d6",         {"type": "action", "action": "roll",  "args": ["2d6"]}),
     ("roll",             {"type": "action", "action": "roll",  "args": ["1d6"]}),
+    ("roll --odds 2d6",  {"type": "action", "action": "roll",  "args": ["--odds", "2d6"]}),
     ("move north",       {"type": "action", "action": "move",  "args": ["north"]}),
     ("move",             {"type": "action", "action": "move",  "args": [""]}),
     ("look",             {"type": "action", "action": "look",  "args": []}),
     ("help",             {"type": "action", "action": "help",  "args": []}),
+    ("names al",         {"type": "complete_name", "prefix": "al"}),
+    ("rename Al the Bold", {"type": "rename", "player_name": "Al the Bold"}),
 ])
 async def test_handle_command_sends_correct_message(send_callback, command, expected_message):
     handler = InputHandler("Alice", send_callback)
@@ -218,4 +242,12 @@ async def test_stats_command_in_input_handler(send_callback):
     assert result is True
     send_callback.assert_awaited_once_with(
         {"type": "action", "action": "stats", "args": []}
-    )
\ No newline at end of file
+    )
+
+
+async def test_connect_sends_game_id():
+    client = GameClient("ws://localhost:8765", "Alice", "tavern")
+    fake_ws = FakeWebSocket([])
+    with patch("dicerealms.client.client.websockets.connect", new_callable=AsyncMock, return_value=fake_ws):
+        await client.connect()
+    assert json.loads(fake_ws.sent[0])["game_id"] == "tavern"
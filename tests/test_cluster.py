@@ -0,0 +1,163 @@
+# SPDX-License-Identifier: MIT
+"""Tests for the multi-process dispatcher."""
+
+import asyncio
+import json
+import os
+import signal
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import websockets
+
+from dicerealms.server.cluster import Dispatcher, requested_game
+
+
+def fake_workers(dispatcher, ready=(True, True, True)):
+    for i, (worker, up) in enumerate(zip(dispatcher._workers, ready, strict=True)):
+        worker.process = MagicMock(pid=100 + i)
+        worker.process.is_alive.return_value = up
+        worker.port = 9000 + i if up else None
+        worker.last_report = time.monotonic()
+
+
+class TestRouting:
+    """Test suite for game-to-worker routing."""
+
+    @pytest.mark.parametrize(
+        "frame,game",
+        [
+            ('{"type": "connect", "player_name": "A", "game_id": "red"}', "red"),
+            ('{"type": "connect", "player_name": "A"}', "default"),
+            ('{"type": "connect", "player_name": "A", "game_id": 7}', "default"),
+            ('{"type": "chat", "game_id": "red"}', "default"),
+            ("not json", "default"),
+        ],
+    )
+    def test_requested_game(self, frame, game):
+        assert requested_game(frame) == game
+
+    def test_games_stick_to_least_loaded_worker(self):
+        d = Dispatcher(workers=3)
+        fake_workers(d)
+        d._workers[0].relayed = 5
+        d._workers[1].relayed = 1
+        d._workers[2].relayed = 3
+        assert d.route("red").worker.index == 1
+        d._workers[1].relayed = 9
+        assert d.route("red").worker.index == 1
+        assert d.route("blue").worker.index == 2
+
+    def test_skips_workers_that_are_not_ready(self):
+        d = Dispatcher(workers=3)
+        fake_workers(d, ready=(False, True, False))
+        d._workers[2].process.is_alive.return_value = True
+        assert {d.route(g).worker.index for g in "abcd"} == {1}
+        d._workers[1].last_report -= d.health_timeout + 1
+        assert d.route("e") is None
+
+    async def test_dead_worker_restarts_and_loses_its_games(self):
+        d = Dispatcher(workers=2)
+        fake_workers(d, ready=(True, True))
+        d._start = MagicMock()
+        red = d.route("red").worker
+        red.relayed = 1
+        d.route("blue")
+        red.process.is_alive.return_value = False
+        await d.check_workers()
+        d._start.assert_called_once_with(red)
+        assert "red" not in d._routes and "blue" in d._routes
+        loads = {w.index: w for w in d.load()}
+        assert loads[red.index].restarts == 1
+        assert loads[1 - red.index].games == 1
+
+    async def test_restart_waits_without_blocking(self):
+        d = Dispatcher(workers=1)
+        fake_workers(d, ready=(True,))
+        d._start = MagicMock()
+        worker = d._workers[0]
+        worker.last_report -= d.health_timeout + 1
+        exits_at = time.monotonic() + 0.3
+        worker.process.is_alive.side_effect = lambda: time.monotonic() < exits_at
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        await d.check_workers()
+        ticker.cancel()
+        worker.process.kill.assert_called_once()
+        d._start.assert_called_once_with(worker)
+        assert time.monotonic() >= exits_at
+        assert ticks > 5
+
+    def test_worker_settings(self):
+        d = Dispatcher(workers=2, server_kwargs={"seed": 10, "audit_log_path": "rolls.bin"})
+        assert d._worker_kwargs(1) == {"seed": 11, "audit_log_path": "rolls.bin.1"}
+        assert d.server_kwargs["seed"] == 10
+        with pytest.raises(ValueError):
+            Dispatcher(workers=0)
+
+
+async def received(ws, msg_type):
+    while True:
+        message = json.loads(await asyncio.wait_for(ws.recv(), 10))
+        if message["type"] == msg_type:
+            return message
+
+
+class TestDispatcher:
+    """End-to-end tests with real worker processes."""
+
+    async def test_relays_games_to_one_worker(self):
+        d = Dispatcher("127.0.0.1", 0, workers=2, report_interval=0.2, log_interval=3600)
+        bound = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(d.run(started=bound.set_result))
+        try:
+            port = await bound
+            deadline = time.monotonic() + 60
+            while not all(w.healthy for w in d.load()):
+                assert time.monotonic() < deadline
+                await asyncio.sleep(0.1)
+
+            clients = []
+            for name, game in [("Ann", "red"), ("Bo", "red"), ("Cy", "blue")]:
+                ws = await websockets.connect(f"ws://127.0.0.1:{port}")
+                await ws.send(json.dumps({"type": "connect", "player_name": name, "game_id": game}))
+                assert (await received(ws, "connected"))["game_id"] == game
+                clients.append(ws)
+            ann, bo, cy = clients
+
+            await ann.send(json.dumps({"type": "chat", "message": "hi"}))
+            assert (await received(bo, "chat"))["player"] == "Ann"
+            await ann.send(json.dumps({"type": "connect", "player_name": "Ann", "game_id": "blue"}))
+            assert "another game" in (await received(ann, "error"))["message"]
+            await ann.send('{"type": "\\u0063onnect", "player_name": "Ann", "game_id": "blue"}')
+            assert "another game" in (await received(ann, "error"))["message"]
+
+            red = d.route("red").worker
+            assert sum(w.relayed for w in d.load()) == 3
+            assert next(w for w in d.load() if w.index == red.index).relayed == 2
+
+            os.kill(red.process.pid, signal.SIGKILL)
+            with pytest.raises(websockets.exceptions.ConnectionClosed):
+                await asyncio.wait_for(ann.recv(), 10)
+            assert ann.close_code == 1011
+            # The socket can close before the killed process is reapable, so wait for the restart.
+            while not red.restarts or not all(w.healthy for w in d.load()):
+                assert time.monotonic() < deadline
+                await asyncio.sleep(0.1)
+            assert next(w for w in d.load() if w.index == red.index).restarts == 1
+            await cy.send(json.dumps({"type": "chat", "message": "still here"}))
+            assert (await received(cy, "chat"))["message"] == "still here"
+            for ws in clients:
+                await ws.close()
+        finally:
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
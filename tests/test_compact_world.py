@@ -0,0 +1,196 @@
+# SPDX-License-Identifier: MIT
+"""Tests for the array-backed CompactWorld."""
+import pytest
+
+from dicerealms.compact_world import CompactWorld
+from dicerealms.world import World, load_default_world
+
+ROOM_IDS = ["town_square", "tavern", "market", "north_road", "gate"]
+
+
+@pytest.fixture
+def default_world():
+    return load_default_world()
+
+
+@pytest.fixture
+def compact(default_world):
+    return CompactWorld.from_world(default_world)
+
+
+class TestCompactWorldParity:
+    """CompactWorld answers exactly like the dict-backed World."""
+
+    def test_look_and_neighbors_match(self, default_world, compact):
+        for room_id in ROOM_IDS:
+            assert compact.look(room_id) == default_world.look(room_id)
+            assert compact.neighbors(room_id) == default_world.neighbors(room_id)
+
+    @pytest.mark.parametrize("direction", ["north", "south", "east", "west", "up", "NORTH"])
+    def test_move_matches(self, default_world, compact, direction):
+        for room_id in ROOM_IDS:
+            assert compact.move(room_id, direction) == default_world.move(room_id, direction)
+
+    def test_move_to_missing_room_matches(self):
+        for w in (World(), CompactWorld()):
+            w.add("a", "Room A")
+            w.add_exit("a", "north", "ghost")
+            with pytest.raises(KeyError):
+                w.move("a", "north")
+
+    def test_find_path_matches(self, default_world, compact):
+        for a in ROOM_IDS:
+            for b in ROOM_IDS:
+                assert compact.find_path(a, b) == default_world.find_path(a, b)
+
+    def test_from_world_keeps_start_room(self, default_world):
+        default_world.start_room = "tavern"
+        assert CompactWorld.from_world(default_world).start_room == "tavern"
+
+    def test_to_dict_round_trip(self, compact):
+        restored = World.from_dict(compact.to_dict())
+        assert restored.look("north_road") == compact.look("north_road")
+        assert restored.require_room("north_road").exits["north"].description == (
+            "The gate is shut tight."
+        )
+
+    def test_from_dict_builds_compact(self, default_world):
+        cw = CompactWorld.from_dict(default_world.to_dict())
+        assert isinstance(cw, CompactWorld)
+        assert cw.find_path("market", "north_road") == [
+            "market", "tavern", "town_square", "north_road"
+        ]
+
+
+class TestCompactWorld:
+    """CompactWorld-specific behavior."""
+
+    def test_render_cached_per_room(self, compact):
+        render = compact.render("north_road")
+        assert compact.render("north_road") is render
+        compact.set_locked("north_road", "north", False)
+        assert compact.render("north_road").exits == ("north", "south")
+        compact.describe("north_road", description="Wind.")
+        assert "Wind." in compact.look("north_road")
+
+    def test_move_builds_no_views(self, compact, monkeypatch):
+        monkeypatch.setattr(compact, "_view", None)
+        assert compact.move("town_square", "north") == (
+            "north_road", "You move north to North Road."
+        )
+
+    @pytest.fixture
+    def world(self):
+        w = CompactWorld()
+        w.add("a", "Room A")
+        w.add("b", "Room B")
+        w.add("c", "Room C")
+        w.connect("a", "north", "b")
+        return w
+
+    def test_missing_room(self, world):
+        assert not world.has_room("zzz")
+        assert world.current_room("zzz") is None
+        with pytest.raises(KeyError):
+            world.neighbors("zzz")
+
+    def test_duplicate_room_raises(self, world):
+        with pytest.raises(ValueError):
+            world.add("a", "Again")
+
+    def test_exit_target_is_not_a_room_until_added(self, world):
+        world.add_exit("c", "up", "attic")
+        assert not world.has_room("attic")
+        world.add("attic", "Attic")
+        assert world.move("c", "up") == ("attic", "You move up to Attic.")
+
+    def test_add_exit_replaces_same_direction(self, world):
+        world.add_exit("a", "north", "c", description="A new way")
+        exits = world.require_room("a").exits
+        assert exits["north"].to_room == "c"
+        assert exits["north"].description == "A new way"
+        assert len(exits) == 1
+
+    def test_set_locked_toggles(self, world):
+        world.set_locked("a", "north")
+        assert world.move("a", "north") == (None, "north is locked.")
+        assert world.find_path("a", "b") is None
+        world.set_locked("a", "north", False)
+        assert world.find_path("a", "b") == ["a", "b"]
+
+    def test_set_locked_missing_exit_raises(self, world):
+        with pytest.raises(KeyError):
+            world.set_locked("a", "west")
+
+    def test_interleaved_mutation_and_queries(self, world):
+        assert world.neighbors("a") == {"north": "b"}
+        world.connect("b", "east", "c")
+        world.set_locked("b", "east")
+        world.add("d", "Room D")
+        world.connect("c", "down", "d")
+        assert world.neighbors("b") == {"south": "a"}
+        assert world.find_path("a", "d") is None
+        world.set_locked("b", "east", False)
+        assert world.find_path("a", "d") == ["a", "b", "c", "d"]
+
+    def test_room_added_after_a_path_query(self, world):
+        world.connect("a", "east", "c")
+        assert world.find_path("a", "b") == ["a", "b"]
+        world.add("d", "Room D")
+        assert world.find_path("a", "d") is None
+        assert world.find_path("d", "a") is None
+
+    def test_components_skip_exit_only_ids(self, world):
+        world.add_exit("c", "up", "ghost")
+        index = world.build_components()
+        assert index.count == 2
+        assert index.component("ghost") is None
+        world.add("ghost", "Ghost")
+        assert index.connected("c", "ghost")
+
+    def test_bulk_exits_with_an_index_are_merged_once(self, world):
+        index = world.build_components()
+        for room_id in "abc":
+            world.add_exit(room_id, "down", "a")
+            world.add_exit(room_id, "up", "b")
+        world.add_exit("a", "north", "c")
+        assert index.connected("a", "c")
+        # Replace staged exits before they are merged
+        for d in ("up", "down"):
+            world.add_exit("c", d, "c")
+        world.add_exit("a", "north", "b")
+        assert len(world._pending) == 10
+        assert not index.connected("a", "c")
+        assert index.connected("a", "b")
+
+    def test_custom_directions(self, world):
+        world.add_exit("a", "portal", "c")
+        assert world.move("a", "portal")[0] == "c"
+
+    def test_room_views_are_snapshots(self, world):
+        room = world.require_room("a")
+        room.add_exit("east", "c")
+        assert "east" not in world.neighbors("a")
+
+    def test_large_grid_path(self):
+        w = CompactWorld()
+        size = 100
+        for y in range(size):
+            for x in range(size):
+                w.add(f"{x},{y}", f"Cell {x},{y}")
+        for y in range(size):
+            for x in range(size):
+                if x + 1 < size:
+                    w.connect(f"{x},{y}", "east", f"{x + 1},{y}")
+                if y + 1 < size:
+                    w.connect(f"{x},{y}", "south", f"{x},{y + 1}")
+        path = w.find_path("0,0", f"{size - 1},{size - 1}")
+        assert len(path) == 2 * size - 1
+
+    def test_path_cache_invalidated_by_lock(self, world):
+        assert world.find_path("a", "b") == ["a", "b"]
+        assert world.find_path("a", "b") == ["a", "b"]
+        world.set_locked("a", "north")
+        assert world.find_path("a", "b") is None
+        stats = world.path_cache_stats()
+        assert (stats.hits, stats.invalidations) == (1, 1)
@@ -0,0 +1,153 @@
+# SPDX-License-Identifier: MIT
+"""Tests for the open-exit region index."""
+
+import random
+
+import pytest
+
+from dicerealms.compact_world import CompactWorld
+from dicerealms.mapped_world import MappedWorld, compile_world
+from dicerealms.world import World, load_default_world
+
+
+def grid_world(n: int, cls=World) -> World:
+    w = cls(title="Grid")
+    for y in range(n):
+        for x in range(n):
+            w.add(f"r{x}_{y}", f"Room {x},{y}")
+    for y in range(n):
+        for x in range(n):
+            if x + 1 < n:
+                w.connect(f"r{x}_{y}", "east", f"r{x + 1}_{y}")
+            if y + 1 < n:
+                w.connect(f"r{x}_{y}", "south", f"r{x}_{y + 1}")
+    return w
+
+
+def regions(world: World) -> set[frozenset[str]]:
+    """Brute-force regions: undirected search over open exits."""
+    links: dict[str, set[str]] = {r.id: set() for r in world.rooms()}
+    for room in world.rooms():
+        for to in room.neighbor().values():
+            if to in links:
+                links[room.id].add(to)
+                links[to].add(room.id)
+    out, seen = set(), set()
+    for start in links:
+        if start in seen:
+            continue
+        part, stack = {start}, [start]
+        while stack:
+            for u in links[stack.pop()] - part:
+                part.add(u)
+                stack.append(u)
+        seen |= part
+        out.add(frozenset(part))
+    return out
+
+
+def indexed(world: World) -> set[frozenset[str]]:
+    index = world.components
+    by_label: dict[int, set[str]] = {}
+    for room in world.rooms():
+        by_label.setdefault(index.component(room.id), set()).add(room.id)
+    return {frozenset(p) for p in by_label.values()}
+
+
+class TestComponentIndex:
+    """Test suite for ComponentIndex."""
+
+    def test_default_world(self):
+        w = load_default_world()
+        index = w.components
+        assert index.count == 2
+        assert index.connected("market", "north_road")
+        assert not index.connected("town_square", "gate")
+        assert index.size("market") == 4
+        assert index.rooms("gate") == ["gate"]
+        assert index.unlock_merges("north_road", "north")
+        assert not index.unlock_merges("town_square", "south")
+        with pytest.raises(KeyError):
+            index.unlock_merges("market", "up")
+
+    def test_lock_toggles_split_and_merge(self):
+        w = grid_world(3)
+        index = w.build_components()
+        w.set_locked("r0_0", "east")
+        w.set_locked("r1_0", "west")
+        assert index.count == 1
+        w.set_locked("r0_0", "south")
+        w.set_locked("r0_1", "north")
+        assert index.count == 2
+        assert index.rooms("r0_0") == ["r0_0"]
+        assert index.size("r1_1") == 8
+        assert index.splits == 1
+
+        w.set_locked("r0_1", "north", False)
+        assert index.count == 1
+        assert index.merges == 1
+        assert index.builds == 1
+
+    def test_new_rooms_and_dangling_exits(self):
+        w = load_default_world()
+        index = w.components
+        w.add_exit("market", "down", "cellar")
+        assert index.component("cellar") is None
+        w.add("cellar", "Cellar")
+        assert index.connected("market", "cellar")
+        w.add("shed", "Shed")
+        assert index.count == 3
+        assert index.size("shed") == 1
+        assert index.builds == 1
+
+    @pytest.mark.parametrize("cls", [World, CompactWorld, MappedWorld])
+    def test_exit_to_missing_room_before_build(self, cls, tmp_path):
+        w = grid_world(2)
+        w.add_exit("r0_0", "down", "ghost")
+        if cls is MappedWorld:
+            path = str(tmp_path / "grid.drw")
+            compile_world(w, path)
+            w = MappedWorld(path)
+        elif cls is CompactWorld:
+            w = CompactWorld.from_world(w)
+        index = w.build_components()
+        assert index.count == 1
+        w.add("ghost", "Ghost")
+        assert index.count == 1
+        assert index.connected("r1_1", "ghost")
+        assert w.find_path("r1_1", "ghost") is not None
+
+    @pytest.mark.parametrize("cls", [World, CompactWorld])
+    def test_random_edits_match_brute_force(self, cls):
+        w = grid_world(6, cls)
+        index = w.build_components()
+        index._max_edits = 40  # exercise overlay compaction
+        rng = random.Random(3)
+        ids = [r.id for r in w.rooms()]
+        for step in range(300):
+            room_id = rng.choice(ids)
+            action = rng.random()
+            exits = list(w.require_room(room_id).exits)
+            if action < 0.7 and exits:
+                w.set_locked(room_id, rng.choice(exits), rng.random() < 0.6)
+            elif action < 0.9:
+                w.add_exit(room_id, rng.choice(["up", "down"]), rng.choice(ids))
+            else:
+                new_id = f"extra{step}"
+                w.add(new_id, "Extra")
+                ids.append(new_id)
+            if step % 10 == 0:
+                assert indexed(w) == regions(w)
+                assert index.count == len(regions(w))
+        assert indexed(w) == regions(w)
+        assert index.builds == 1
+
+    def test_mapped_world(self, tmp_path):
+        path = str(tmp_path / "grid.drw")
+        compile_world(grid_world(4), path)
+        w = MappedWorld(path)
+        assert w.components.count == 1
+        for room_id, d in (("r0_0", "east"), ("r0_0", "south"), ("r1_0", "west"), ("r0_1", "north")):
+            w.set_locked(room_id, d)
+        assert not w.components.connected("r1_0", "r0_0")
+        assert w.components.count == 2
@@ -1,8 +1,19 @@
 # SPDX-License-Identifier: MIT
 """Tests for core dice rolling logic."""
+import itertools
+
+import numpy as np
 import pytest
 
-from dicerealms.core import roll_dice
+from dicerealms.core import (
+    RngStreams,
+    compile_dice,
+    dice_stats,
+    roll_dice,
+    roll_dice_batch,
+    roll_dice_many,
+    roll_dice_summary,
+)
 
 
 class TestRollDice:
@@ -51,4 +62,263 @@ class TestRollDice:
 
     def test_case_insensitive(self):
         total, parts = roll_dice("2D6")
-        assert len(parts) == 2
\ No newline at end of file
+        assert len(parts) == 2
+
+
+class TestRollDiceBatch:
+    """
+    Test Suite for roll_dice_batch / roll_dice_many.
+    """
+
+    def test_shapes(self):
+        batch = roll_dice_batch("3d6", 1000)
+        assert len(batch) == 1000
+        assert batch.totals.shape == (1000,)
+        assert batch.parts.shape == (1000, 3)
+
+    def test_parts_within_die_range(self):
+        batch = roll_dice_batch("2d20", 5000)
+        assert batch.parts.min() >= 1
+        assert batch.parts.max() <= 20
+
+    def test_totals_include_modifier(self):
+        batch = roll_dice_batch("4d8-2", 500)
+        assert np.array_equal(batch.totals, batch.parts.sum(axis=1) - 2)
+
+    def test_small_dice_use_compact_dtype(self):
+        assert roll_dice_batch("4d6", 10).parts.dtype == np.uint8
+        assert roll_dice_batch("1d1000", 10).parts.dtype == np.uint16
+
+    def test_zero_rolls(self):
+        batch = roll_dice_batch("1d6", 0)
+        assert len(batch) == 0
+
+    def test_negative_count_raises(self):
+        with pytest.raises(ValueError):
+            roll_dice_batch("1d6", -1)
+
+    def test_invalid_expression_raises(self):
+        with pytest.raises(ValueError):
+            roll_dice_batch("2x6", 10)
+
+    def test_many_preserves_order(self):
+        batches = roll_dice_many(["1d4", "2d6+1"], n=100)
+        assert [b.expression for b in batches] == ["1d4", "2d6+1"]
+        assert batches[0].parts.shape == (100, 1)
+        assert batches[1].totals.min() >= 3
+
+    def test_roll_dice_returns_python_ints(self):
+        total, parts = roll_dice("2d6")
+        assert type(total) is int
+        assert all(type(p) is int for p in parts)
+
+
+class TestCompileDice:
+    """
+    Test Suite for the dice-expression compiler.
+    """
+
+    def test_multiple_terms(self):
+        expr = compile_dice("2d6+1d4+3")
+        assert [(t.count, t.sides) for t in expr.terms] == [(2, 6), (1, 4)]
+        assert expr.modifier == 3
+        batch = expr.roll_batch(2000)
+        assert batch.parts.shape == (2000, 3)
+        assert np.array_equal(batch.totals, batch.parts.sum(axis=1) + 3)
+
+    def test_subtracted_dice_term(self):
+        batch = roll_dice_batch("1d20-1d4", 2000)
+        assert np.array_equal(batch.totals, batch.parts[:, 0].astype(int) - batch.parts[:, 1])
+
+    def test_implicit_count_and_percentile(self):
+        assert compile_dice("d20").terms[0].count == 1
+        assert compile_dice("d%").terms[0].sides == 100
+
+    def test_keep_highest(self):
+        batch = roll_dice_batch("4d6kh3", 2000)
+        expected = np.sort(batch.parts, axis=1)[:, 1:].sum(axis=1)
+        assert np.array_equal(batch.totals, expected)
+
+    def test_keep_lowest_and_drop_lowest(self):
+        assert compile_dice("4d6kl1").terms[0].keep_high is False
+        term = compile_dice("4d6dl1").terms[0]
+        assert (term.keep, term.keep_high) == (3, True)
+
+    def test_keep_out_of_range_raises(self):
+        with pytest.raises(ValueError):
+            compile_dice("2d6kh3")
+
+    def test_exploding_dice(self):
+        batch = roll_dice_batch("3d4!", 5000)
+        assert batch.parts.min() >= 1
+        # A die showing its max face always explodes, so a bare 4 never appears.
+        assert not (batch.parts == 4).any()
+        assert batch.parts.max() > 4
+
+    def test_advantage_keeps_better_roll(self):
+        batch = roll_dice_batch("d20adv", 2000)
+        assert batch.parts.shape == (2000, 2)
+        assert np.array_equal(batch.totals, batch.parts.max(axis=1))
+
+    def test_disadvantage_keeps_worse_roll(self):
+        batch = roll_dice_batch("d20dis", 2000)
+        assert np.array_equal(batch.totals, batch.parts.min(axis=1))
+
+    def test_constant_only_raises(self):
+        with pytest.raises(ValueError):
+            compile_dice("5")
+
+    def test_compiled_once_per_expression(self):
+        compile_dice.cache_clear()
+        first = compile_dice("3d8+2")
+        assert compile_dice("3d8+2") is first
+        assert compile_dice.cache_info().hits == 1
+
+
+class TestDiceStats:
+    """
+    Test Suite for exact dice distributions.
+    """
+
+    def test_2d6_distribution(self):
+        stats = dice_stats("2d6")
+        assert (stats.min_total, stats.max_total) == (2, 12)
+        assert stats.probability(7) == pytest.approx(6 / 36)
+        assert stats.mean == pytest.approx(7.0)
+        assert stats.variance == pytest.approx(35 / 6)
+
+    def test_modifier_shifts_support(self):
+        stats = dice_stats("1d20+5")
+        assert (stats.min_total, stats.max_total) == (6, 25)
+        assert stats.at_least(21) == pytest.approx(0.25)
+
+    def test_keep_highest_matches_known_mean(self):
+        # 4d6 drop lowest has a well-known mean of 15869/1296.
+        assert dice_stats("4d6kh3").mean == pytest.approx(15869 / 1296)
+
+    def test_keep_lowest_matches_enumeration(self):
+        stats = dice_stats("5d4kl2")
+        totals = [sum(sorted(r)[:2]) for r in itertools.product(range(1, 5), repeat=5)]
+        for total in range(2, 9):
+            assert stats.probability(total) == pytest.approx(totals.count(total) / 4**5)
+
+    def test_many_dice_few_kept(self):
+        stats = dice_stats("2000d6kh3")
+        assert (stats.min_total, stats.max_total) == (3, 18)
+        assert stats.pmf.sum() == pytest.approx(1.0)
+        assert stats.at_least(18) == pytest.approx(1.0)
+
+    def test_too_many_kept_dice_raises(self):
+        with pytest.raises(ValueError):
+            dice_stats("1000d20kh500")
+
+    def test_too_many_totals_raises(self):
+        with pytest.raises(ValueError, match="Too many totals"):
+            dice_stats("2000000000d6")
+        with pytest.raises(ValueError, match="Too many kept"):
+            dice_stats("2d2000000000kh1")
+        with pytest.raises(ValueError, match="Too many totals"):
+            dice_stats("+".join(["1000d600"] * 3))
+
+    def test_advantage(self):
+        stats = dice_stats("d20adv")
+        assert stats.probability(20) == pytest.approx(39 / 400)
+        assert stats.probability(1) == pytest.approx(1 / 400)
+
+    def test_negative_term(self):
+        stats = dice_stats("1d6-1d6")
+        assert (stats.min_total, stats.max_total) == (-5, 5)
+        assert stats.mean == pytest.approx(0.0)
+
+    def test_exploding_mean(self):
+        # An exploding dS has mean (S + 1) / 2 * S / (S - 1).
+        assert dice_stats("1d6!").mean == pytest.approx(4.2)
+
+    def test_hundreds_of_dice(self):
+        stats = dice_stats("300d6")
+        assert stats.mean == pytest.approx(1050.0)
+        assert stats.variance == pytest.approx(300 * 35 / 12)
+        assert stats.pmf.sum() == pytest.approx(1.0)
+
+    def test_percentiles(self):
+        stats = dice_stats("2d6")
+        assert stats.percentile(0) == 2
+        assert stats.percentile(50) == 7
+        assert stats.percentile(100) == 12
+
+    def test_memoized_and_read_only(self):
+        stats = dice_stats("3d8")
+        assert dice_stats("3d8") is stats
+        with pytest.raises(ValueError):
+            stats.pmf[0] = 1.0
+
+    def test_matches_sampling(self):
+        stats = dice_stats("2d6+1d4kh1+1")
+        batch = roll_dice_batch("2d6+1d4kh1+1", 100_000)
+        assert float(batch.totals.mean()) == pytest.approx(stats.mean, abs=0.05)
+
+
+class TestRngStreams:
+    """
+    Test Suite for seeded RNG streams.
+    """
+
+    def test_same_seed_replays(self):
+        a = roll_dice_batch("4d6", 100, rng=RngStreams(7).stream("game", "p1"))
+        b = roll_dice_batch("4d6", 100, rng=RngStreams(7).stream("game", "p1"))
+        assert np.array_equal(a.parts, b.parts)
+
+    def test_streams_independent_of_creation_order(self):
+        first = RngStreams(7)
+        second = RngStreams(7)
+        second.stream("game", "p2")
+        assert roll_dice("10d20", first.stream("game", "p1")) == roll_dice(
+            "10d20", second.stream("game", "p1")
+        )
+
+    def test_distinct_paths_differ(self):
+        streams = RngStreams(7)
+        a = roll_dice_batch("10d20", 10, rng=streams.stream("p1"))
+        b = roll_dice_batch("10d20", 10, rng=streams.stream("p2"))
+        assert not np.array_equal(a.parts, b.parts)
+
+    def test_stream_is_cached_until_forgotten(self):
+        streams = RngStreams(7)
+        rng = streams.stream("p1")
+        assert streams.stream("p1") is rng
+        streams.forget("p1")
+        assert streams.stream("p1") is not rng
+
+    def test_unseeded_picks_a_seed(self):
+        assert isinstance(RngStreams().seed, int)
+
+
+class TestRollDiceSummary:
+    """
+    Test Suite for streaming (summary) rolls.
+    """
+
+    def test_big_roll_counts_every_die(self):
+        summary = roll_dice_summary("100000d6")
+        assert summary.dice == 100000
+        assert sum(summary.faces.values()) == 100000
+        assert summary.total == sum(face * n for face, n in summary.faces.items())
+        assert (summary.min_face, summary.max_face) == (1, 6)
+
+    def test_modifier_applied(self):
+        summary = roll_dice_summary("10d4+7")
+        assert summary.total == sum(f * n for f, n in summary.faces.items()) + 7
+
+    def test_keep_highest_from_counts(self):
+        summary = roll_dice_summary("5000d6kh3")
+        assert summary.total == 18
+
+    def test_same_stream_as_batch_for_plain_dice(self):
+        summary = roll_dice_summary("50d8", RngStreams(5).stream("x"))
+        _, parts = roll_dice("50d8", RngStreams(5).stream("x"))
+        assert summary.total == sum(parts)
+
+    def test_to_dict_is_json_friendly(self):
+        data = roll_dice_summary("3d6").to_dict()
+        assert data["dice"] == 3
+        assert all(isinstance(k, str) for k in data["faces"])
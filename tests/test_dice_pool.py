@@ -0,0 +1,107 @@
+# SPDX-License-Identifier: MIT
+"""Tests for the pre-generated dice pool."""
+import numpy as np
+import pytest
+
+from dicerealms.core import RngStreams, roll_dice
+from dicerealms.dice_pool import DicePool, _reset_after_fork
+
+
+def draw_many(pool, rounds=2000):
+    out = []
+    for i in range(rounds):
+        out.append(pool.integers(1, 6, size=i % 5 + 1, dtype=np.uint8, endpoint=True))
+        if i % 400 == 0:
+            out.append(pool.integers(1, 6, size=500, dtype=np.uint8, endpoint=True))
+    return np.concatenate(out)
+
+
+class TestDicePool:
+
+    def test_faces_in_range(self):
+        pool = DicePool(np.random.default_rng(1), capacity=64, background=False)
+        faces = draw_many(pool)
+        assert faces.min() >= 1
+        assert faces.max() <= 6
+
+    def test_small_draws_hit(self):
+        pool = DicePool(np.random.default_rng(1), capacity=64, background=False)
+        for _ in range(100):
+            pool.integers(1, 20, size=2, dtype=np.uint8, endpoint=True)
+        stats = pool.stats()[20]
+        assert stats.hits == 100
+        assert stats.misses == 0
+        assert stats.refills > 0
+        assert pool.hit_rate == 1.0
+
+    def test_large_draws_bypass(self):
+        pool = DicePool(np.random.default_rng(1), capacity=64, background=False)
+        faces = pool.integers(1, 6, size=1000, dtype=np.uint8, endpoint=True)
+        assert len(faces) == 1000
+        assert pool.stats()[6].bypassed == 1
+
+    def test_unpooled_sides_delegate(self):
+        pool = DicePool(np.random.default_rng(1), capacity=64, background=False)
+        faces = pool.integers(1, 7, size=10, dtype=np.uint8, endpoint=True)
+        assert faces.max() <= 7
+        assert 7 not in pool.stats()
+
+    def test_returns_requested_dtype(self):
+        pool = DicePool(np.random.default_rng(1), capacity=64, background=False)
+        assert pool.integers(1, 6, size=3, dtype=np.int32, endpoint=True).dtype == np.int32
+
+    def test_replay_independent_of_refill_timing(self):
+        sync = DicePool(np.random.default_rng(9), capacity=64, background=False)
+        threaded = DicePool(np.random.default_rng(9), capacity=64, background=True)
+        assert np.array_equal(draw_many(sync), draw_many(threaded))
+
+    def test_replay_with_draws_over_a_block(self):
+        # Default capacity: draws up to the capacity could be served from a full buffer.
+        def draws(pool):
+            out = []
+            for i in range(40):
+                out.append(pool.integers(1, 6, size=(900, 2000, 3)[i % 3], dtype=np.uint8, endpoint=True))
+                out.append(np.array(pool.faces(6, 2000)))
+            return np.concatenate(out)
+
+        sync = DicePool(np.random.default_rng(5), background=False)
+        threaded = DicePool(np.random.default_rng(5), background=True)
+        assert np.array_equal(draws(sync), draws(threaded))
+        assert sync.stats()[6].bypassed == 40 + 13
+
+    def test_face_lists_match_arrays(self):
+        arrays = DicePool(np.random.default_rng(4), capacity=64, background=False)
+        lists = DicePool(np.random.default_rng(4), capacity=64, background=False)
+        for i in range(300):
+            m = i % 7 + 1
+            expected = arrays.integers(1, 20, size=m, dtype=np.uint8, endpoint=True).tolist()
+            assert lists.faces(20, m) == expected
+        assert lists.faces(7, 2) is None
+
+    def test_fork_clears_queued_refills(self):
+        pool = DicePool(np.random.default_rng(1), capacity=64)
+        side = pool._sides[20]
+        side.queued = True
+        side.lock.acquire()
+        _reset_after_fork()
+        assert not side.queued
+        assert side.lock.acquire(blocking=False)
+        side.lock.release()
+
+    def test_invalid_capacity_raises(self):
+        with pytest.raises(ValueError):
+            DicePool(capacity=0)
+
+
+class TestPooledStreams:
+
+    def test_pooled_streams_replay(self):
+        a = RngStreams(3, pool_capacity=64).stream("p1")
+        b = RngStreams(3, pool_capacity=64).stream("p1")
+        assert [roll_dice("2d6", a) for _ in range(50)] == [roll_dice("2d6", b) for _ in range(50)]
+
+    def test_pool_stats_aggregate(self):
+        streams = RngStreams(3, pool_capacity=64)
+        roll_dice("1d20", streams.stream("p1"))
+        roll_dice("1d20", streams.stream("p2"))
+        assert streams.pool_stats()[20].hits == 2
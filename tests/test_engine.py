@@ -2,7 +2,8 @@
 """Tests for GameEngine command handling."""
 import pytest
 
-from dicerealms.engine import GameEngine
+from dicerealms.core import RngStreams
+from dicerealms.engine import GameEngine, _render_plain
 from dicerealms.player import Player
 from dicerealms.world import load_default_world
 
@@ -56,6 +57,30 @@ class TestGameEngine:
         result = engine.handle("roll notdice")
         assert result["type"] == "error"
 
+    def test_roll_with_seeded_rng_replays(self):
+        first = GameEngine(rng=RngStreams(3).stream("solo"))
+        second = GameEngine(rng=RngStreams(3).stream("solo"))
+        rolls = [first.handle("roll 3d6")["parts"] for _ in range(5)]
+        assert rolls == [second.handle("roll 3d6")["parts"] for _ in range(5)]
+
+    def test_big_roll_is_summarized(self, engine):
+        result = engine.handle("roll 5000d6")
+        assert result["type"] == "roll"
+        assert "parts" not in result
+        assert result["summary"]["dice"] == 5000
+
+    def test_roll_odds(self, engine):
+        result = engine.handle("roll --odds 2d6")
+        assert result["type"] == "odds"
+        assert result["min"] == 2
+        assert result["max"] == 12
+        assert result["median"] == 7
+
+    def test_roll_odds_no_expr(self, engine):
+        result = engine.handle("roll --odds")
+        assert result["type"] == "error"
+        assert "usage" in result["message"].lower()
+
     def test_quit_returns_sentinel(self, engine):
         result = engine.handle("quit")
         assert result["type"] == "quit"
@@ -71,6 +96,12 @@ class TestGameEngine:
         assert "Town Square" in result["room"]
         assert len(result["exits"]) > 0
 
+    def test_look_uses_cached_render(self, full_engine):
+        first = full_engine.handle("look")
+        second = full_engine.handle("look")
+        assert first["text"] is second["text"]
+        assert _render_plain(first) is first["text"]
+
     def test_move_no_args(self, full_engine):
         result = full_engine.handle("move")
         assert result["type"] == "error"
@@ -2,6 +2,7 @@
 """Tests for GameState class."""
 
 
+from dicerealms.procgen import GridGenerator, build_world
 from dicerealms.server.game_state import GameState, PlayerState
 
 
@@ -51,6 +52,15 @@ class TestGameState:
         assert "player_1" in gs.players
         assert gs.players["player_1"] == player
 
+    def test_add_player_in_start_room(self):
+        """Test that players spawn in the world's start room."""
+        world = build_world(GridGenerator(1, 3, 3))
+        gs = GameState(world)
+        player = gs.add_player("player_1", "Alice")
+
+        assert player.room == world.start_room
+        assert gs.get_room(player.room) is not None
+
     def test_remove_player(self):
         """Test removing a player from game state."""
         gs = GameState()
@@ -95,6 +105,52 @@ class TestGameState:
         players = gs.get_players_in_room("market")
         assert players == []
 
+    def test_room_occupancy_follows_moves(self):
+        """Test the occupancy index through join, move and leave."""
+        gs = GameState()
+        gs.add_player("player_1", "Alice")
+        gs.add_player("player_2", "Bob")
+        gs.move_player("player_1", "north")
+
+        assert gs.room_population("town_square") == 1
+        assert gs.room_population("north_road") == 1
+        assert [p.name for p in gs.iter_players_in_room("north_road")] == ["Alice"]
+        assert sorted(gs.occupied_rooms()) == ["north_road", "town_square"]
+
+        gs.remove_player("player_2")
+        assert gs.room_population("town_square") == 0
+        assert list(gs.occupied_rooms()) == ["north_road"]
+
+    def test_find_player_by_name(self):
+        """Test name lookups ignore case and follow renames and leaves."""
+        gs = GameState()
+        gs.add_player("player_1", "Alice")
+        gs.add_player("player_2", "Alfred")
+
+        assert gs.find_player("ALICE").player_id == "player_1"
+        assert gs.complete_name("al") == ["Alfred", "Alice"]
+
+        assert gs.rename_player("player_1", "Beth")
+        assert gs.find_player("alice") is None
+        assert gs.find_player("beth").name == "Beth"
+        assert not gs.rename_player("nobody", "X")
+
+        gs.remove_player("player_2")
+        assert gs.players_with_prefix("al") == []
+
+    def test_add_player_twice(self):
+        """Test re-adding a player keeps one entry, renamed if needed."""
+        gs = GameState()
+        first = gs.add_player("player_1", "Alice")
+        assert gs.add_player("player_1", "Alice") is first
+        assert gs.add_player("player_1", "Ally") is first
+        assert gs.names.lookup("ally") == ["player_1"]
+        assert gs.names.lookup("alice") == []
+        assert gs.room_population(first.room) == 1
+        gs.remove_player("player_1")
+        assert gs.room_population(first.room) == 0
+        assert gs.complete_name("al") == []
+
     def test_move_player_success(self):
         """Test successfully moving a player."""
         gs = GameState()
@@ -31,6 +31,7 @@ async def two_player_server():
     server.turn_manager.add_player(p2_id)
     await server.send_to_client(p2_id, {"type": "welcome", "player_id": p2_id, "message": "Welcome!"})
     await server.handle_connect(p2_id, {"type": "connect", "player_name": "Bob"})
+    await server.flush()
 
     return server, p1_id, p2_id, ws1, ws2
 
@@ -54,6 +55,7 @@ class TestTwoPlayerFlow:
         ws2.send.reset_mock()
 
         await server.handle_action(p1_id, {"type": "action", "action": "roll", "args": ["1d6"]})
+        await server.flush()
 
         assert any(m["type"] == "action_announcement" for m in get_messages(ws1))
         assert any(m["type"] == "action_announcement" for m in get_messages(ws2))
@@ -64,6 +66,7 @@ class TestTwoPlayerFlow:
         ws2.send.reset_mock()
 
         await server.handle_action(p1_id, {"type": "action", "action": "roll", "args": ["1d6"]})
+        await server.flush()
 
         assert any(m["type"] == "action_result" for m in get_messages(ws1))
         assert any(m["type"] == "action_result" for m in get_messages(ws2))
@@ -73,6 +76,7 @@ class TestTwoPlayerFlow:
         ws2.send.reset_mock()
 
         await server.handle_action(p1_id, {"type": "action", "action": "roll", "args": ["1d6"]})
+        await server.flush()
 
         types = [m["type"] for m in get_messages(ws2)]
         assert types.index("action_announcement") < types.index("action_result")
@@ -81,6 +85,7 @@ class TestTwoPlayerFlow:
         server, p1_id, p2_id, ws1, ws2 = two_player_server
 
         await server.handle_action(p1_id, {"type": "action", "action": "roll", "args": ["1d6"]})
+        await server.flush()
 
         assert server.turn_manager.get_current_player() == p2_id
 
@@ -90,6 +95,7 @@ class TestTwoPlayerFlow:
 
         # Bob tries to act when it's Alice's turn
         await server.handle_action(p2_id, {"type": "action", "action": "roll", "args": ["1d6"]})
+        await server.flush()
 
         msgs = get_messages(ws2)
         assert any(m["type"] == "error" and "not your turn" in m["message"].lower() for m in msgs)
@@ -100,6 +106,7 @@ class TestTwoPlayerFlow:
         ws2.send.reset_mock()
 
         await server.handle_chat(p1_id, {"type": "chat", "message": "Hello!"})
+        await server.flush()
 
         assert any(m["type"] == "chat" and m["message"] == "Hello!" for m in get_messages(ws1))
         assert any(m["type"] == "chat" and m["message"] == "Hello!" for m in get_messages(ws2))
@@ -110,6 +117,7 @@ class TestTwoPlayerFlow:
         ws2.send.reset_mock()
 
         await server.handle_action(p1_id, {"type": "action", "action": "roll", "args": ["1d6"]})
+        await server.flush()
 
-        assert any(m["type"] == "turn_status" for m in get_messages(ws1))
-        assert any(m["type"] == "turn_status" for m in get_messages(ws2))
+        assert any(m["type"] == "turn_changed" for m in get_messages(ws1))
+        assert any(m["type"] == "turn_changed" for m in get_messages(ws2))
@@ -0,0 +1,189 @@
+# SPDX-License-Identifier: MIT
+"""Tests for compiled, memory-mapped world files."""
+
+import random
+
+import pytest
+
+from dicerealms.mapped_world import MappedWorld, compile_world
+from dicerealms.world import Room, World, load_default_world
+from dicerealms.world_io import load_world, save_world
+
+
+def grid_world(n: int) -> World:
+    w = World(title="Grid")
+    for y in range(n):
+        for x in range(n):
+            w.add(f"r{x}_{y}", f"Room {x},{y}")
+    for y in range(n):
+        for x in range(n):
+            if x + 1 < n:
+                w.connect(f"r{x}_{y}", "east", f"r{x + 1}_{y}")
+            if y + 1 < n:
+                w.connect(f"r{x}_{y}", "south", f"r{x}_{y + 1}")
+    return w
+
+
+@pytest.fixture
+def default_world():
+    return load_default_world()
+
+
+@pytest.fixture
+def mapped(tmp_path, default_world):
+    path = str(tmp_path / "vale.drw")
+    compile_world(default_world, path)
+    return MappedWorld(path)
+
+
+class TestMappedWorldParity:
+    """MappedWorld answers like the World it was compiled from."""
+
+    def test_to_dict_round_trip(self, default_world, mapped):
+        assert mapped.to_dict() == default_world.to_dict()
+        assert mapped.title == default_world.title
+
+    def test_look_move_neighbors(self, default_world, mapped):
+        for room in default_world.rooms():
+            assert mapped.look(room.id) == default_world.look(room.id)
+            assert mapped.neighbors(room.id) == default_world.neighbors(room.id)
+            for d in ("north", "south", "east", "west", "up"):
+                assert mapped.move(room.id, d) == default_world.move(room.id, d)
+
+    def test_find_path(self, default_world, mapped):
+        for a in default_world.rooms():
+            for b in default_world.rooms():
+                assert mapped.find_path(a.id, b.id) == default_world.find_path(a.id, b.id)
+
+    def test_random_mutations_match(self, tmp_path):
+        world = grid_world(6)
+        path = str(tmp_path / "grid.drw")
+        compile_world(world, path)
+        mapped = MappedWorld(path)
+        rng = random.Random(7)
+        ids = [r.id for r in world.rooms()]
+        for step in range(200):
+            room_id = rng.choice(ids)
+            exits = list(world.require_room(room_id).exits)
+            action = rng.random()
+            if action < 0.5 and exits:
+                d, locked = rng.choice(exits), rng.random() < 0.6
+                world.set_locked(room_id, d, locked)
+                mapped.set_locked(room_id, d, locked)
+            elif action < 0.8:
+                to = rng.choice(ids)
+                world.add_exit(room_id, "up", to)
+                mapped.add_exit(room_id, "up", to)
+            else:
+                new_id = f"extra{step}"
+                world.add(new_id, "Extra")
+                mapped.add(new_id, "Extra")
+                world.connect(new_id, "down", room_id)
+                mapped.connect(new_id, "down", room_id)
+                ids.append(new_id)
+            a, b = rng.choice(ids), rng.choice(ids)
+            expected = world.find_path(a, b)
+            got = mapped.find_path(a, b)
+            assert (got is None) == (expected is None), (a, b)
+            if got is not None:
+                assert len(got) == len(expected)
+        assert mapped.to_dict() == world.to_dict()
+
+
+class TestMappedWorld:
+    """Test suite for MappedWorld-specific behaviour."""
+
+    def test_rooms_materialize_lazily(self, mapped):
+        assert mapped.materialized == 0
+        assert mapped.has_room("market")
+        assert mapped.find_path("town_square", "market")
+        assert mapped.materialized == 0
+
+        room = mapped.require_room("tavern")
+        assert mapped.require_room("tavern") is room
+        assert mapped.materialized == 1
+
+    def test_missing_room(self, mapped):
+        assert not mapped.has_room("nowhere")
+        assert mapped.current_room("nowhere") is None
+        with pytest.raises(KeyError):
+            mapped.require_room("nowhere")
+        assert mapped.find_path("tavern", "nowhere") is None
+
+    def test_duplicate_room_raises(self, mapped):
+        with pytest.raises(ValueError):
+            mapped.add("tavern", "Tavern")
+
+    def test_added_rooms(self, mapped):
+        mapped.add("cellar", "Cellar")
+        mapped.connect("tavern", "down", "cellar")
+        assert mapped.room_count == 6
+        assert mapped.find_path("market", "cellar") == ["market", "tavern", "cellar"]
+        assert mapped.find_path("cellar", "town_square") == ["cellar", "tavern", "town_square"]
+
+    def test_edits_override_file(self, mapped):
+        mapped.set_locked("town_square", "south")
+        assert mapped.find_path("town_square", "market") is None
+        assert mapped.find_path("market", "town_square") is not None
+        mapped.set_locked("north_road", "north", False)
+        assert mapped.find_path("market", "gate")[-1] == "gate"
+
+    def test_dangling_exit_round_trips(self, tmp_path):
+        world = World()
+        room = Room("a", "A")
+        room.add_exit("north", "missing", description="Fog")
+        world.add_room(room)
+        path = str(tmp_path / "w.drw")
+        compile_world(world, path)
+        mapped = MappedWorld(path)
+        assert mapped.to_dict() == world.to_dict()
+        assert mapped.find_path("a", "missing") is None
+
+    def test_landmarks(self, tmp_path):
+        world = grid_world(8)
+        path = str(tmp_path / "grid.drw")
+        compile_world(world, path)
+        mapped = MappedWorld(path)
+        mapped.build_landmarks(4)
+        assert len(mapped.find_path("r0_0", "r7_7")) == 15
+        mapped.set_locked("r0_0", "east")
+        mapped.set_locked("r0_0", "south")
+        assert mapped.find_path("r0_0", "r7_7") is None
+
+    def test_empty_world(self, tmp_path):
+        path = str(tmp_path / "empty.drw")
+        compile_world(World(title="Void"), path)
+        mapped = MappedWorld(path)
+        assert mapped.title == "Void"
+        assert list(mapped.rooms()) == []
+        assert not mapped.has_room("a")
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "w.drw"
+        path.write_bytes(b"not a world" * 100)
+        with pytest.raises(ValueError, match="Not a compiled DiceRealms world"):
+            MappedWorld(str(path))
+        path.write_bytes(b"")
+        with pytest.raises(ValueError):
+            MappedWorld(str(path))
+
+
+class TestWorldIO:
+    """.drw files through world_io."""
+
+    def test_save_and_load(self, tmp_path, default_world):
+        path = str(tmp_path / "vale.drw")
+        seen = []
+        assert save_world(default_world, path, progress=seen.append) == 5
+        assert seen[-1].rooms == 5
+
+        world = load_world(path, progress=seen.append)
+        assert isinstance(world, MappedWorld)
+        assert world.to_dict() == default_world.to_dict()
+        assert seen[-1].fraction == 1.0
+
+    def test_compile_from_jsonl(self, tmp_path, default_world):
+        src, dst = str(tmp_path / "vale.jsonl"), str(tmp_path / "vale.drw")
+        save_world(default_world, src)
+        save_world(load_world(src), dst)
+        assert MappedWorld(dst).to_dict() == default_world.to_dict()
@@ -0,0 +1,49 @@
+# SPDX-License-Identifier: MIT
+"""Tests for the casefolded name index."""
+
+import pytest
+
+from dicerealms.name_index import NameIndex
+
+
+@pytest.fixture
+def index():
+    idx = NameIndex()
+    for item_id, name in [("1", "Alice"), ("2", "alan"), ("3", "Bob"), ("4", "ALICE"), ("5", "Al")]:
+        idx.add(item_id, name)
+    return idx
+
+
+class TestNameIndex:
+    """Test suite for NameIndex."""
+
+    def test_lookup_ignores_case(self, index):
+        assert index.lookup("alice") == ["1", "4"]
+        assert index.first("aLiCe") == "1"
+        assert index.lookup("carol") == []
+        assert index.first("carol") is None
+
+    def test_casefold(self):
+        idx = NameIndex()
+        idx.add("1", "Straße")
+        assert idx.first("STRASSE") == "1"
+
+    def test_prefix_sorted_by_name(self, index):
+        assert index.prefix("AL") == ["5", "2", "1", "4"]
+        assert index.prefix("al", limit=2) == ["5", "2"]
+        assert index.prefix("") == ["5", "2", "1", "4", "3"]
+        assert index.prefix("z") == []
+
+    def test_remove_prunes(self, index):
+        index.remove("2", "Alan")
+        index.remove("3", "Bob")
+        index.remove("3", "Bob")
+        assert index.prefix("b") == []
+        assert index.prefix("ala") == []
+        assert index._root.children.keys() == {"a"}
+        assert index.prefix("al") == ["5", "1", "4"]
+
+    def test_rename(self, index):
+        index.rename("3", "Bob", "Alfred")
+        assert index.lookup("bob") == []
+        assert index.prefix("alf") == ["3"]
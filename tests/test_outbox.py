@@ -0,0 +1,102 @@
+# SPDX-License-Identifier: MIT
+"""Tests for per-client outbound queues."""
+
+import asyncio
+
+import pytest
+
+from dicerealms.server.outbox import Outbox
+
+
+def make_outbox(limit=3, policies=None):
+    sent: list[str] = []
+    dead: list[str] = []
+    gate = asyncio.Event()
+    gate.set()
+
+    async def send(frame):
+        await gate.wait()
+        sent.append(frame)
+        return frame != "fail"
+
+    box = Outbox("p1", object(), send, dead.append, limit=limit, policies=policies)
+    return box, sent, dead, gate
+
+
+class TestOutbox:
+    """Test suite for Outbox."""
+
+    @pytest.mark.asyncio
+    async def test_sends_in_order(self):
+        box, sent, _, _ = make_outbox()
+        for frame in "abc":
+            assert box.put("action_result", frame)
+        await box.flush()
+        assert sent == ["a", "b", "c"]
+        assert box.stats().sent == 3
+        assert box.stats().max_depth == 3
+        box.close()
+
+    @pytest.mark.asyncio
+    async def test_coalesce_keeps_latest_in_order(self):
+        box, sent, _, gate = make_outbox(limit=3)
+        gate.clear()
+        box.put("turn_changed", "t1")
+        box.put("action_result", "a1")
+        box.put("chat", "c1")
+        # Full, but the stale turn_changed makes room
+        assert box.put("turn_changed", "t2")
+        gate.set()
+        await box.flush()
+        assert sent == ["a1", "c1", "t2"]
+        assert box.stats().coalesced == 1
+        box.close()
+
+    @pytest.mark.asyncio
+    async def test_full_queue(self):
+        box, sent, _, gate = make_outbox(limit=2)
+        gate.clear()
+        box.put("action_result", "a")
+        box.put("action_result", "b")
+        # Nothing droppable is queued: chat is shed, anything else overflows.
+        assert box.put("chat", "c")
+        assert not box.put("action_result", "d")
+        assert not box.put("turn_changed", "t")
+        assert box.stats().dropped == 1
+        gate.set()
+        await box.flush()
+        assert sent == ["a", "b"]
+        box.close()
+
+    @pytest.mark.asyncio
+    async def test_chat_makes_room_for_other_types(self):
+        box, sent, _, gate = make_outbox(limit=2)
+        gate.clear()
+        box.put("chat", "c1")
+        box.put("chat", "c2")
+        assert box.put("action_result", "a")
+        gate.set()
+        await box.flush()
+        assert sent == ["c2", "a"]
+        box.close()
+
+    @pytest.mark.asyncio
+    async def test_custom_policies(self):
+        box, _, _, gate = make_outbox(limit=1, policies={"roll": "drop_oldest"})
+        gate.clear()
+        box.put("roll", "r1")
+        assert box.put("roll", "r2")
+        assert box.stats().dropped == 1
+        # Replacing the defaults makes chat a disconnecting type.
+        box.put("chat", "c1")
+        assert not box.put("chat", "c2")
+        box.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_send_reports_dead(self):
+        box, _, dead, _ = make_outbox()
+        box.put("error", "fail")
+        box.put("error", "never")
+        await box.flush()
+        assert dead == ["p1"]
+        assert box.depth == 1
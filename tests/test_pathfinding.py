@@ -0,0 +1,171 @@
+# SPDX-License-Identifier: MIT
+"""Tests for the landmark (ALT) pathfinding index."""
+import random
+
+import pytest
+
+from dicerealms.compact_world import CompactWorld
+from dicerealms.pathfinding import LandmarkIndex
+from dicerealms.world import World, load_default_world
+
+DIRECTIONS = ["north", "east", "south", "west", "up", "down"]
+
+
+def random_world(cls, n=50, seed=0):
+    rnd = random.Random(seed)
+    w = cls()
+    for i in range(n):
+        w.add(str(i), f"Room {i}")
+    for _ in range(2 * n):
+        w.connect(
+            str(rnd.randrange(n)), rnd.choice(DIRECTIONS), str(rnd.randrange(n)),
+            bidir=rnd.random() < 0.6, locked=rnd.random() < 0.1,
+        )
+    return w
+
+
+def grid_world(size):
+    w = World()
+    for y in range(size):
+        for x in range(size):
+            w.add(f"{x},{y}", f"Cell {x},{y}")
+    for y in range(size):
+        for x in range(size):
+            if x + 1 < size:
+                w.connect(f"{x},{y}", "east", f"{x + 1},{y}")
+            if y + 1 < size:
+                w.connect(f"{x},{y}", "south", f"{x},{y + 1}")
+    return w
+
+
+def assert_valid_path(world, path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for a, b in zip(path, path[1:], strict=False):
+        assert b in world.neighbors(a).values()
+
+
+class TestLandmarkPaths:
+    """A* with landmarks finds shortest paths."""
+
+    @pytest.mark.parametrize("cls", [World, CompactWorld])
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_bfs_lengths(self, cls, seed):
+        world = random_world(cls, seed=seed)
+        expected = {
+            (a, b): world.find_path(a, b) for a in map(str, range(50)) for b in map(str, range(50))
+        }
+        world.build_landmarks(4)
+        for (a, b), bfs in expected.items():
+            path = world.find_path(a, b)
+            if bfs is None:
+                assert path is None
+            else:
+                assert len(path) == len(bfs)
+                assert_valid_path(world, path, a, b)
+
+    def test_default_world(self):
+        world = load_default_world()
+        world.build_landmarks()
+        assert world.find_path("market", "north_road") == [
+            "market", "tavern", "town_square", "north_road"
+        ]
+        assert world.find_path("north_road", "gate") is None
+
+    def test_grid_long_range(self):
+        world = grid_world(30)
+        index = world.build_landmarks()
+        path = world.find_path("0,0", "29,29")
+        assert len(path) == 59
+        assert_valid_path(world, path, "0,0", "29,29")
+        assert index.estimate("0,0", "29,29") <= 58
+
+    def test_estimate_unreachable(self):
+        world = load_default_world()
+        index = world.build_landmarks()
+        assert index.estimate("gate", "market") is None
+
+    def test_drop_landmarks_falls_back_to_bfs(self):
+        world = load_default_world()
+        world.build_landmarks()
+        world.drop_landmarks()
+        assert world.find_path("tavern", "north_road") == ["tavern", "town_square", "north_road"]
+
+    def test_count_must_be_positive(self):
+        with pytest.raises(ValueError):
+            LandmarkIndex(load_default_world(), 0)
+
+
+class TestLandmarkUpdates:
+    """The index follows exit changes made through World."""
+
+    def test_lock_reroutes(self):
+        world = grid_world(5)
+        world.build_landmarks()
+        world.set_locked("0,0", "east")
+        world.set_locked("0,0", "south")
+        assert world.find_path("0,0", "4,4") is None
+        world.set_locked("0,0", "south", False)
+        path = world.find_path("0,0", "4,4")
+        assert len(path) == 9
+        assert path[1] == "0,1"
+
+    def test_shortcut_is_used(self):
+        world = grid_world(10)
+        index = world.build_landmarks()
+        world.add_exit("0,0", "up", "9,9")
+        assert world.find_path("0,0", "9,9") == ["0,0", "9,9"]
+        assert world.find_path("1,0", "9,9") == ["1,0", "0,0", "9,9"]
+        assert index.builds <= 2
+
+    def test_unaffected_edits_keep_landmarks(self):
+        world = grid_world(10)
+        index = world.build_landmarks()
+        world.add_exit("0,0", "up", "0,1")  # parallel to an existing exit
+        assert all(index.valid)
+        world.find_path("0,0", "9,9")
+        assert index.builds == 1
+
+    def test_unseen_rooms_need_no_rebuild(self):
+        world = grid_world(4)
+        index = world.build_landmarks()
+        world.add("annex", "Annex")
+        assert world.find_path("0,0", "annex") is None
+        assert index.estimate("annex", "0,0") is None
+        assert index.estimate("annex", "annex") == 0
+        assert index.builds == 1
+        world.add_exit("annex", "down", "0,0")
+        assert len(world.find_path("annex", "3,3")) == 8
+        assert world.find_path("3,3", "annex") is None
+
+    def test_new_rooms_trigger_rebuild(self):
+        world = grid_world(4)
+        index = world.build_landmarks()
+        world.add("annex", "Annex")
+        world.connect("3,3", "down", "annex")
+        assert world.find_path("0,0", "annex")[-2:] == ["3,3", "annex"]
+        assert index.builds == 2
+
+    @pytest.mark.parametrize("cls", [World, CompactWorld])
+    def test_random_mutations_match_bfs(self, cls):
+        world = random_world(cls, seed=7)
+        reference = random_world(cls, seed=7)
+        world.build_landmarks(4)
+        rnd = random.Random(1)
+        for _ in range(40):
+            a, b = str(rnd.randrange(50)), str(rnd.randrange(50))
+            d = rnd.choice(DIRECTIONS)
+            if rnd.random() < 0.5:
+                locked = rnd.random() < 0.2
+                for w in (world, reference):
+                    w.add_exit(a, d, b, locked=locked)
+            elif d in reference.require_room(a).exits:
+                locked = rnd.random() < 0.5
+                for w in (world, reference):
+                    w.set_locked(a, d, locked)
+            for _ in range(10):
+                s, g = str(rnd.randrange(50)), str(rnd.randrange(50))
+                expected = reference._bfs_path(s, g) if s != g else [s]
+                path = world.find_path(s, g)
+                assert (path is None) == (expected is None)
+                if path:
+                    assert len(path) == len(expected)
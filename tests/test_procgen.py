@@ -0,0 +1,183 @@
+# SPDX-License-Identifier: MIT
+"""Tests for procedural world generation."""
+
+import pytest
+
+from dicerealms.compact_world import CompactWorld
+from dicerealms.procgen import (
+    GENERATORS,
+    CaveGenerator,
+    DungeonGenerator,
+    GridGenerator,
+    ProceduralWorld,
+    TownGenerator,
+    benchmark_world,
+    build_world,
+    make_generator,
+)
+
+
+@pytest.fixture(params=sorted(GENERATORS))
+def kind(request):
+    return request.param
+
+
+class TestGenerators:
+    """Test suite shared by every generator kind."""
+
+    def test_deterministic(self, kind):
+        a = build_world(make_generator(kind, 3, 10, 8))
+        b = build_world(make_generator(kind, 3, 10, 8))
+        assert a.to_dict() == b.to_dict()
+        c = build_world(make_generator(kind, 4, 10, 8))
+        if kind != "grid":
+            assert a.to_dict() != c.to_dict()
+
+    def test_rooms_generate_independently(self, kind):
+        gen = make_generator(kind, 5, 9, 9)
+        for room in build_world(gen).rooms():
+            assert gen.room(room.id) == room
+
+    def test_exits_are_symmetric(self, kind):
+        world = build_world(make_generator(kind, 1, 12, 9))
+        for room in world.rooms():
+            for ex in room.exits.values():
+                back = world.require_room(ex.to_room).exits.values()
+                assert any(b.to_room == room.id and b.locked == ex.locked for b in back)
+
+    def test_start_room_exists(self, kind):
+        gen = make_generator(kind, 11)
+        assert gen.room(gen.start()) is not None
+
+    def test_bounds(self, kind):
+        gen = make_generator(kind, 0, 4, 3)
+        assert gen.room(gen.room_id(4, 0)) is None
+        assert gen.room(gen.room_id(0, -1)) is None
+        for room in gen.rooms():
+            x, y = gen.parse(room.id)
+            assert 0 <= x < 4 and 0 <= y < 3
+
+    @pytest.mark.parametrize("room_id", ["grid:1", "grid:a,b", "grid:01,2", "other:1,2", "lobby"])
+    def test_parse_rejects_foreign_ids(self, room_id):
+        assert GridGenerator().room(room_id) is None
+
+    def test_unbounded_listing_raises(self):
+        with pytest.raises(ValueError):
+            list(GridGenerator().rooms())
+
+    def test_invalid_size_and_kind(self):
+        with pytest.raises(ValueError):
+            GridGenerator(0, 0, 5)
+        with pytest.raises(ValueError, match="Unknown world kind"):
+            make_generator("swamp")
+
+    def test_for_rooms(self):
+        assert sum(1 for _ in GridGenerator.for_rooms(10_000).rooms()) == 10_000
+        assert sum(1 for _ in GridGenerator.for_rooms(10).rooms()) == 16
+
+
+class TestLayouts:
+    """Kind-specific layout rules."""
+
+    def test_grid_is_fully_connected(self):
+        world = build_world(GridGenerator(0, 5, 4))
+        assert len(world.find_path("grid:0,0", "grid:4,3")) == 8
+
+    def test_caves_fill(self):
+        gen = CaveGenerator(2, 30, 30, fill=0.5)
+        assert 300 < sum(1 for _ in gen.rooms()) < 600
+
+    def test_town_buildings_have_one_door(self):
+        gen = TownGenerator(0, 10, 8)
+        world = build_world(gen)
+        for room in world.rooms():
+            x, y = gen.parse(room.id)
+            if not gen.is_street(x, y):
+                assert len(room.exits) == 1
+        assert world.find_path("town:0,0", "town:8,7") is not None
+
+    def test_bounded_dungeon_without_locks_is_connected(self):
+        world = build_world(DungeonGenerator(9, 15, 10, lock_rate=0.0))
+        ids = [r.id for r in world.rooms()]
+        assert all(world.find_path(ids[0], room_id) for room_id in ids)
+
+    def test_dungeon_locks(self):
+        world = build_world(DungeonGenerator(9, 30, 30, lock_rate=0.2))
+        locked = sum(ex.locked for r in world.rooms() for ex in r.exits.values())
+        assert locked > 0
+
+
+class TestProceduralWorld:
+    """Test suite for lazily generated worlds."""
+
+    def test_rooms_generated_on_demand(self):
+        world = ProceduralWorld(GridGenerator(1))
+        assert world.generated == 0
+        assert world.has_room("grid:1000000,-5")
+        assert world.generated == 1
+        dest, _ = world.move("grid:0,0", "north")
+        assert dest == "grid:0,-1"
+        assert world.generated == 3
+
+    def test_matches_eager_world(self, kind):
+        gen = make_generator(kind, 6, 8, 8)
+        eager = build_world(gen)
+        lazy = ProceduralWorld(gen)
+        assert eager.start_room == lazy.start_room == gen.start()
+        assert eager.has_room(eager.start_room)
+        ids = [r.id for r in eager.rooms()]
+        for goal in ids[::7]:
+            expected = eager.find_path(ids[0], goal)
+            got = lazy.find_path(ids[0], goal)
+            assert (got is None) == (expected is None)
+            if got:
+                assert len(got) == len(expected)
+
+    def test_indexes_unsupported(self):
+        world = ProceduralWorld(GridGenerator(0))
+        assert world.build_landmarks() is None
+        assert world.components is None
+        assert world.generated == 0
+
+    def test_unbounded_path(self):
+        world = ProceduralWorld(GridGenerator(0))
+        assert len(world.find_path("grid:0,0", "grid:10,-10")) == 21
+
+    def test_search_limit(self):
+        world = ProceduralWorld(GridGenerator(0), search_limit=100)
+        assert world.find_path("grid:0,0", "grid:500,500") is None
+
+    def test_edits_stick(self):
+        world = ProceduralWorld(GridGenerator(0, 3, 1))
+        world.set_locked("grid:0,0", "east")
+        assert world.find_path("grid:0,0", "grid:2,0") is None
+        world.add("grid:shrine", "Shrine")
+        world.connect("grid:0,0", "up", "grid:shrine")
+        assert world.find_path("grid:0,0", "grid:shrine") == ["grid:0,0", "grid:shrine"]
+
+    def test_duplicate_room_raises(self):
+        world = ProceduralWorld(GridGenerator(0))
+        with pytest.raises(ValueError):
+            world.add("grid:3,3", "Again")
+
+    def test_missing_room(self):
+        world = ProceduralWorld(GridGenerator(0, 2, 2))
+        assert world.current_room("grid:5,5") is None
+        with pytest.raises(KeyError):
+            world.require_room("grid:5,5")
+
+
+class TestBenchmark:
+    """Test suite for world benchmarks."""
+
+    def test_benchmark_world(self):
+        b = benchmark_world("grid", 400, paths=3, moves=50)
+        assert b.rooms == 400
+        assert b.path_length > 0
+        assert b.file_bytes > 0
+        assert min(b.build_seconds, b.save_seconds, b.load_seconds) > 0
+
+    def test_build_into_compact_world(self):
+        world = build_world(DungeonGenerator(1, 20, 20), world_cls=CompactWorld)
+        assert isinstance(world, CompactWorld)
+        assert sum(1 for _ in world.rooms()) == 400
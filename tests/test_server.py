@@ -1,14 +1,20 @@
 # SPDX-License-Identifier: MIT
 """Tests for GameServer class."""
 
+import asyncio
 import json
+import time
 from unittest.mock import AsyncMock
 
 import pytest
 import websockets
 from websockets import ServerConnection
 
+from dicerealms.protocol.messages import turn_status_for
 from dicerealms.server.server import GameServer
+from dicerealms.world import World
+from dicerealms.world_io import save_world
+from dicerealms.zoned_world import ZoneDirectory, ZonedWorld
 
 
 @pytest.fixture
@@ -36,6 +42,34 @@ class TestGameServer:
         assert len(server.player_names) == 0
         assert server.turn_manager is not None
 
+    def test_world_path_needs_start_room(self, tmp_path):
+        path = str(tmp_path / "world.jsonl")
+        world = World(title="Nowhere")
+        world.add("cellar", "Cellar")
+        save_world(world, path)
+        with pytest.raises(ValueError, match="no start room"):
+            GameServer(world_path=path)
+        world.start_room = "cellar"
+        save_world(world, path)
+        assert GameServer(world_path=path).world.start_room == "cellar"
+
+    def test_world_path_zone_directory(self, tmp_path):
+        world = World(title="Zones")
+        for zone in ("town", "crypt"):
+            world.add(f"{zone}:gate", zone.title())
+        world.connect("town:gate", "down", "crypt:gate")
+        ZoneDirectory.from_world(world, str(tmp_path / "realm"))
+        with pytest.raises(ValueError, match="no start room"):
+            GameServer(world_path=str(tmp_path / "realm"))
+
+        server = GameServer(world_path=str(tmp_path / "realm"), start_room="town:gate", max_zones=1)
+        assert isinstance(server.world, ZonedWorld)
+        assert server.world.max_zones == 1
+        server.game_state.add_player("player_1", "Alice")
+        load = server.load()
+        assert load["resident_zones"] == 1 and load["zone_loads"] == 1
+        assert "resident_zones" not in GameServer().load()
+
     @pytest.mark.asyncio
     async def test_handle_client_connection(self, server, mock_websocket):
         """Test handling a new client connection."""
@@ -72,9 +106,11 @@ class TestGameServer:
         
         message = {"type": "connect", "player_name": "Alice"}
         await server.handle_connect(player_id, message)
+        await server.flush()
         
         assert server.player_names[player_id] == "Alice"
-        server.broadcast.assert_called_once()
+        broadcasts = [c[0][0]["type"] for c in server.broadcast.call_args_list]
+        assert broadcasts == ["player_joined", "turn_changed"]
         server.connected_clients[player_id].send.assert_called()
 
     @pytest.mark.asyncio
@@ -109,6 +145,7 @@ class TestGameServer:
         
         message = {"type": "action", "action": "roll", "args": ["1d6"]}
         await server.handle_action(player_id, message)
+        await server.flush()
         
         # Should send error message
         server.connected_clients[player_id].send.assert_called()
@@ -147,6 +184,7 @@ class TestGameServer:
         
         message = {"type": "test", "data": "test"}
         await server.send_to_client(player_id, message)
+        await server.flush()
         
         mock_websocket.send.assert_called_once()
         sent_data = json.loads(mock_websocket.send.call_args[0][0])
@@ -168,11 +206,104 @@ class TestGameServer:
         
         message = {"type": "test", "data": "broadcast"}
         await server.broadcast(message)
+        await server.flush()
         
         # Both clients should receive the message
         assert client1.send.call_count == 1
         assert client2.send.call_count == 1
 
+    @pytest.mark.asyncio
+    async def test_broadcast_encodes_once_and_sends_concurrently(self, server):
+        """A slow client neither delays the others nor survives its timeout."""
+        server.send_timeout = 0.05
+        clients = {f"player_{i}": AsyncMock() for i in range(500)}
+
+        async def stall(frame):
+            await asyncio.sleep(10)
+
+        clients["player_0"].send = AsyncMock(side_effect=stall)
+        server.connected_clients = dict(clients)
+
+        t0 = time.perf_counter()
+        await server.broadcast({"type": "test", "data": "broadcast"})
+        await server.flush()
+        assert time.perf_counter() - t0 < 2
+
+        frames = {id(c.send.call_args[0][0]) for c in clients.values()}
+        assert len(frames) == 1
+        assert "player_0" not in server.connected_clients
+        assert len(server.connected_clients) == 499
+        await asyncio.sleep(0)
+        clients["player_0"].close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_turn_status_is_one_shared_frame(self, server):
+        """Every client gets the same turn_changed frame and derives its own status."""
+        clients = {f"player_{i}": AsyncMock() for i in range(1, 4)}
+        server.connected_clients = dict(clients)
+        for player_id in clients:
+            await server.handle_connect(player_id, {"type": "connect", "player_name": player_id.title()})
+        await server.flush()
+        for client in clients.values():
+            client.send.reset_mock()
+
+        await server._broadcast_turn_status()
+        await server.flush()
+
+        frames = {id(c.send.call_args[0][0]) for c in clients.values()}
+        assert len(frames) == 1
+        changed = json.loads(clients["player_1"].send.call_args[0][0])
+        assert changed["type"] == "turn_changed"
+        assert changed["queue"] == ["player_1", "player_2", "player_3"]
+
+        mine = turn_status_for(changed, "player_1")
+        assert mine["is_your_turn"] and mine["queue_position"] == 0
+        theirs = turn_status_for(changed, "player_3")
+        assert not theirs["is_your_turn"]
+        assert theirs["waiting_for"] == "Player_1"
+        assert theirs["queue_position"] == 2 and theirs["queue_size"] == 3
+        assert turn_status_for(changed, "player_9")["queue_position"] == -1
+
+    @pytest.mark.asyncio
+    async def test_overflow_policies(self, server):
+        """A stalled client's queue coalesces turn status, sheds chat, then disconnects."""
+        server.queue_limit = 4
+        stalled = AsyncMock()
+        release = asyncio.Event()
+
+        async def stall(frame):
+            await release.wait()
+
+        stalled.send = AsyncMock(side_effect=stall)
+        server.connected_clients = {"player_1": stalled}
+
+        await server.send_to_client("player_1", {"type": "welcome"})
+        await asyncio.sleep(0)  # the writer is now blocked on the welcome
+        for i in range(3):
+            await server.broadcast({"type": "turn_changed", "queue_size": i})
+        for i in range(10):
+            await server.broadcast({"type": "chat", "message": str(i)})
+        stats = server.outbox_stats()["player_1"]
+        assert stats.depth == 4
+        assert stats.coalesced == 2
+        assert stats.dropped == 7
+
+        release.set()
+        await server.flush()
+        sent = [json.loads(c[0][0]) for c in stalled.send.call_args_list]
+        assert [m["type"] for m in sent] == ["welcome", "turn_changed", "chat", "chat", "chat"]
+        assert sent[1]["queue_size"] == 2
+        assert [m["message"] for m in sent[2:]] == ["7", "8", "9"]
+        assert server.outbox_stats()["player_1"].sent == 5
+
+        release.clear()
+        await server.send_to_client("player_1", {"type": "welcome"})
+        await asyncio.sleep(0)
+        for _ in range(5):
+            await server.broadcast({"type": "player_joined", "player": "x"})
+        assert "player_1" not in server.connected_clients
+        assert server.outbox_stats() == {}
+
     @pytest.mark.asyncio
     async def test_handle_message_unknown_type(self, server):
         """Test handling unknown message type."""
@@ -182,6 +313,7 @@ class TestGameServer:
         
         raw_message = json.dumps({"type": "unknown_type", "data": "test"})
         await server.handle_message(player_id, raw_message)
+        await server.flush()
         
         # Should send error message
         server.connected_clients[player_id].send.assert_called_once()
@@ -197,9 +329,155 @@ class TestGameServer:
         server.connected_clients[player_id].send = AsyncMock()
         
         await server.handle_message(player_id, "invalid json")
+        await server.flush()
         
         # Should send error message
         server.connected_clients[player_id].send.assert_called_once()
         sent_msg = json.loads(server.connected_clients[player_id].send.call_args[0][0])
         assert sent_msg["type"] == "error"
-        assert "invalid json" in sent_msg["message"].lower()
\ No newline at end of file
+        assert "invalid json" in sent_msg["message"].lower()
+
+
+class TestGameInstances:
+    """Test suite for several games hosted by one server."""
+
+    @pytest.fixture
+    async def tables(self, server):
+        clients = {f"player_{i}": AsyncMock() for i in range(1, 5)}
+        server.connected_clients = dict(clients)
+        for player_id, game_id in zip(clients, ["red", "red", "blue", "blue"], strict=True):
+            await server.handle_connect(
+                player_id, {"type": "connect", "player_name": player_id.title(), "game_id": game_id}
+            )
+        await server.flush()
+        for client in clients.values():
+            client.send.reset_mock()
+        return server, clients
+
+    @staticmethod
+    def types(client) -> list[str]:
+        return [json.loads(c[0][0])["type"] for c in client.send.call_args_list]
+
+    @pytest.mark.asyncio
+    async def test_games_are_independent(self, tables):
+        server, _ = tables
+        red, blue = server.games["red"], server.games["blue"]
+        assert red.turn_manager.get_turn_queue() == ["player_1", "player_2"]
+        assert blue.turn_manager.get_turn_queue() == ["player_3", "player_4"]
+        assert server.game_of("player_3") is blue
+        assert red.game_state.get_player("player_3") is None
+        assert server.turn_manager.get_turn_queue() == []
+
+    @pytest.mark.asyncio
+    async def test_broadcasts_are_scoped(self, tables):
+        server, clients = tables
+        server.games["red"].action_processor.action_delay = 0
+        await server.handle_chat("player_1", {"type": "chat", "message": "hi"})
+        await server.handle_action("player_1", {"type": "action", "action": "roll", "args": ["1d6"]})
+        await server.flush()
+        assert "chat" in self.types(clients["player_2"])
+        assert "action_result" in self.types(clients["player_2"])
+        assert self.types(clients["player_3"]) == []
+        assert self.types(clients["player_4"]) == []
+
+    @pytest.mark.asyncio
+    async def test_turns_are_per_game(self, tables):
+        server, clients = tables
+        for game in server.games.values():
+            game.action_processor.action_delay = 0
+        await server.handle_action("player_1", {"type": "action", "action": "roll", "args": ["1d6"]})
+        await server.handle_action("player_3", {"type": "action", "action": "roll", "args": ["1d6"]})
+        await server.flush()
+        assert "error" not in self.types(clients["player_3"])
+        assert server.games["red"].turn_manager.get_current_player() == "player_2"
+        assert server.games["blue"].turn_manager.get_current_player() == "player_4"
+
+    @pytest.mark.asyncio
+    async def test_switching_and_ending_games(self, tables):
+        server, _ = tables
+        await server.handle_connect("player_3", {"type": "connect", "player_name": "P3", "game_id": "red"})
+        assert server.games["red"].turn_manager.get_turn_queue() == ["player_1", "player_2", "player_3"]
+        assert list(server.games["blue"].members) == ["player_4"]
+        server._drop_client("player_4")
+        assert "blue" not in server.games
+        assert "default" in server.games
+
+    @pytest.mark.asyncio
+    async def test_switching_tells_the_old_game(self, tables):
+        server, clients = tables
+        await server.handle_connect("player_3", {"type": "connect", "player_name": "P3", "game_id": "red"})
+        await server.flush()
+        sent = [json.loads(c[0][0]) for c in clients["player_4"].send.call_args_list]
+        assert [m["type"] for m in sent] == ["player_left", "turn_changed"]
+        assert sent[0]["player"] == "Player_3"
+        assert sent[1]["queue"] == ["player_4"]
+        assert self.types(clients["player_1"]) == ["player_joined", "turn_changed"]
+
+    @pytest.mark.asyncio
+    async def test_turn_status_of_an_empty_game(self, tables):
+        server, _ = tables
+        lobby = server.connected_clients["player_5"] = AsyncMock()
+        await server.handle_connect("player_5", {"type": "connect", "player_name": "P5"})
+        await server.flush()
+        lobby.send.reset_mock()
+        red = server.games["red"]
+        for player_id in ("player_1", "player_2"):
+            red.leave(player_id)
+        await server._broadcast_turn_status(red)
+        await server.flush()
+        assert self.types(lobby) == []
+
+    @pytest.mark.asyncio
+    async def test_complete_name(self, tables):
+        server, clients = tables
+        await server.handle_message("player_1", json.dumps({"type": "complete_name", "prefix": "PLAYER_"}))
+        await server.handle_message("player_1", json.dumps({"type": "complete_name", "prefix": 7}))
+        await server.flush()
+        sent = [json.loads(c[0][0]) for c in clients["player_1"].send.call_args_list]
+        assert sent[0] == {"type": "name_completions", "prefix": "PLAYER_", "names": ["Player_1", "Player_2"]}
+        assert sent[1]["type"] == "error"
+        assert self.types(clients["player_2"]) == []
+
+    @pytest.mark.asyncio
+    async def test_rename(self, tables):
+        server, clients = tables
+        await server.handle_message("player_1", json.dumps({"type": "rename", "player_name": "Ann"}))
+        await server.flush()
+        sent = [json.loads(c[0][0]) for c in clients["player_2"].send.call_args_list]
+        assert sent[0] == {"type": "player_renamed", "old_name": "Player_1", "player": "Ann"}
+        assert sent[1]["current_player"] == "Ann"
+        assert server.games["red"].game_state.find_player("ann").player_id == "player_1"
+        assert self.types(clients["player_3"]) == []
+
+        lobby = server.connected_clients["player_5"] = AsyncMock()
+        await server.handle_rename("player_5", {"type": "rename", "player_name": "Eve"})
+        await server.handle_rename("player_1", {"type": "rename"})
+        await server.flush()
+        assert self.types(lobby) == ["error"]
+        assert self.types(clients["player_1"])[-1] == "error"
+
+    @pytest.mark.asyncio
+    async def test_dropped_client_is_announced(self, tables):
+        server, clients = tables
+        server._drop_client("player_1")
+        await server.flush()
+        sent = [json.loads(c[0][0]) for c in clients["player_2"].send.call_args_list]
+        assert [m["type"] for m in sent] == ["player_left", "turn_changed"]
+        assert sent[0]["player"] == "Player_1"
+        assert sent[1]["current_player_id"] == "player_2"
+        assert self.types(clients["player_3"]) == []
+
+    @pytest.mark.asyncio
+    async def test_connect_errors(self, server, mock_websocket):
+        server.connected_clients["player_1"] = mock_websocket
+        server.max_games = 1
+        for game_id in ["x" * 65, "second", ""]:
+            await server.handle_connect("player_1", {"type": "connect", "player_name": "A", "game_id": game_id})
+        await server.flush()
+        sent = [json.loads(c[0][0]) for c in mock_websocket.send.call_args_list]
+        errors = [m["message"] for m in sent if m["type"] == "error"]
+        assert errors[0] == "Invalid game ID."
+        assert "too many games" in errors[1]
+        connected = next(m for m in sent if m["type"] == "connected")
+        assert connected["game_id"] == "default"
+        assert list(server.games) == ["default"]
@@ -0,0 +1,65 @@
+# SPDX-License-Identifier: MIT
+"""Tests for sharded Monte Carlo simulation."""
+import numpy as np
+import pytest
+
+from dicerealms.core import dice_stats
+from dicerealms.simulate import Histogram, simulate
+
+
+class TestHistogram:
+
+    def test_from_totals(self):
+        h = Histogram.from_totals(np.array([3, 5, 5, 7]))
+        assert h.min_total == 3
+        assert h.max_total == 7
+        assert h.counts.tolist() == [1, 0, 2, 0, 1]
+
+    def test_merge_aligns_offsets(self):
+        a = Histogram.from_totals(np.array([1, 2]))
+        b = Histogram.from_totals(np.array([4, 4]))
+        merged = a.merge(b)
+        assert merged.min_total == 1
+        assert merged.counts.tolist() == [1, 1, 0, 2]
+        assert merged.trials == 4
+
+    def test_merge_with_empty(self):
+        h = Histogram.from_totals(np.array([2, 3]))
+        assert Histogram().merge(h) is h
+        assert h.merge(Histogram()) is h
+
+    def test_stats(self):
+        h = Histogram.from_totals(np.array([1, 2, 3, 4]))
+        assert h.mean == pytest.approx(2.5)
+        assert h.percentile(50) == 2
+        assert h.percentile(100) == 4
+
+
+class TestSimulate:
+
+    def test_progress_streams_per_shard(self):
+        updates = list(simulate(["2d6"], 2500, workers=1, seed=1, shard_trials=1000))
+        assert [u.shards_done for u in updates] == [1, 2, 3]
+        assert updates[-1].finished
+        assert updates[-1].histogram.trials == 2500
+
+    def test_matches_exact_mean(self):
+        *_, last = simulate(["4d6kh3"], 200_000, workers=1, seed=1)
+        assert last.histogram.mean == pytest.approx(dice_stats("4d6kh3").mean, abs=0.05)
+
+    def test_reproducible_across_worker_counts(self):
+        def final(workers):
+            results = {}
+            for p in simulate(["1d20", "3d6"], 3000, workers=workers, seed=9, shard_trials=1000):
+                results[p.expression] = p.histogram.counts.tolist()
+            return results
+
+        assert final(1) == final(2)
+
+    def test_invalid_expression_raises_before_running(self):
+        with pytest.raises(ValueError):
+            list(simulate(["nope"], 10, workers=1))
+
+    def test_nonpositive_trials_raises(self):
+        with pytest.raises(ValueError):
+            list(simulate(["1d6"], 0, workers=1))
@@ -17,6 +17,7 @@ def ui():
     ("look",  "_render_look"),
     ("move",  "_render_move"),
     ("roll",  "_render_roll"),
+    ("odds",  "_render_odds"),
     ("stats", "_render_stats"),
     ("help",  "_render_help"),
 ])
@@ -96,6 +97,17 @@ def test_render_roll_contains_total(ui, roll_result):
     assert "7" in ui._render_roll(roll_result)
 
 
+def test_render_roll_summary(ui):
+    result = {
+        "expression": "5000d6",
+        "total": 17512,
+        "summary": {"dice": 5000, "min": 1, "max": 6, "faces": {}},
+    }
+    rendered = ui._render_roll(result)
+    assert "17512" in rendered
+    assert "5000 dice" in rendered
+
+
 # --- stats ---
 
 @pytest.fixture
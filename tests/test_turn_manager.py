@@ -219,6 +219,22 @@ class TestTurnManager:
         assert status["is_your_turn"] is False
         assert status["queue_position"] == 1
 
+    def test_snapshot(self):
+        """Test shared turn snapshot."""
+        tm = TurnManager()
+        tm.add_player("player_1")
+        tm.add_player("player_2")
+        tm.advance_turn()
+
+        snap = tm.snapshot()
+        assert snap == {
+            "current_player": "player_2",
+            "turn_in_progress": False,
+            "queue": ["player_1", "player_2"],
+        }
+        snap["queue"].append("player_3")
+        assert tm.get_turn_queue() == ["player_1", "player_2"]
+
     def test_get_turn_queue(self):
         """Test getting copy of turn queue."""
         tm = TurnManager()
@@ -2,6 +2,7 @@
 """Tests for World graph navigation."""
 import pytest
 
+from dicerealms.compact_world import CompactWorld
 from dicerealms.world import Room, World, load_default_world
 
 
@@ -77,6 +78,20 @@ class TestWorld:
     def test_find_path_same_room(self, world):
         assert world.find_path("a", "a") == ["a"]
 
+    def test_add_exit(self, world):
+        world.add_exit("c", "up", "a")
+        assert world.move("c", "up")[0] == "a"
+
+    def test_set_locked(self, world):
+        world.set_locked("a", "north")
+        assert world.move("a", "north")[0] is None
+        world.set_locked("a", "north", False)
+        assert world.move("a", "north")[0] == "b"
+
+    def test_set_locked_missing_exit_raises(self, world):
+        with pytest.raises(KeyError):
+            world.set_locked("a", "west")
+
     def test_serialization_roundtrip(self, world):
         data = world.to_dict()
         restored = World.from_dict(data)
@@ -85,6 +100,176 @@ class TestWorld:
         assert restored.require_room("a").exits["north"].to_room == "b"
 
 
+class TestPathCache:
+
+    @pytest.fixture
+    def world(self):
+        return load_default_world()
+
+    def test_repeat_query_hits(self, world):
+        first = world.find_path("market", "north_road")
+        assert world.find_path("market", "north_road") == first
+        stats = world.path_cache_stats()
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+        assert stats.hit_rate == 0.5
+
+    def test_unreachable_is_cached(self, world):
+        assert world.find_path("tavern", "gate") is None
+        assert world.find_path("tavern", "gate") is None
+        assert world.path_cache_stats().hits == 1
+
+    def test_returned_paths_are_copies(self, world):
+        world.find_path("market", "north_road").append("nowhere")
+        assert world.find_path("market", "north_road")[-1] == "north_road"
+
+    @pytest.mark.parametrize("change", [
+        lambda w: w.set_locked("north_road", "north", False),
+        lambda w: w.add_exit("tavern", "up", "gate"),
+        lambda w: w.connect("market", "north", "gate", bidir=False),
+    ])
+    def test_topology_changes_invalidate(self, world, change):
+        assert world.find_path("tavern", "gate") is None
+        version = world.topology_version
+        change(world)
+        assert world.topology_version > version
+        assert world.find_path("tavern", "gate") is not None
+        assert world.path_cache_stats().invalidations == 1
+
+    def test_size_is_bounded(self):
+        w = World(path_cache_size=2)
+        for room_id in "abcd":
+            w.add(room_id, room_id.upper())
+        w.connect("a", "east", "b")
+        w.connect("b", "east", "c")
+        w.connect("c", "east", "d")
+        for goal in "bcd":
+            w.find_path("a", goal)
+        stats = w.path_cache_stats()
+        assert stats.size == 2
+        assert stats.evictions == 1
+
+    def test_disabled_cache(self):
+        w = World(path_cache_size=0)
+        w.add("a", "A")
+        w.add("b", "B")
+        w.connect("a", "east", "b")
+        w.find_path("a", "b")
+        w.find_path("a", "b")
+        assert w.path_cache_stats().hits == 0
+
+
+class TestRoomRender:
+    """Test suite for cached look output."""
+
+    @pytest.fixture
+    def world(self):
+        w = World()
+        w.add("a", "Room A", "  Dusty.  ")
+        w.add("b", "Room B")
+        w.connect("a", "south", "b")
+        w.connect("a", "east", "b", bidir=False)
+        return w
+
+    def test_matches_uncached_renderers(self, world):
+        """Every render field is byte-identical to what the renderers built before caching."""
+        world.add("c", "Room C", "Dead end.")
+        world.connect("b", "west", "c", locked=True)
+        worlds = [world, CompactWorld.from_world(world), load_default_world()]
+        worlds.append(CompactWorld.from_world(worlds[-1]))
+        for w in worlds:
+            for room in w.rooms():
+                room_id = room.id
+                exits = sorted(room.neighbor())
+                pretty = ", ".join(exits)
+                old_look = [room.name, "", room.description.strip(), ""]
+                old_look.append(f"Exits: {pretty}" if exits else "No obvious exits.")
+                render = w.render(room_id)
+                assert render.plain == "\n".join(old_look).strip()
+                assert render.text == f"{room.name}\n\n{room.description}\n\nExits: {pretty}"
+                assert render.markup == (
+                    f"[bold cyan]{room.name}[/bold cyan]\n"
+                    f"{room.description}\n\n"
+                    f"[dim]Exits: {pretty}[/dim]"
+                )
+                assert render.all_exits == tuple(room.exits.keys())
+
+    def test_render_is_cached(self, world):
+        render = world.render("a")
+        assert world.render("a") is render
+        assert render.exits == ("east", "south")
+        assert render.plain == world.look("a") == "Room A\n\nDusty.\n\nExits: east, south"
+        assert render.markup.startswith("[bold cyan]Room A[/bold cyan]")
+
+    def test_exit_changes_invalidate(self, world):
+        render = world.render("a")
+        world.set_locked("a", "east")
+        assert world.render("a").exits == ("south",)
+        world.add_exit("a", "up", "b")
+        assert world.render("a").exits == ("south", "up")
+        assert world.render("a") is not render
+
+    def test_describe_invalidates(self, world):
+        world.render("a")
+        world.describe("a", name="Hall", description="Swept.")
+        assert world.look("a").startswith("Hall\n\nSwept.")
+
+    def test_direct_edits_need_touch(self, world):
+        room = world.require_room("a")
+        room.render()
+        room.description = "Changed."
+        assert "Dusty." in room.render().plain
+        room.touch()
+        assert "Changed." in room.render().plain
+
+    def test_version_not_compared(self):
+        a, b = Room("a", "A"), Room("a", "A")
+        b.touch()
+        assert a == b
+
+
+class TestBidirectionalSearch:
+
+    def test_prefers_shortest_route(self):
+        w = World()
+        for room_id in "abcdef":
+            w.add(room_id, room_id.upper())
+        w.connect("a", "east", "b")
+        w.connect("b", "east", "c")
+        w.connect("c", "east", "d")
+        w.connect("a", "north", "e")
+        w.connect("e", "north", "d")
+        assert w.find_path("a", "d") == ["a", "e", "d"]
+
+    def test_one_way_exits(self):
+        w = World()
+        for room_id in "abc":
+            w.add(room_id, room_id.upper())
+        w.connect("a", "east", "b", bidir=False)
+        w.connect("b", "east", "c", bidir=False)
+        assert w.find_path("a", "c") == ["a", "b", "c"]
+        assert w.find_path("c", "a") is None
+
+    def test_dangling_exit_is_skipped(self):
+        w = World()
+        w.add("a", "A")
+        w.add("b", "B")
+        w.add_exit("a", "down", "void")
+        w.connect("a", "east", "b")
+        assert w.find_path("a", "b") == ["a", "b"]
+
+    def test_lock_updates_backward_index(self):
+        w = World()
+        for room_id in "abc":
+            w.add(room_id, room_id.upper())
+        w.connect("a", "east", "b")
+        w.connect("b", "east", "c")
+        assert w.find_path("a", "c") == ["a", "b", "c"]
+        w.set_locked("b", "east")
+        assert w.find_path("a", "c") is None
+        w.set_locked("b", "east", False)
+        assert w.find_path("a", "c") == ["a", "b", "c"]
+
+
 class TestLoadDefaultWorld:
 
     def test_has_expected_rooms(self):
@@ -0,0 +1,118 @@
+# SPDX-License-Identifier: MIT
+"""Tests for world validation."""
+
+import pytest
+
+from dicerealms import world_check
+from dicerealms.compact_world import CompactWorld
+from dicerealms.procgen import DungeonGenerator, build_world
+from dicerealms.world import Room, World, load_default_world
+from dicerealms.world_check import WorldGraph, check_chunk, reachable, validate_world
+
+
+def broken_world() -> World:
+    w = World(title="Broken")
+    for room_id in ("hub", "hall", "vault", "attic", "island"):
+        w.add(room_id, room_id.title())
+    w.connect("hub", "east", "hall")
+    w.add_exit("hub", "north", "vault", locked=True)
+    w.add_exit("vault", "south", "hub")
+    w.add_exit("hall", "up", "attic")  # no way back down
+    w.add_exit("attic", "west", "nowhere")
+    w.add_exit("island", "east", "hub")
+    return w
+
+
+class TestValidateWorld:
+    """Test suite for validate_world."""
+
+    def test_default_world(self):
+        report = validate_world(load_default_world(), workers=1)
+        assert report.ok
+        assert report.rooms == 5
+        assert report.start == "town_square"
+        assert report.locked_only.samples == ["gate"]
+        assert report.gates.samples == [{"room": "north_road", "direction": "north", "to": "gate"}]
+
+    def test_finds_every_problem(self):
+        report = validate_world(broken_world(), workers=1)
+        assert not report.ok
+        assert report.dangling.samples == [{"room": "attic", "direction": "west", "to": "nowhere"}]
+        problems = {(s["room"], s["direction"]): s["problem"] for s in report.asymmetric.samples}
+        assert problems == {
+            ("hub", "north"): "locked",
+            ("vault", "south"): "locked",
+            ("hall", "up"): "missing",
+            ("island", "east"): "missing",
+        }
+        assert report.unreachable.samples == ["island"]
+        assert report.locked_only.samples == ["vault"]
+
+    def test_mismatched_back_link(self):
+        w = World()
+        for room_id in "abc":
+            w.add(room_id, room_id)
+        w.add_exit("a", "north", "b")
+        w.add_exit("b", "south", "c")
+        report = validate_world(w, workers=1)
+        assert report.asymmetric.samples[0]["problem"] == "mismatched"
+
+    def test_start_and_limit(self):
+        report = validate_world(broken_world(), start="island", workers=1, limit=1)
+        assert report.unreachable.count == 0
+        assert report.asymmetric.count == 4
+        assert len(report.asymmetric.samples) == 1
+        with pytest.raises(ValueError, match="Start room not found"):
+            validate_world(broken_world(), start="nowhere", workers=1)
+
+    def test_empty_world(self):
+        report = validate_world(World(), workers=1)
+        assert report.ok
+        assert report.start is None
+        assert report.to_dict()["warnings"]["unreachable"]["count"] == 0
+
+    def test_compact_world_matches(self):
+        expected = validate_world(broken_world(), workers=1).to_dict()
+        compact = validate_world(CompactWorld.from_world(broken_world()), workers=1).to_dict()
+        expected.pop("seconds")
+        compact.pop("seconds")
+        assert compact == expected
+
+    @pytest.mark.parametrize("wide", [1, 10**9])
+    def test_search_modes_match(self, monkeypatch, wide):
+        world = build_world(DungeonGenerator(3, 40, 40))
+        expected = validate_world(world, workers=1)
+        assert expected.locked_only.count and expected.gates.count
+        monkeypatch.setattr(world_check, "WIDE_FRONTIER", wide)
+        report = validate_world(world, workers=1)
+        assert report.unreachable == expected.unreachable
+        assert report.locked_only == expected.locked_only
+        assert report.gates == expected.gates
+
+    def test_checks_need_a_graph(self, monkeypatch):
+        monkeypatch.setattr(world_check, "_GRAPH", None)
+        with pytest.raises(RuntimeError, match="No world graph"):
+            check_chunk(0, 1)
+        with pytest.raises(RuntimeError, match="No world graph"):
+            reachable(False)
+
+    def test_chunks_across_processes_match(self):
+        graph = WorldGraph.of(broken_world())
+        serial = validate_world(graph, workers=1, chunk_rooms=2).to_dict()
+        pooled = validate_world(graph, workers=2, chunk_rooms=2).to_dict()
+        serial.pop("seconds")
+        pooled.pop("seconds")
+        assert pooled == serial
+
+
+class TestStrictFromDict:
+    """World.from_dict(strict=True) rejects dangling exits."""
+
+    def test_strict(self):
+        data = World().to_dict()
+        room = Room("a", "A")
+        room.add_exit("north", "missing")
+        data["rooms"].append(room.to_dict())
+        assert World.from_dict(data).has_room("a")
+        with pytest.raises(ValueError, match="Dangling exit a north -> missing"):
+            World.from_dict(data, strict=True)
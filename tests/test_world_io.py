@@ -0,0 +1,191 @@
+# SPDX-License-Identifier: MIT
+"""Tests for streaming world files."""
+
+import json
+
+import pytest
+
+from dicerealms.compact_world import CompactWorld
+from dicerealms.world import Room, World, load_default_world
+from dicerealms.world_io import (
+    FORMAT,
+    WorldIOProgress,
+    detect_format,
+    iter_rooms,
+    load_world,
+    save_world,
+)
+
+
+def grid_world(n: int) -> World:
+    w = World(title="Grid")
+    for y in range(n):
+        for x in range(n):
+            w.add(f"r{x}_{y}", f"Room {x},{y}")
+    for y in range(n):
+        for x in range(n):
+            if x + 1 < n:
+                w.connect(f"r{x}_{y}", "east", f"r{x + 1}_{y}")
+            if y + 1 < n:
+                w.connect(f"r{x}_{y}", "south", f"r{x}_{y + 1}")
+    return w
+
+
+class TestRoomDict:
+    """Test suite for Room (de)serialization."""
+
+    def test_round_trip(self):
+        room = Room("a", "A", "Room A")
+        room.add_exit("North", "b", description="A door", locked=True)
+        data = room.to_dict()
+        assert data["exits"]["north"] == {"to": "b", "description": "A door", "locked": True}
+        assert Room.from_dict(data) == room
+
+    def test_defaults(self):
+        room = Room.from_dict({"id": "a"})
+        assert room.name == "a"
+        assert room.description == ""
+        assert room.exits == {}
+
+
+class TestJsonLines:
+    """Test suite for JSON Lines world files."""
+
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "world.jsonl")
+        world = load_default_world()
+        assert save_world(world, path) == 5
+
+        loaded = load_world(path)
+        assert loaded.to_dict() == world.to_dict()
+        assert loaded.find_path("market", "north_road") == world.find_path(
+            "market", "north_road"
+        )
+
+    @pytest.mark.parametrize("name", ["world.jsonl", "world.json", "world.drw"])
+    def test_start_room_round_trips(self, tmp_path, name):
+        path = str(tmp_path / name)
+        world = grid_world(2)
+        world.start_room = "r1_1"
+        save_world(world, path)
+        assert load_world(path).start_room == "r1_1"
+
+    def test_one_record_per_line(self, tmp_path):
+        path = str(tmp_path / "world.jsonl")
+        save_world(load_default_world(), path)
+        lines = open(path, encoding="utf-8").read().splitlines()
+        assert json.loads(lines[0])["format"] == FORMAT
+        assert len(lines) == 6
+        assert json.loads(lines[1])["id"] == "town_square"
+
+    def test_iter_rooms_streams(self, tmp_path):
+        path = str(tmp_path / "world.ndjson")
+        save_world(load_default_world(), path)
+        header, rooms = iter_rooms(path)
+        assert header["title"] == load_default_world().title
+        first, pos = next(rooms)
+        assert first.id == "town_square"
+        assert 0 < pos
+        rooms.close()
+
+    def test_blank_lines_ignored(self, tmp_path):
+        path = tmp_path / "world.jsonl"
+        path.write_text(
+            json.dumps({"format": FORMAT, "version": 1, "title": "T"})
+            + "\n\n"
+            + json.dumps({"id": "a", "name": "A"})
+            + "\n"
+        )
+        world = load_world(str(path))
+        assert world.title == "T"
+        assert world.require_room("a").name == "A"
+
+    def test_rejects_missing_header(self, tmp_path):
+        path = tmp_path / "world.jsonl"
+        path.write_text(json.dumps({"id": "a", "name": "A"}) + "\n")
+        with pytest.raises(ValueError, match="Not a DiceRealms world stream"):
+            load_world(str(path))
+
+    def test_rejects_empty_file(self, tmp_path):
+        path = tmp_path / "world.jsonl"
+        path.write_text("")
+        with pytest.raises(ValueError):
+            load_world(str(path))
+
+    def test_load_into_compact_world(self, tmp_path):
+        path = str(tmp_path / "world.jsonl")
+        world = grid_world(6)
+        save_world(world, path)
+        compact = load_world(path, world_cls=CompactWorld)
+        assert isinstance(compact, CompactWorld)
+        assert compact.find_path("r0_0", "r5_5") is not None
+        assert len(compact.find_path("r0_0", "r5_5")) == len(world.find_path("r0_0", "r5_5"))
+
+
+class TestProgress:
+    """Test suite for progress reporting."""
+
+    def test_load_progress(self, tmp_path):
+        path = str(tmp_path / "world.jsonl")
+        save_world(grid_world(5), path)
+        seen: list[WorldIOProgress] = []
+        load_world(path, progress=seen.append, progress_every=10)
+
+        assert [p.rooms for p in seen] == [10, 20, 25]
+        assert seen[-1].fraction == 1.0
+        assert all(a.bytes < b.bytes for a, b in zip(seen, seen[1:], strict=False))
+
+    def test_save_progress(self, tmp_path):
+        path = tmp_path / "world.jsonl"
+        seen: list[WorldIOProgress] = []
+        save_world(grid_world(4), str(path), progress=seen.append, progress_every=8)
+
+        assert [p.rooms for p in seen] == [8, 16, 16]
+        assert seen[-1].bytes == path.stat().st_size
+        assert seen[-1].fraction is None
+
+
+class TestFormats:
+    """Test suite for format detection and legacy JSON."""
+
+    @pytest.mark.parametrize(
+        "name, fmt",
+        [
+            ("w.jsonl", "jsonl"),
+            ("w.NDJSON", "jsonl"),
+            ("w.msgpack", "msgpack"),
+            ("w.mpk", "msgpack"),
+            ("w.json", "json"),
+        ],
+    )
+    def test_detect_format(self, name, fmt):
+        assert detect_format(name) == fmt
+
+    def test_unknown_extension(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown world file extension"):
+            save_world(load_default_world(), str(tmp_path / "world.txt"))
+        assert not list(tmp_path.iterdir())
+
+    def test_legacy_json(self, tmp_path):
+        path = str(tmp_path / "world.json")
+        world = load_default_world()
+        save_world(world, path)
+        assert json.load(open(path, encoding="utf-8")) == world.to_dict()
+        assert load_world(path).to_dict() == world.to_dict()
+
+    def test_explicit_format_overrides_extension(self, tmp_path):
+        path = str(tmp_path / "world.dat")
+        save_world(load_default_world(), path, fmt="jsonl")
+        assert load_world(path, fmt="jsonl").has_room("gate")
+
+    def test_msgpack_round_trip(self, tmp_path):
+        pytest.importorskip("msgpack")
+        path = str(tmp_path / "world.msgpack")
+        world = grid_world(4)
+        world.set_locked("r0_0", "east")
+        assert save_world(world, path) == 16
+
+        seen: list[WorldIOProgress] = []
+        loaded = load_world(path, progress=seen.append)
+        assert loaded.to_dict() == world.to_dict()
+        assert seen[-1].fraction == 1.0
@@ -0,0 +1,229 @@
+# SPDX-License-Identifier: MIT
+"""Tests for the zone-sharded world."""
+
+import pytest
+
+from dicerealms.server.game_state import GameState
+from dicerealms.world import Room, World
+from dicerealms.zoned_world import ZoneDirectory, ZonedWorld
+
+
+def chain_world(zones: int, rooms: int) -> World:
+    """`zones` zones of `rooms` rooms each, in one east-west line."""
+    w = World(title="Chain")
+    ids = [f"z{z}:r{r}" for z in range(zones) for r in range(rooms)]
+    for room_id in ids:
+        w.add(room_id, room_id.upper())
+    for a, b in zip(ids, ids[1:], strict=False):
+        w.connect(a, "east", b)
+    return w
+
+
+class MemorySource:
+    """In-memory zone source that counts loads and keeps saves."""
+
+    def __init__(self, world: World) -> None:
+        self.zones: dict[str, list[dict]] = {}
+        for room in world.rooms():
+            self.zones.setdefault(self.zone_of(room.id), []).append(room.to_dict())
+        self.loaded: list[str] = []
+
+    def zone_of(self, room_id):
+        zone, sep, _ = room_id.partition(":")
+        return zone if sep else None
+
+    def load(self, zone):
+        self.loaded.append(zone)
+        return [Room.from_dict(d) for d in self.zones.get(zone, [])]
+
+
+class SavingSource(MemorySource):
+    def save(self, zone, rooms):
+        self.zones[zone] = [r.to_dict() for r in rooms]
+
+
+@pytest.fixture
+def source():
+    return MemorySource(chain_world(4, 3))
+
+
+class TestZonedWorld:
+    """Test suite for loading and evicting zones."""
+
+    def test_zones_load_on_first_lookup(self, source):
+        w = ZonedWorld(source)
+        assert w.resident_zones() == []
+        assert w.require_room("z1:r0").name == "Z1:R0"
+        assert w.resident_zones() == ["z1"]
+        assert w.has_room("z1:r2")
+        assert source.loaded == ["z1"]
+
+    def test_missing_rooms(self, source):
+        w = ZonedWorld(source)
+        assert not w.has_room("z1:nope")
+        assert not w.has_room("nozone")
+        assert w.current_room("z9:r0") is None
+        with pytest.raises(KeyError):
+            w.require_room("z9:r0")
+
+    def test_cross_zone_move_resolves_lazily(self, source):
+        w = ZonedWorld(source)
+        dest, msg = w.move("z0:r2", "east")
+        assert dest == "z1:r0"
+        assert "Z1:R0" in msg
+        assert w.resident_zones() == ["z0", "z1"]
+
+    def test_lru_eviction(self, source):
+        w = ZonedWorld(source, max_zones=2)
+        for z in range(4):
+            w.require_room(f"z{z}:r0")
+        assert w.resident_zones() == ["z2", "z3"]
+        stats = w.zone_stats()
+        assert stats.loads == 4
+        assert stats.evictions == 2
+        assert stats.resident_zones == 2
+        assert stats.resident_rooms == 6
+        assert stats.max_load_seconds >= stats.mean_load_seconds > 0
+
+    def test_room_budget(self, source):
+        w = ZonedWorld(source, max_rooms=7)
+        for z in range(4):
+            w.require_room(f"z{z}:r0")
+        assert w.zone_stats().resident_rooms <= 7
+
+    def test_lookup_refreshes_lru(self, source):
+        w = ZonedWorld(source, max_zones=2)
+        w.require_room("z0:r0")
+        w.require_room("z1:r0")
+        w.require_room("z0:r1")
+        w.require_room("z2:r0")
+        assert w.resident_zones() == ["z0", "z2"]
+
+    def test_occupied_zones_stay_resident(self, source):
+        w = ZonedWorld(source, max_zones=1)
+        w.occupy("z0:r0")
+        w.require_room("z1:r0")
+        w.require_room("z2:r0")
+        assert "z0" in w.resident_zones()
+        assert w.zone_stats().occupied_zones == 1
+        assert not w.evict("z0")
+
+        w.vacate("z0:r0")
+        assert "z0" not in w.resident_zones()
+
+    def test_find_path_across_zones(self, source):
+        w = ZonedWorld(source, max_zones=1)
+        path = w.find_path("z0:r0", "z3:r2")
+        assert path == [f"z{z}:r{r}" for z in range(4) for r in range(3)]
+        assert len(w.resident_zones()) == 1
+        assert w.find_path("z3:r2", "z0:r0")[-1] == "z0:r0"
+
+    def test_search_stays_within_budget(self, source):
+        w = ZonedWorld(source, max_zones=1)
+        resident = []
+        load = source.load
+
+        def tracking_load(zone):
+            resident.append(len(w.resident_zones()))
+            return load(zone)
+
+        source.load = tracking_load
+        assert w.find_path("z0:r0", "z3:r2") is not None
+        assert max(resident) == 1
+
+    def test_search_limit(self, source):
+        w = ZonedWorld(source, search_limit=5)
+        assert w.find_path("z0:r0", "z3:r2") is None
+        assert w.find_path("z0:r0", "z1:r0") is not None
+
+    def test_edits_pin_zone_without_save(self, source):
+        w = ZonedWorld(source, max_zones=1)
+        w.set_locked("z0:r2", "east")
+        w.require_room("z1:r0")
+        w.require_room("z2:r0")
+        assert "z0" in w.resident_zones()
+        assert w.find_path("z0:r0", "z1:r0") is None
+
+    def test_edits_saved_before_eviction(self):
+        source = SavingSource(chain_world(3, 2))
+        w = ZonedWorld(source, max_zones=1)
+        w.set_locked("z0:r1", "east")
+        w.add("z0:shrine", "Shrine")
+        w.require_room("z1:r0")
+        w.require_room("z2:r0")
+        assert w.resident_zones() == ["z2"]
+        assert w.zone_stats().saves == 1
+
+        assert w.require_room("z0:r1").exits["east"].locked
+        assert w.has_room("z0:shrine")
+        assert w.find_path("z0:r0", "z1:r0") is None
+
+    def test_unzoned_rooms_always_resident(self, source):
+        w = ZonedWorld(source, max_zones=1)
+        w.add("lobby", "Lobby")
+        w.add_exit("lobby", "north", "z2:r0")
+        for z in range(4):
+            w.require_room(f"z{z}:r0")
+        assert w.has_room("lobby")
+        assert w.move("lobby", "north")[0] == "z2:r0"
+
+    def test_indexes_unsupported(self, source):
+        w = ZonedWorld(source)
+        assert w.build_landmarks() is None
+        assert w.build_components() is None
+        assert w.components is None
+        assert w.find_path("z0:r0", "z0:r2") == ["z0:r0", "z0:r1", "z0:r2"]
+
+
+class TestZoneDirectory:
+    """Test suite for per-zone world files."""
+
+    def test_round_trip_through_files(self, tmp_path):
+        world = chain_world(3, 4)
+        zones = ZoneDirectory.from_world(world, str(tmp_path))
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "z0.jsonl",
+            "z1.jsonl",
+            "z2.jsonl",
+        ]
+
+        w = ZonedWorld(zones, max_zones=2)
+        assert w.find_path("z0:r0", "z2:r3") == world.find_path("z0:r0", "z2:r3")
+        w.set_locked("z2:r0", "west")
+        w.require_room("z0:r0")
+        w.require_room("z1:r0")
+        assert "z2" not in w.resident_zones()
+
+        reopened = ZonedWorld(ZoneDirectory(str(tmp_path)))
+        assert reopened.require_room("z2:r0").exits["west"].locked
+
+    def test_unknown_zone_is_empty(self, tmp_path):
+        w = ZonedWorld(ZoneDirectory(str(tmp_path)))
+        assert not w.has_room("ghost:r0")
+
+    def test_rejects_whole_document_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            ZoneDirectory(str(tmp_path), fmt="json")
+
+
+class TestGameStatePresence:
+    """GameState keeps player zones resident."""
+
+    def test_players_pin_their_zone(self, source):
+        world = ZonedWorld(source, max_zones=1)
+        gs = GameState(world)
+        gs.add_player("p1", "Alice")
+        gs.players["p1"].room = "z0:r2"
+        world.occupy("z0:r2")
+        world.vacate("town_square")
+
+        ok, _ = gs.move_player("p1", "east")
+        assert ok
+        assert gs.players["p1"].room == "z1:r0"
+        world.require_room("z3:r0")
+        assert "z1" in world.resident_zones()
+        assert "z0" not in world.resident_zones()
+
+        gs.remove_player("p1")
+        world.require_room("z2:r0")
+        assert world.resident_zones() == ["z2"]